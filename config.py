@@ -7,7 +7,7 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
-# LLM Provider: "gemini" or "zhipu"
+# LLM Provider: "gemini", "zhipu" or "mock" (offline stand-in, no API calls)
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")
 
 # Google Gemini API Configuration
@@ -19,6 +19,29 @@ ZHIPU_API_KEY = os.getenv("ZHIPU_API_KEY", "")
 ZHIPU_API_ENDPOINT = "https://api.z.ai/api/paas/v4/chat/completions"
 ZHIPU_MODEL = "glm-4.7"  # GLM 4.7 model
 
+# LLM calls (see llm.py)
+LLM_REQUESTS_PER_MINUTE = 30  # Per provider, shared by all threads in a process
+LLM_TIMEOUT_SECONDS = 60
+LLM_MAX_RETRIES = 3  # Retries on rate limiting and transient errors
+LLM_RETRY_BACKOFF_SECONDS = 2  # Delay before the first retry; doubles on each further retry
+LLM_CACHE_ENABLED = True  # Reuse stored replies for identical prompts (see db.llm_cache)
+LLM_CACHE_TTL_DAYS = 30  # Cached replies older than this are fetched again; 0 = never expire
+LLM_CACHE_MAX_ENTRIES = 20000  # Least recently used replies are evicted beyond this; 0 = unbounded
+
+# LLM relevance scoring (see scoring.py)
+LLM_SCORING_ENABLED = False  # Score new pending articles at the end of each sync
+LLM_SCORING_BATCH_SIZE = 20  # Articles packed into one scoring prompt
+LLM_SCORING_WORKERS = 4  # Scoring requests in flight at once
+
+# Local curation-preference model (see preference.py; needs numpy)
+PREFERENCE_ENABLED = True  # Retrain on curation changes and score pending articles after each sync
+PREFERENCE_FEATURE_BITS = 18  # 2**18 hashed word / word-pair / source features
+PREFERENCE_MIN_EXAMPLES = 10  # Shortlisted and rejected articles needed (each) before training
+PREFERENCE_TRAIN_EPOCHS = 200  # Gradient descent steps when fitting from scratch
+PREFERENCE_UPDATE_EPOCHS = 50  # Steps when updating the stored model after curation changes
+PREFERENCE_LEARNING_RATE = 20.0  # Gradient descent step size (features are L2-normalised)
+PREFERENCE_L2 = 1e-5  # Weight decay (keeps rare words from dominating)
+
 # Topics (used by newsletter_generator and curator patterns)
 TOPICS = [
     "AI Applications",
@@ -28,6 +51,53 @@ TOPICS = [
     "AI for Operators",
 ]
 
+# Article embeddings for related articles and semantic search (see embeddings.py; needs numpy)
+EMBEDDINGS_ENABLED = True  # Embed new articles after each sync
+EMBEDDING_BACKEND = "hashed"  # Name in embeddings.BACKENDS; "hashed" = local hashed n-grams, no model files
+EMBEDDING_DIM = 256  # Vector size of the hashed backend (float32, 1 KB per article)
+EMBEDDING_BATCH_SIZE = 2000  # Articles embedded and stored per chunk
+EMBEDDING_ANN_THRESHOLD = 20000  # Exact search up to this many vectors, IVF (clustered) index above
+EMBEDDING_IVF_PROBES = 16  # IVF clusters searched per query (more = better recall, slower)
+EMBEDDING_IVF_TRAIN_SAMPLE = 20000  # Vectors sampled to fit the IVF cluster centroids
+EMBEDDING_IVF_ITERATIONS = 10  # k-means iterations when fitting centroids
+EMBEDDING_INDEX_REFRESH_SECONDS = 10  # How often the API checks the DB for new vectors
+
+# Topic classification at ingest (see topic_classifier.py)
+TOPIC_CLASSIFY_ENABLED = True  # Assign a topic to untagged articles after each sync
+TOPIC_CLASSIFIER = "keywords"  # "keywords" (local, instant) or "llm" (LLM_PROVIDER, batched and cached)
+TOPIC_BATCH_SIZE = 1000  # Untagged articles read and updated per chunk
+TOPIC_LLM_BATCH_SIZE = 40  # Articles per LLM classification prompt
+TOPIC_DEFAULT = "AI Applications"  # Topic for articles matching no keywords
+TOPIC_TITLE_WEIGHT = 2  # A keyword in the title counts this many times a summary match
+TOPIC_MIN_SCORE = 2  # Weighted keyword matches needed to pick a topic over TOPIC_DEFAULT
+# Keywords per topic (lowercase words or phrases, matched on word boundaries, optional plural "s")
+TOPIC_KEYWORDS = {
+    "AI for Healthcare": [
+        "health", "healthcare", "medical", "medicine", "clinical", "clinician", "doctor",
+        "patient", "hospital", "drug", "pharma", "biotech", "diagnosis", "diagnostic",
+        "radiology", "fda", "genomic", "protein", "disease", "cancer", "therapy", "nurse",
+    ],
+    "AI for Finance": [
+        "finance", "financial", "fintech", "bank", "banking", "trading", "trader", "investor",
+        "investment", "hedge fund", "stock", "payment", "insurance", "insurer", "credit",
+        "loan", "lending", "crypto", "accounting", "audit", "tax", "wealth", "portfolio",
+    ],
+    "AI for Consumer": [
+        "consumer", "iphone", "android", "smartphone", "app store", "shopping", "ecommerce",
+        "e-commerce", "retail", "music", "game", "gaming", "social media", "dating", "travel",
+        "siri", "alexa", "wearable", "smart glasses", "student", "parent", "kid",
+    ],
+    "AI for Operators": [
+        "enterprise", "operation", "workflow", "productivity", "automation", "automate",
+        "startup", "founder", "hiring", "recruiting", "sales", "marketing", "customer support",
+        "crm", "saas", "b2b", "ceo", "manager", "employee", "workforce", "business",
+    ],
+    "AI Applications": [
+        "application", "use case", "tool", "agent", "copilot", "assistant", "api",
+        "integration", "launch", "product", "feature",
+    ],
+}
+
 # RSS Feed Discovery - common patterns to try
 RSS_PATTERNS = [
     "/feed",
@@ -45,9 +115,42 @@ RSS_PATTERNS = [
     "/feeds/posts/default",
 ]
 
+# Pattern discovery probes (see rss_feed_scorer.try_rss_patterns)
+DISCOVERY_PROBE_WORKERS = 8  # Candidate feed URLs probed in parallel per domain
+DISCOVERY_PROBE_BYTES = 1024  # Bytes requested (Range) to verify a candidate is a feed
+
+# Feed discovery scheduling
+DISCOVERY_WORKERS = 8  # Domains discovered in parallel
+NO_FEED_RETRY_HOURS = 24  # First retry delay for domains with no feed (doubles per attempt)
+NO_FEED_RETRY_MAX_DAYS = 30  # Upper bound on the no-feed retry delay
+
 # RSS sources to exclude from curation (e.g. general news sites)
 EXCLUDED_RSS_DOMAINS = ["wired.com", "nytimes.com"]
 
+# URL canonicalization for article IDs and dedup (see db.canonicalize_url)
+TRACKING_QUERY_PREFIXES = ("utm_", "mc_", "_hs", "oly_", "vero_")  # Query params dropped by prefix
+TRACKING_QUERY_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "igshid",
+    "mkt_tok", "ref", "ref_src", "ref_url", "s_cid", "cmpid", "_ga", "trk", "spm",
+}
+# Redirect wrappers ("host" or "host/path", www. stripped) -> query params holding the target URL
+URL_REDIRECT_WRAPPERS = {
+    "google.com/url": ("q", "url"),
+    "l.facebook.com/l.php": ("u",),
+    "lm.facebook.com/l.php": ("u",),
+    "linkedin.com/redir/redirect": ("url",),
+    "out.reddit.com": ("url",),
+    "t.umblr.com/redirect": ("z",),
+    "slack-redir.net/link": ("url",),
+}
+
+# Near-duplicate clustering of syndicated stories (see near_dup.py)
+NEAR_DUP_ENABLED = True  # Cluster incoming near-duplicates under one representative article
+NEAR_DUP_BANDS = 20  # LSH bands per MinHash signature (more bands = more candidates found)
+NEAR_DUP_BAND_ROWS = 3  # Signature values per band (more rows = fewer, closer candidates)
+NEAR_DUP_THRESHOLD = 0.5  # Minimum estimated Jaccard similarity of shingles to cluster
+NEAR_DUP_MIN_TOKENS = 8  # Shorter title+summary texts are never clustered
+
 # File paths (absolute so cron doesn't depend on working directory)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CRAWL_RESULTS_FILE = os.path.join(BASE_DIR, "browser_crawl_results.json")
@@ -60,9 +163,61 @@ NEWSLETTER_OUTPUT_DIR = os.path.join(OUTPUT_DIR, "newsletters")
 REQUEST_TIMEOUT = 10  # seconds
 USER_AGENT = "Mozilla/5.0 (compatible; AINewsletterBot/1.0)"
 
+# Shared HTTP client (connection pooling and retries, see http_client.py)
+HTTP_POOL_CONNECTIONS = 100  # Number of per-host connection pools to keep
+HTTP_POOL_MAXSIZE = 16  # Keep-alive connections per host (>= FETCH_WORKERS)
+HTTP_RETRIES = 2  # Retries for connection errors and 429/5xx responses (not for discovery probes)
+HTTP_RETRY_BACKOFF = 0.5  # Exponential backoff factor between retries (seconds)
+
+# Concurrent feed fetching
+FETCH_WORKERS = 16  # Maximum feeds fetched in parallel during sync
+FETCH_PER_HOST_LIMIT = 2  # Maximum concurrent requests to a single host
+
+# Streaming feed parsing (see feed_stream.py)
+FEED_STREAM_PARSE = True  # Parse feeds while downloading and stop at the cutoff; False = feedparser only
+FEED_STREAM_CHUNK_BYTES = 16384  # Bytes read from the response per parser step
+FEED_STREAM_STOP_AFTER_OLD = 3  # Consecutive pre-cutoff entries before a sorted feed stops being read
+
+# Parse stage (see feed_parser.py)
+PARSE_WORKERS = os.cpu_count() or 1  # Processes parsing downloaded feeds; 0 = parse in the fetch threads
+
+# Adaptive per-feed polling (see feed_scheduler.py, rss_feed_scorer.py --due-only)
+FEED_POLL_MIN_SECONDS = 15 * 60  # Never poll a feed more often than the cron tick
+FEED_POLL_MAX_SECONDS = 24 * 3600  # Poll even the quietest feed at least daily
+FEED_POLL_DEFAULT_SECONDS = 3600  # Interval for feeds without enough dated items to estimate cadence
+FEED_POLL_FAILURE_SECONDS = 3600  # Retry interval after a failed fetch
+FEED_POLL_CADENCE_FRACTION = 0.5  # Poll after this fraction of the feed's median gap between posts
+FEED_CADENCE_SAMPLE_ITEMS = 10  # Newest dated items used to estimate a feed's cadence
+FEED_POLL_CUTOFF_OVERLAP_HOURS = 24  # Re-read items this long before a feed's last fetch (late posts)
+
 # Feed parsing configuration
 MAX_FEED_ITEMS = 50  # Maximum items to fetch per feed
 DAYS_LOOKBACK = 7  # Only consider items from the last N days (manual/full sync)
 
+# Database configuration
+DB_UPSERT_BATCH_SIZE = 500  # Articles per executemany batch in db.upsert_articles_bulk
+DB_BUSY_TIMEOUT_MS = 5000  # Wait this long for a lock instead of failing with "database is locked"
+DB_CACHE_SIZE_KB = 16384  # SQLite page cache per connection
+DB_MMAP_SIZE = 64 * 1024 * 1024  # Bytes of the database file to memory-map for reads
+DB_POOL_SIZE = 8  # Idle connections kept for reuse by new threads (e.g. API requests)
+
+# Curator API pagination (/api/articles?limit=...)
+API_DEFAULT_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+
+# Curator API sync progress stream (/api/sync-feeds/events)
+SSE_KEEPALIVE_SECONDS = 15  # Idle interval between keep-alive comments on event streams
+SSE_POLL_SECONDS = 1  # How often the stream checks the job table for progress
+
+# Background jobs (jobs.py)
+JOB_EMBEDDED_WORKER = True  # Run a job worker thread inside each curator API process
+JOB_LEASE_SECONDS = 60  # Lease on a running job; renewed while it runs, reclaimed once expired
+JOB_POLL_SECONDS = 2  # How often an idle worker checks for queued jobs
+JOB_PROGRESS_INTERVAL_SECONDS = 0.5  # Minimum gap between progress writes to the job table
+JOB_MAX_ATTEMPTS = 3  # Runs per job before it is marked failed
+JOB_RETRY_BACKOFF_SECONDS = 30  # Delay before the first retry; doubles on each further attempt
+JOB_WAIT_SECONDS = 60  # How long /api/generate-newsletter waits for its job before replying 202
+JOB_HISTORY_DAYS = 30  # Finished jobs older than this are pruned
+
 # Cron configuration
 CRON_FIRST_RUN_DAYS = 1  # On first run (no last_run), fetch articles from last N days
@@ -3,26 +3,27 @@
 Curator API - REST API for Newsletter Curation Tool.
 Provides endpoints for browsing, curating articles, and generating newsletters.
 """
-import os
+import html
 import json
-import threading
-import requests
+import os
+import sqlite3
+import time
 from bs4 import BeautifulSoup
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory, stream_with_context
 from urllib.parse import unquote
 from datetime import datetime
 
 import config
 import db
-from newsletter_generator import generate_newsletter
-from rss_feed_scorer import run_sync
+import embeddings
+import http_client
+import jobs
 
 
 def fetch_url_metadata(url: str) -> dict:
     """Fetch title and description from a URL."""
     try:
-        headers = {"User-Agent": config.USER_AGENT}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, "html.parser")
@@ -61,31 +62,52 @@ def fetch_url_metadata(url: str) -> dict:
 
 app = Flask(__name__, static_folder="output")
 
-_sync_state_lock = threading.Lock()
-_sync_state = {
-    "running": False,
-    "started_at": None,
-    "finished_at": None,
-    "stored_count": 0,
-    "error": None,
-    "mode": "incremental",
-    "discovery": False,
-}
 
+@app.before_request
+def _ensure_job_worker():
+    """Start this process's background job worker on its first request."""
+    if config.JOB_EMBEDDED_WORKER:
+        jobs.start_worker_thread()
 
-def load_feeds_cache_data() -> dict:
-    """Load feeds cache JSON data."""
-    try:
-        with open(config.FEEDS_CACHE_FILE, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
 
+@app.teardown_appcontext
+def _release_db_connection(exc):
+    """Return the request thread's database connection to the pool."""
+    db.release_connection()
 
-def save_feeds_cache_data(cache_data: dict) -> None:
-    """Persist feeds cache JSON data."""
-    with open(config.FEEDS_CACHE_FILE, "w") as f:
-        json.dump(cache_data, f, indent=2)
+
+def _sync_status(job):
+    """Summarize a sync job in the shape the UI polls for."""
+    if job is None:
+        return {
+            "job_id": None,
+            "status": None,
+            "running": False,
+            "started_at": None,
+            "finished_at": None,
+            "stored_count": 0,
+            "error": None,
+            "mode": "incremental",
+            "discovery": False,
+            "progress": None,
+            "attempts": 0,
+            "updated_at": None,
+        }
+    params = job["params"] or {}
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "running": job["status"] not in jobs.FINISHED_STATUSES,
+        "started_at": job["started_at"] or job["created_at"],
+        "finished_at": job["finished_at"],
+        "stored_count": (job["result"] or {}).get("stored_count", 0),
+        "error": job["error"] if job["status"] == "failed" else None,
+        "mode": "full" if params.get("full_sync") else "incremental",
+        "discovery": bool(params.get("discover")),
+        "progress": job["progress"],
+        "attempts": job["attempts"],
+        "updated_at": job["updated_at"],
+    }
 
 
 @app.route("/")
@@ -122,15 +144,116 @@ def get_articles():
     Get current (non-archived) articles with optional filters.
     Query params:
       - status: Filter by status ('pending', 'shortlisted', 'rejected', or 'all')
+      - sort: 'date' (newest first, default), 'relevance' (LLM score, see scoring.py)
+              or 'preference' (local model trained on past curation, see preference.py;
+              scores come from the last refresh, queued after each curation change)
+      - limit: Page size; enables keyset pagination (max API_MAX_PAGE_SIZE)
+      - cursor: next_cursor from the previous page (same sort)
+    Without limit/cursor every matching article is returned in one response.
+    Top picks always come first.
     """
     status = request.args.get("status", "all")
+    sort = request.args.get("sort", "date")
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+
+    if sort not in db.QUEUE_SORTS:
+        return jsonify({"error": f"sort must be one of: {', '.join(db.QUEUE_SORTS)}"}), 400
+
+    if limit is None and cursor is None:
+        if status == "all":
+            articles = db.get_current_articles(sort=sort)
+        else:
+            articles = db.get_articles_by_status(status=status, include_archived=False, sort=sort)
+
+        return jsonify({
+            "articles": articles,
+            "count": len(articles),
+            "next_cursor": None
+        })
+
+    try:
+        limit = int(limit) if limit is not None else config.API_DEFAULT_PAGE_SIZE
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, config.API_MAX_PAGE_SIZE))
+
+    try:
+        articles, next_cursor = db.get_current_articles_page(
+            status=None if status == "all" else status,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "articles": articles,
+        "count": len(articles),
+        "next_cursor": next_cursor
+    })
+
+
+def _highlight_snippet(snippet: str) -> str:
+    """HTML-escape a search snippet and turn match markers into <mark> tags."""
+    return (
+        html.escape(snippet or "")
+        .replace(db.SEARCH_MATCH_START, "<mark>")
+        .replace(db.SEARCH_MATCH_END, "</mark>")
+    )
 
-    if status == "all":
-        articles = db.get_current_articles()
-    else:
-        articles = db.get_articles_by_status(status=status, include_archived=False)
+
+@app.route("/api/search", methods=["GET"])
+def search_articles():
+    """
+    Full-text search across current and archived articles.
+    Query params:
+      - q: Search text (all words must match; the last one as a prefix)
+      - status: Filter by status ('pending', 'shortlisted', 'rejected')
+      - week: Filter by week (e.g. '2026-W05')
+      - limit: Maximum results (default 20, max API_MAX_PAGE_SIZE)
+      - mode: 'text' (full-text match, default) or 'semantic' (nearest by
+              embedding, see embeddings.py; results carry a similarity)
+    """
+    query = request.args.get("q", "").strip()
+    status = request.args.get("status") or None
+    week = request.args.get("week") or None
+    mode = request.args.get("mode", "text")
+
+    if not query:
+        return jsonify({"error": "q is required"}), 400
+    if status and status not in ("pending", "shortlisted", "rejected"):
+        return jsonify({"error": "Invalid status"}), 400
+    if mode not in ("text", "semantic"):
+        return jsonify({"error": "mode must be 'text' or 'semantic'"}), 400
+
+    try:
+        limit = int(request.args.get("limit", 20))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, config.API_MAX_PAGE_SIZE))
+
+    if mode == "semantic":
+        if not embeddings.NUMPY_AVAILABLE:
+            return jsonify({"error": "Semantic search unavailable: numpy is not installed"}), 503
+        articles = embeddings.search_text(query, limit=limit, status=status, week=week)
+        return jsonify({
+            "query": query,
+            "articles": articles,
+            "count": len(articles)
+        })
+
+    try:
+        articles = db.search_articles(query, status=status, week=week, limit=limit)
+    except sqlite3.OperationalError as e:
+        return jsonify({"error": f"Search unavailable: {e}"}), 503
+
+    for article in articles:
+        article["snippet"] = _highlight_snippet(article.get("snippet"))
 
     return jsonify({
+        "query": query,
         "articles": articles,
         "count": len(articles)
     })
@@ -145,6 +268,41 @@ def get_article(article_id):
     return jsonify({"error": "Article not found"}), 404
 
 
+@app.route("/api/articles/<article_id>/cluster", methods=["GET"])
+def get_article_cluster(article_id):
+    """Get the near-duplicate cluster an article belongs to, representative first."""
+    articles = db.get_cluster_articles(article_id)
+    if not articles:
+        return jsonify({"error": "Article not found"}), 404
+    return jsonify({
+        "representative_id": articles[0]["id"],
+        "articles": articles,
+        "count": len(articles)
+    })
+
+
+@app.route("/api/articles/<article_id>/similar", methods=["GET"])
+def get_similar_articles(article_id):
+    """
+    Get the articles most similar to an article (pending, curated or archived),
+    most similar first, from the local embedding index (see embeddings.py).
+    Query params: limit (default 10, max API_MAX_PAGE_SIZE)
+    """
+    if not embeddings.NUMPY_AVAILABLE:
+        return jsonify({"error": "Similar articles unavailable: numpy is not installed"}), 503
+    article = db.get_article_by_id(article_id)
+    if not article:
+        return jsonify({"error": "Article not found"}), 404
+
+    limit = max(1, min(request.args.get("limit", 10, type=int), config.API_MAX_PAGE_SIZE))
+    articles = embeddings.similar_articles(article, limit=limit)
+    return jsonify({
+        "article_id": article_id,
+        "articles": articles,
+        "count": len(articles)
+    })
+
+
 @app.route("/api/articles/<article_id>/curate", methods=["POST"])
 def curate_article(article_id):
     """
@@ -166,6 +324,9 @@ def curate_article(article_id):
         return jsonify({"error": "No status or notes provided"}), 400
 
     if success:
+        if status and config.PREFERENCE_ENABLED:
+            # Retrain on the new decision in the background for "Best match"
+            jobs.enqueue("preference")
         article = db.get_article_by_id(article_id)
         return jsonify({"success": True, "article": article})
 
@@ -215,11 +376,18 @@ def api_generate_newsletter():
     data = request.get_json() or {}
     week = data.get("week") or db.get_current_week()
 
-    try:
-        result = generate_newsletter(week)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    job, _ = jobs.enqueue("newsletter", {"week": week})
+    job = jobs.wait_for_job(job["id"], config.JOB_WAIT_SECONDS)
+    if job["status"] == "succeeded":
+        return jsonify(job["result"])
+    if job["status"] == "failed":
+        return jsonify({"error": job["error"], "job_id": job["id"]}), 500
+    return jsonify({
+        "success": True,
+        "running": True,
+        "job_id": job["id"],
+        "message": "Newsletter generation is still running",
+    }), 202
 
 
 @app.route("/api/newsletter/<newsletter_id>", methods=["GET"])
@@ -256,62 +424,27 @@ def archive_status():
 
 @app.route("/api/sync-feeds", methods=["POST"])
 def sync_feeds():
-    """Start RSS sync in background and return immediately."""
+    """Queue an RSS sync job (one runs at a time) and return immediately."""
     data = request.get_json(silent=True) or {}
     full_sync = bool(data.get("full_sync", False))
     discover = bool(data.get("discover", False))
     mode = "full" if full_sync else "incremental"
 
-    with _sync_state_lock:
-        if _sync_state["running"]:
-            return jsonify({
-                "success": True,
-                "started": False,
-                "running": True,
-                "message": "Sync already running",
-            }), 202
-
-        _sync_state.update({
+    job, created = jobs.enqueue("sync", {"full_sync": full_sync, "discover": discover})
+    if not created:
+        return jsonify({
+            "success": True,
+            "started": False,
             "running": True,
-            "started_at": datetime.now().isoformat(),
-            "finished_at": None,
-            "stored_count": 0,
-            "error": None,
-            "mode": mode,
-            "discovery": discover,
-        })
-
-    def _run_sync_job():
-        try:
-            stored_count = run_sync(
-                cron_mode=not full_sync,
-                skip_discovery=not discover,
-                limit_domains=0,
-                verbose=False,
-            )
-            with _sync_state_lock:
-                _sync_state.update({
-                    "running": False,
-                    "finished_at": datetime.now().isoformat(),
-                    "stored_count": stored_count,
-                    "error": None,
-                })
-        except Exception as e:
-            with _sync_state_lock:
-                _sync_state.update({
-                    "running": False,
-                    "finished_at": datetime.now().isoformat(),
-                    "stored_count": 0,
-                    "error": str(e),
-                })
-
-    thread = threading.Thread(target=_run_sync_job, daemon=True)
-    thread.start()
+            "job_id": job["id"],
+            "message": "Sync already running",
+        }), 202
 
     return jsonify({
         "success": True,
         "started": True,
         "running": True,
+        "job_id": job["id"],
         "mode": mode,
         "discovery": discover,
     }), 202
@@ -320,8 +453,89 @@ def sync_feeds():
 @app.route("/api/sync-feeds/status", methods=["GET"])
 def sync_feeds_status():
     """Get status of the latest manual RSS sync job."""
-    with _sync_state_lock:
-        return jsonify(dict(_sync_state))
+    return jsonify(_sync_status(db.get_latest_job("sync")))
+
+
+@app.route("/api/sync-feeds/events", methods=["GET"])
+def sync_feeds_events():
+    """Stream sync progress as Server-Sent Events until the sync finishes.
+
+    Follows the sync job given by ?job_id=, or the latest one. Each change
+    is sent as a `progress` event; the final state is sent as a `done` event
+    and the stream closes. Idle periods get keep-alive comments so proxies
+    don't drop the connection.
+    """
+    job_id = request.args.get("job_id", type=int)
+
+    def _load():
+        job = db.get_job(job_id) if job_id else db.get_latest_job("sync")
+        return _sync_status(job)
+
+    def _events():
+        last_state = None
+        last_sent = time.monotonic()
+        while True:
+            state = _load()
+            if state != last_state:
+                last_state = state
+                last_sent = time.monotonic()
+                event = "progress" if state["running"] else "done"
+                yield f"event: {event}\ndata: {json.dumps(state)}\n\n"
+                if not state["running"]:
+                    return
+            elif time.monotonic() - last_sent >= config.SSE_KEEPALIVE_SECONDS:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            time.sleep(config.SSE_POLL_SECONDS)
+
+    return Response(
+        stream_with_context(_events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/jobs", methods=["GET"])
+def list_jobs():
+    """
+    Get background job history, newest first.
+    Query params: kind, status, limit (default 50)
+    """
+    limit = min(max(request.args.get("limit", 50, type=int), 1), config.API_MAX_PAGE_SIZE)
+    return jsonify({
+        "jobs": db.get_jobs(
+            kind=request.args.get("kind"),
+            status=request.args.get("status"),
+            limit=limit,
+        )
+    })
+
+
+@app.route("/api/jobs", methods=["POST"])
+def create_job():
+    """
+    Queue a background job.
+    Body: { "kind": "sync" | "discovery" | "score" | "newsletter" | "preference", "params": {...} }
+    """
+    data = request.get_json() or {}
+    kind = data.get("kind")
+    if kind not in jobs.JOB_HANDLERS:
+        return jsonify({"error": f"kind must be one of: {', '.join(sorted(jobs.JOB_HANDLERS))}"}), 400
+    params = data.get("params") or {}
+    if kind == "newsletter" and not params.get("week"):
+        params["week"] = db.get_current_week()
+
+    job, created = jobs.enqueue(kind, params)
+    return jsonify({"success": True, "created": created, "job": job}), 202
+
+
+@app.route("/api/jobs/<int:job_id>", methods=["GET"])
+def get_job(job_id):
+    """Get a single background job."""
+    job = db.get_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
 
 
 @app.route("/api/articles/<article_id>/unarchive", methods=["POST"])
@@ -366,20 +580,21 @@ def get_all_newsletters():
 @app.route("/api/rss-subscriptions", methods=["GET"])
 def get_rss_subscriptions():
     """List all RSS subscriptions from feeds cache."""
-    cache_data = load_feeds_cache_data()
+    cache_data = db.get_feeds(subscribed_only=True)
+    article_counts = db.get_subscription_article_counts(
+        {domain: meta["feed_url"] for domain, meta in cache_data.items()}
+    )
     subscriptions = []
 
     for domain, meta in cache_data.items():
-        feed_url = (meta or {}).get("feed_url")
-        if not feed_url:
-            continue
+        feed_url = meta["feed_url"]
 
         subscriptions.append({
             "domain": domain,
             "feed_url": feed_url,
-            "discovered_at": (meta or {}).get("discovered_at"),
-            "updated_at": (meta or {}).get("updated_at"),
-            "article_count": db.get_subscription_article_count(domain, feed_url),
+            "discovered_at": meta.get("discovered_at"),
+            "updated_at": meta.get("updated_at"),
+            "article_count": article_counts.get(domain, 0),
         })
 
     subscriptions.sort(key=lambda item: item["domain"])
@@ -404,18 +619,25 @@ def update_rss_subscription(domain):
     if not feed_url.startswith(("http://", "https://")):
         feed_url = "https://" + feed_url
 
-    cache_data = load_feeds_cache_data()
     now = datetime.now().isoformat()
-    current = cache_data.get(domain, {})
-
+    current = db.get_feed(domain) or {}
+    fields = ("feed_url", "no_feed", "attempts", "retry_after", "discovered_at", "updated_at")
+
+    if current.get("feed_url") != feed_url:
+        # Validators and polling schedule belong to the old URL
+        for field in db.FEED_FETCH_FIELDS:
+            current.pop(field, None)
+        fields += db.FEED_FETCH_FIELDS
     current["feed_url"] = feed_url
     current.pop("no_feed", None)
+    current.pop("attempts", None)
+    current.pop("retry_after", None)
     if not current.get("discovered_at"):
         current["discovered_at"] = now
     current["updated_at"] = now
-    cache_data[domain] = current
 
-    save_feeds_cache_data(cache_data)
+    # Only touch the edited columns so a concurrent sync keeps its writes
+    db.upsert_feed(domain, current, fields=fields)
 
     return jsonify({
         "success": True,
@@ -441,14 +663,10 @@ def delete_rss_subscription(domain):
 
     delete_articles = request.args.get("delete_articles", "false").lower() in ("1", "true", "yes")
 
-    cache_data = load_feeds_cache_data()
-    existing = cache_data.get(domain, {})
-    feed_url = (existing or {}).get("feed_url", "")
+    existing = db.get_feed(domain) or {}
+    feed_url = existing.get("feed_url", "")
 
-    removed = domain in cache_data
-    if removed:
-        del cache_data[domain]
-        save_feeds_cache_data(cache_data)
+    removed = db.delete_feed(domain)
 
     deleted_articles = 0
     if delete_articles:
@@ -546,6 +764,21 @@ def get_curation_patterns():
     })
 
 
+@app.route("/api/llm-cache", methods=["GET"])
+def get_llm_cache_stats():
+    """Get LLM response cache size and hit/miss counts, overall and per prompt template."""
+    return jsonify(db.get_llm_cache_stats())
+
+
+@app.route("/api/llm-cache", methods=["DELETE"])
+def clear_llm_cache():
+    """Drop all cached LLM responses (the next calls go to the provider)."""
+    return jsonify({
+        "success": True,
+        "deleted": db.clear_llm_cache()
+    })
+
+
 @app.route("/api/migrate", methods=["POST"])
 def migrate_json():
     """Migrate existing digest_data.json to database."""
@@ -2,23 +2,146 @@
 Database layer for the Newsletter Curation Tool.
 Manages SQLite storage for articles, curation state, and newsletters.
 """
+import base64
 import hashlib
 import json
+import re
 import sqlite3
-from datetime import datetime
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
 from typing import Optional
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
 
 import config
+import near_dup
 
 
-def get_connection() -> sqlite3.Connection:
-    """Get a database connection with row factory."""
-    conn = sqlite3.connect(config.DATABASE_PATH)
+_local = threading.local()
+# Connections released by finished threads, as (database path, connection)
+_idle: list[tuple[str, sqlite3.Connection]] = []
+_idle_lock = threading.Lock()
+
+# Markers around matched terms in search snippets (see search_articles)
+SEARCH_MATCH_START = "\x02"
+SEARCH_MATCH_END = "\x03"
+
+# Queue filter: pending near-duplicates are shown through their cluster's representative
+_QUEUE_VISIBLE = "(a.cluster_id IS NULL OR c.status != 'pending')"
+# Number of near-duplicates clustered under each article
+_CLUSTER_SIZE = "(SELECT COUNT(*) FROM articles m WHERE m.cluster_id = a.id) AS cluster_size"
+
+# Columns and joins of queue listings (articles with curation state, LLM score
+# and preference model score)
+_QUEUE_COLUMNS = f"""
+    a.*, c.status, c.user_notes, c.curated_at, c.archived, c.archived_at, c.top_pick,
+    {_CLUSTER_SIZE}, s.score AS relevance_score, s.reason AS relevance_reason,
+    p.score AS preference_score
+"""
+_QUEUE_JOINS = """
+    JOIN curation c ON a.id = c.article_id
+    LEFT JOIN article_scores s ON s.article_id = a.id
+    LEFT JOIN article_preferences p ON p.article_id = a.id
+"""
+
+# Queue orderings (/api/articles?sort=...): sort keys, all descending. Top picks
+# always come first and the article id last, so keyset cursors are unambiguous.
+# c.sort_date is COALESCE(a.published, a.fetched_at), kept in sync by triggers.
+QUEUE_SORTS = {
+    "date": ("c.top_pick", "c.sort_date", "c.article_id"),
+    "relevance": ("c.top_pick", "COALESCE(s.score, -1)", "c.sort_date", "c.article_id"),
+    "preference": ("c.top_pick", "COALESCE(p.score, -1)", "c.sort_date", "c.article_id"),
+}
+
+
+class _PooledConnection:
+    """
+    Proxy for a thread's cached connection. close() leaves the connection
+    open for the thread's next call: an enclosing call may still have a
+    transaction open on it, so anything uncommitted is only rolled back by
+    release_connection().
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc_info):
+        return self._conn.__exit__(*exc_info)
+
+    def close(self) -> None:
+        pass
+
+
+def _open_connection() -> sqlite3.Connection:
+    """Open a connection tuned for concurrent API/sync access (WAL, busy timeout)."""
+    # Connections move between threads through the idle pool (one thread at a time)
+    conn = sqlite3.connect(config.DATABASE_PATH, timeout=config.DB_BUSY_TIMEOUT_MS / 1000,
+                           check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {int(config.DB_BUSY_TIMEOUT_MS)}")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{int(config.DB_CACHE_SIZE_KB)}")
+    conn.execute(f"PRAGMA mmap_size = {int(config.DB_MMAP_SIZE)}")
     return conn
 
 
+def _checkout_connection() -> sqlite3.Connection:
+    """An idle connection to DATABASE_PATH from the pool, or a new one."""
+    with _idle_lock:
+        while _idle:
+            path, conn = _idle.pop()
+            if path == config.DATABASE_PATH:
+                return conn
+            conn.close()
+    return _open_connection()
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Get a database connection with row factory.
+    Each thread keeps one connection until release_connection(), taking it
+    from the idle pool when there is one; calling close() on the returned
+    object releases it back to the thread rather than closing it.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path != config.DATABASE_PATH:
+        conn.close()
+        conn = None
+    if conn is None:
+        conn = _checkout_connection()
+        _local.conn = conn
+        _local.path = config.DATABASE_PATH
+    return _PooledConnection(conn)
+
+
+def release_connection() -> None:
+    """
+    Return the current thread's connection to the idle pool (closing it if
+    DB_POOL_SIZE connections are already idle). For threads that end after a
+    unit of work, such as the API's per-request threads, so their connections
+    are reused by the next ones instead of being opened anew and left to the
+    garbage collector.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        return
+    _local.conn = None
+    if conn.in_transaction:
+        conn.rollback()
+    with _idle_lock:
+        if _local.path == config.DATABASE_PATH and len(_idle) < config.DB_POOL_SIZE:
+            _idle.append((_local.path, conn))
+            return
+    conn.close()
+
+
 def init_db() -> None:
     """Create tables if they don't exist."""
     conn = get_connection()
@@ -35,7 +158,11 @@ def init_db() -> None:
             published TEXT,
             topic TEXT,
             fetched_at TEXT,
-            week TEXT
+            week TEXT,
+            host TEXT,
+            source_host TEXT,
+            canonical_url TEXT,
+            cluster_id TEXT
         )
     """)
 
@@ -46,9 +173,10 @@ def init_db() -> None:
             status TEXT DEFAULT 'pending',
             user_notes TEXT,
             curated_at TEXT,
-            archived INTEGER DEFAULT 0,
+            archived INTEGER NOT NULL DEFAULT 0,
             archived_at TEXT,
-            top_pick INTEGER DEFAULT 0,
+            top_pick INTEGER NOT NULL DEFAULT 0,
+            sort_date TEXT,
             FOREIGN KEY (article_id) REFERENCES articles(id)
         )
     """)
@@ -62,6 +190,40 @@ def init_db() -> None:
         cursor.execute("ALTER TABLE curation ADD COLUMN archived_at TEXT")
     if "top_pick" not in columns:
         cursor.execute("ALTER TABLE curation ADD COLUMN top_pick INTEGER DEFAULT 0")
+    backfill_sort_date = "sort_date" not in columns
+
+    # Migration: Make archived/top_pick NOT NULL so queue filters are plain
+    # equality checks that the (archived, status, top_pick) index can serve
+    cursor.execute("PRAGMA table_info(curation)")
+    notnull = {col[1]: col[3] for col in cursor.fetchall()}
+    if not notnull["archived"] or not notnull["top_pick"]:
+        cursor.execute("ALTER TABLE curation RENAME TO curation_old")
+        cursor.execute("""
+            CREATE TABLE curation (
+                article_id TEXT PRIMARY KEY,
+                status TEXT DEFAULT 'pending',
+                user_notes TEXT,
+                curated_at TEXT,
+                archived INTEGER NOT NULL DEFAULT 0,
+                archived_at TEXT,
+                top_pick INTEGER NOT NULL DEFAULT 0,
+                sort_date TEXT,
+                FOREIGN KEY (article_id) REFERENCES articles(id)
+            )
+        """)
+        cursor.execute("""
+            INSERT INTO curation (article_id, status, user_notes, curated_at, archived, archived_at, top_pick)
+            SELECT article_id, status, user_notes, curated_at,
+                   COALESCE(archived, 0), archived_at, COALESCE(top_pick, 0)
+            FROM curation_old
+        """)
+        cursor.execute("DROP TABLE curation_old")
+
+    # Migration: Queue sort key (COALESCE(published, fetched_at)) stored on
+    # curation, so one index serves both the queue filters and its ordering
+    cursor.execute("PRAGMA table_info(curation)")
+    if "sort_date" not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE curation ADD COLUMN sort_date TEXT")
 
     # Newsletters (generated outputs)
     cursor.execute("""
@@ -83,6 +245,60 @@ def init_db() -> None:
         )
     """)
 
+    # Feeds (per-domain discovery results and HTTP validators)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS feeds (
+            domain TEXT PRIMARY KEY,
+            feed_url TEXT,
+            no_feed INTEGER DEFAULT 0,
+            discovered_at TEXT,
+            updated_at TEXT,
+            checked_at TEXT,
+            attempts INTEGER,
+            retry_after TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            last_fetched_at TEXT,
+            last_new_item_at TEXT,
+            cadence_seconds INTEGER,
+            next_due_at TEXT
+        )
+    """)
+
+    # Migration: Per-feed polling schedule columns
+    cursor.execute("PRAGMA table_info(feeds)")
+    feed_columns = [col[1] for col in cursor.fetchall()]
+    for column, column_type in (("last_fetched_at", "TEXT"), ("last_new_item_at", "TEXT"),
+                                ("cadence_seconds", "INTEGER"), ("next_due_at", "TEXT")):
+        if column not in feed_columns:
+            cursor.execute(f"ALTER TABLE feeds ADD COLUMN {column} {column_type}")
+
+    # Migration: One-time import of the legacy feeds_cache.json
+    _import_feeds_cache_json(cursor)
+
+    # Background jobs (sync, discovery, newsletter generation; see jobs.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            params TEXT,
+            dedupe_key TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 1,
+            run_after TEXT NOT NULL,
+            lease_owner TEXT,
+            lease_expires_at TEXT,
+            progress TEXT,
+            result TEXT,
+            error TEXT,
+            created_at TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            updated_at TEXT
+        )
+    """)
+
     # Migration: Drop score/reason columns if they exist
     cursor.execute("PRAGMA table_info(articles)")
     article_columns = [col[1] for col in cursor.fetchall()]
@@ -108,18 +324,716 @@ def init_db() -> None:
         """)
         cursor.execute("DROP TABLE articles_old")
 
+    # Migration: Normalized URL/source hosts for subscription matching
+    cursor.execute("PRAGMA table_info(articles)")
+    article_columns = [col[1] for col in cursor.fetchall()]
+    if "host" not in article_columns:
+        cursor.execute("ALTER TABLE articles ADD COLUMN host TEXT")
+    if "source_host" not in article_columns:
+        cursor.execute("ALTER TABLE articles ADD COLUMN source_host TEXT")
+    cursor.execute("SELECT id, url, source FROM articles WHERE host IS NULL OR source_host IS NULL")
+    cursor.executemany(
+        "UPDATE articles SET host = ?, source_host = ? WHERE id = ?",
+        [
+            (_normalize_host(row["url"] or ""), _normalize_host(row["source"] or ""), row["id"])
+            for row in cursor.fetchall()
+        ],
+    )
+
+    # Migration: Key articles by canonical URL, merging duplicate rows
+    cursor.execute("PRAGMA table_info(articles)")
+    article_columns = [col[1] for col in cursor.fetchall()]
+    if "canonical_url" not in article_columns:
+        cursor.execute("ALTER TABLE articles ADD COLUMN canonical_url TEXT")
+        _merge_duplicate_articles(cursor)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_canonical_url
+        ON articles(canonical_url)
+    """)
+
+    # Migration: Re-key articles stored while only one leading www. was
+    # stripped (e.g. www.www.example.com), whose canonical URL is not canonical
+    cursor.execute("""
+        SELECT 1 FROM articles
+        WHERE canonical_url >= 'https://www.' AND canonical_url < 'https://www/'
+        LIMIT 1
+    """)
+    if cursor.fetchone():
+        _merge_duplicate_articles(cursor)
+
+    # Near-duplicate index; existing articles are clustered once, oldest first
+    cursor.execute("PRAGMA table_info(articles)")
+    article_columns = [col[1] for col in cursor.fetchall()]
+    backfill_near_dups = "cluster_id" not in article_columns
+    if backfill_near_dups:
+        cursor.execute("ALTER TABLE articles ADD COLUMN cluster_id TEXT")
+    _init_near_dup_index(cursor)
+    if backfill_near_dups:
+        cursor.execute("SELECT id FROM articles ORDER BY rowid")
+        _cluster_near_duplicates(cursor, [row["id"] for row in cursor.fetchall()])
+
+    # LLM relevance scores, with a hash of the input each was computed from (see scoring.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_scores (
+            article_id TEXT PRIMARY KEY,
+            score REAL NOT NULL,
+            reason TEXT,
+            provider TEXT,
+            model TEXT,
+            input_hash TEXT NOT NULL,
+            scored_at TEXT
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_scores_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM article_scores WHERE article_id = old.id;
+        END
+    """)
+
+    # Local curation-preference model (single row) and its article scores (see preference.py)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS preference_model (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            weights BLOB NOT NULL,
+            bias REAL NOT NULL,
+            idf BLOB NOT NULL,
+            examples INTEGER NOT NULL,
+            fingerprint TEXT NOT NULL,
+            trained_at TEXT NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_preferences (
+            article_id TEXT PRIMARY KEY,
+            score REAL NOT NULL,
+            model_trained_at TEXT NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_preferences_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM article_preferences WHERE article_id = old.id;
+        END
+    """)
+
+    # Article embeddings for related-article and semantic search (see embeddings.py);
+    # a vector is dropped when its article's text changes, so it gets re-embedded
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS article_embeddings (
+            article_id TEXT PRIMARY KEY,
+            backend TEXT NOT NULL,
+            vector BLOB NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_embeddings_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM article_embeddings WHERE article_id = old.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_embeddings_update AFTER UPDATE OF title, summary ON articles
+        WHEN old.title IS NOT new.title OR old.summary IS NOT new.summary BEGIN
+            DELETE FROM article_embeddings WHERE article_id = old.id;
+        END
+    """)
+
+    # LLM response cache (see llm.complete) and its per-template hit/miss counters
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            cache_key TEXT PRIMARY KEY,
+            template TEXT NOT NULL,
+            template_version INTEGER NOT NULL,
+            provider TEXT NOT NULL,
+            model TEXT NOT NULL,
+            response TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            last_used_at TEXT NOT NULL,
+            hits INTEGER DEFAULT 0
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used_at)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS llm_cache_stats (
+            template TEXT PRIMARY KEY,
+            hits INTEGER DEFAULT 0,
+            misses INTEGER DEFAULT 0
+        )
+    """)
+
+    # Full-text search index (kept in sync by triggers)
+    _init_search_index(cursor)
+
     # Create indexes for common queries
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_week ON articles(week)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_curation_status ON curation(status)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_host ON articles(host, source_host)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_source_host ON articles(source_host)")
+
+    # Queue indexes: filter on archived (and status), then already in the
+    # QUEUE_SORTS["date"] order, so the queue and its pages need no sort step
+    _init_queue_sort_key(cursor, backfill=backfill_sort_date)
+    cursor.execute("DROP INDEX IF EXISTS idx_curation_queue")
+    cursor.execute("DROP INDEX IF EXISTS idx_articles_sort_date")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_curation_queue_status
+        ON curation(archived, status, top_pick, sort_date, article_id)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_curation_queue_current
+        ON curation(archived, top_pick, sort_date, article_id)
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, run_after)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_kind ON jobs(kind, id)")
+    # At most one queued/running job per dedupe key (e.g. one feed sync at a time)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_dedupe
+        ON jobs(dedupe_key) WHERE status IN ('queued', 'running')
+    """)
 
     conn.commit()
     conn.close()
 
 
+# Curation outcome kept when duplicate articles are merged (highest wins)
+_STATUS_MERGE_PRIORITY = {"pending": 0, "rejected": 1, "shortlisted": 2}
+
+
+def _merge_curation(rows: list[sqlite3.Row]) -> Optional[dict]:
+    """Combine the curation state of duplicate articles into one row."""
+    curated = [row for row in rows if row["curation_id"] is not None]
+    if not curated:
+        return None
+
+    notes = []
+    for row in curated:
+        note = (row["user_notes"] or "").strip()
+        if note and note not in notes:
+            notes.append(note)
+    archived = int(all(row["archived"] for row in curated))
+    status = max(
+        (row["status"] or "pending" for row in curated),
+        key=lambda status: _STATUS_MERGE_PRIORITY.get(status, 0),
+    )
+    return {
+        "status": status,
+        "user_notes": "\n\n".join(notes) or None,
+        "curated_at": max((row["curated_at"] or "" for row in curated)) or None,
+        "archived": archived,
+        "archived_at": (max(row["archived_at"] or "" for row in curated) or None) if archived else None,
+        # Only shortlisted articles can be top picks
+        "top_pick": int(status == "shortlisted" and any(row["top_pick"] for row in curated)),
+    }
+
+
+def _merge_duplicate_articles(cursor: sqlite3.Cursor) -> None:
+    """
+    Re-key every article by its canonical URL. Articles sharing a canonical
+    URL are merged into the earliest fetched one, combining their curation
+    state, and newsletters are updated to reference the surviving IDs.
+    """
+    cursor.execute("""
+        SELECT a.id, a.url, c.article_id AS curation_id, c.status, c.user_notes,
+               c.curated_at, c.archived, c.archived_at, c.top_pick
+        FROM articles a
+        LEFT JOIN curation c ON c.article_id = a.id
+        ORDER BY a.fetched_at, a.rowid
+    """)
+    groups: dict[str, list[sqlite3.Row]] = {}
+    for row in cursor.fetchall():
+        if row["url"]:
+            groups.setdefault(canonicalize_url(row["url"]), []).append(row)
+
+    id_map = {}
+    for canonical, rows in groups.items():
+        survivor, duplicates = rows[0], rows[1:]
+        new_id = generate_article_id(canonical)
+        for row in rows:
+            id_map[row["id"]] = new_id
+
+        if duplicates:
+            duplicate_ids = [row["id"] for row in duplicates]
+            placeholders = ",".join("?" for _ in duplicate_ids)
+            cursor.execute(f"DELETE FROM curation WHERE article_id IN ({placeholders})", duplicate_ids)
+            cursor.execute(f"DELETE FROM articles WHERE id IN ({placeholders})", duplicate_ids)
+
+        cursor.execute(
+            "UPDATE articles SET id = ?, canonical_url = ? WHERE id = ?",
+            (new_id, canonical, survivor["id"]),
+        )
+        if survivor["id"] == new_id and not duplicates:
+            continue
+
+        curation = _merge_curation(rows)
+        cursor.execute("DELETE FROM curation WHERE article_id = ?", (survivor["id"],))
+        if curation:
+            cursor.execute("""
+                INSERT INTO curation (article_id, status, user_notes, curated_at,
+                                      archived, archived_at, top_pick)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
+                new_id, curation["status"], curation["user_notes"], curation["curated_at"],
+                curation["archived"], curation["archived_at"], curation["top_pick"],
+            ))
+
+    cursor.execute("SELECT id, article_ids FROM newsletters")
+    for row in cursor.fetchall():
+        try:
+            article_ids = json.loads(row["article_ids"] or "[]")
+        except json.JSONDecodeError:
+            continue
+        remapped = list(dict.fromkeys(id_map.get(article_id, article_id) for article_id in article_ids))
+        if remapped != article_ids:
+            cursor.execute(
+                "UPDATE newsletters SET article_ids = ? WHERE id = ?",
+                (json.dumps(remapped), row["id"]),
+            )
+
+
+def _init_near_dup_index(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the near-duplicate index (see near_dup.py): MinHash signatures,
+    their LSH buckets, and the trigger that drops a deleted article's entries
+    and dissolves the cluster it represented.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS near_dup_signatures (
+            article_id TEXT PRIMARY KEY,
+            signature BLOB NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS near_dup_buckets (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            article_id TEXT NOT NULL,
+            PRIMARY KEY (band, bucket, article_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_near_dup_buckets_article ON near_dup_buckets(article_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_cluster ON articles(cluster_id)")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_near_dup_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM near_dup_signatures WHERE article_id = old.id;
+            DELETE FROM near_dup_buckets WHERE article_id = old.id;
+            UPDATE articles SET cluster_id = NULL WHERE cluster_id = old.id;
+        END
+    """)
+
+
+def _find_near_duplicate(cursor: sqlite3.Cursor, article_id: str, signature: bytes,
+                         keys: list[tuple[int, int]]) -> Optional[str]:
+    """
+    Representative of the most similar non-archived cluster sharing an LSH
+    bucket with `signature`, or None if no candidate reaches NEAR_DUP_THRESHOLD.
+    """
+    cursor.execute(f"""
+        SELECT DISTINCT a.id, s.signature, COALESCE(a.cluster_id, a.id) AS representative
+        FROM near_dup_buckets b
+        JOIN near_dup_signatures s ON s.article_id = b.article_id
+        JOIN articles a ON a.id = b.article_id
+        JOIN curation rc ON rc.article_id = COALESCE(a.cluster_id, a.id)
+        WHERE ({" OR ".join("(b.band = ? AND b.bucket = ?)" for _ in keys)})
+          AND rc.archived = 0 AND a.id != ?
+    """, (*(value for key in keys for value in key), article_id))
+
+    best, best_similarity = None, config.NEAR_DUP_THRESHOLD
+    for row in cursor.fetchall():
+        similarity = near_dup.similarity(signature, row["signature"])
+        if similarity >= best_similarity:
+            best, best_similarity = row["representative"], similarity
+    return best
+
+
+def _cluster_near_duplicates(cursor: sqlite3.Cursor, article_ids: list[str]) -> int:
+    """
+    Index the MinHash signatures of not-yet-indexed articles and attach each
+    pending one to the cluster of its closest current near-duplicate, if any.
+    Articles are handled in the given order, so earlier ones can represent
+    later ones from the same batch. Returns the number of articles clustered.
+    """
+    if not config.NEAR_DUP_ENABLED:
+        return 0
+
+    clustered = 0
+    for start in range(0, len(article_ids), config.DB_UPSERT_BATCH_SIZE):
+        batch = article_ids[start:start + config.DB_UPSERT_BATCH_SIZE]
+        placeholders = ",".join("?" for _ in batch)
+        cursor.execute(f"""
+            SELECT a.id, a.title, a.summary, c.status, c.archived
+            FROM articles a
+            LEFT JOIN curation c ON a.id = c.article_id
+            LEFT JOIN near_dup_signatures s ON s.article_id = a.id
+            WHERE a.id IN ({placeholders}) AND s.article_id IS NULL
+        """, batch)
+        rows = {row["id"]: row for row in cursor.fetchall()}
+
+        for article_id in batch:
+            row = rows.get(article_id)
+            if row is None:
+                continue
+            signature = near_dup.signature(row["title"], row["summary"])
+            if signature is None:
+                continue
+            keys = near_dup.bucket_keys(signature)
+
+            # Curated articles stay visible on their own
+            cluster_id = None
+            if row["status"] in (None, "pending") and not row["archived"]:
+                cluster_id = _find_near_duplicate(cursor, article_id, signature, keys)
+            if cluster_id:
+                clustered += 1
+
+            cursor.execute(
+                "INSERT INTO near_dup_signatures (article_id, signature) VALUES (?, ?)",
+                (article_id, signature),
+            )
+            if cluster_id:
+                cursor.execute("UPDATE articles SET cluster_id = ? WHERE id = ?", (cluster_id, article_id))
+            cursor.executemany(
+                "INSERT INTO near_dup_buckets (band, bucket, article_id) VALUES (?, ?, ?)",
+                [(band, bucket, article_id) for band, bucket in keys],
+            )
+
+    return clustered
+
+
+def _init_queue_sort_key(cursor: sqlite3.Cursor, backfill: bool = False) -> None:
+    """
+    Create the triggers that keep curation.sort_date equal to the article's
+    COALESCE(published, fetched_at), and with backfill fill it for all rows.
+    """
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS curation_sort_date_insert AFTER INSERT ON curation BEGIN
+            UPDATE curation
+            SET sort_date = (SELECT COALESCE(published, fetched_at) FROM articles WHERE id = new.article_id)
+            WHERE article_id = new.article_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_sort_date_update AFTER UPDATE OF published, fetched_at ON articles
+        BEGIN
+            UPDATE curation SET sort_date = COALESCE(new.published, new.fetched_at)
+            WHERE article_id = new.id;
+        END
+    """)
+    if backfill:
+        cursor.execute("""
+            UPDATE curation
+            SET sort_date = (SELECT COALESCE(published, fetched_at) FROM articles WHERE id = curation.article_id)
+        """)
+
+
+def _init_search_index(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the articles_fts FTS5 index over title, summary and curator notes,
+    plus the triggers that keep it in sync with articles and curation.
+    FTS rows share the article's rowid; the index is rebuilt if it is new or
+    has drifted (e.g. rowids renumbered by VACUUM).
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")
+    if not cursor.fetchone():
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE articles_fts USING fts5(
+                    article_id UNINDEXED, title, summary, user_notes,
+                    tokenize = 'porter unicode61'
+                )
+            """)
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search is unavailable
+            return
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts (rowid, article_id, title, summary, user_notes)
+            VALUES (new.rowid, new.id, new.title, new.summary,
+                    (SELECT user_notes FROM curation WHERE article_id = new.id));
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary ON articles BEGIN
+            UPDATE articles_fts SET title = new.title, summary = new.summary
+            WHERE rowid = new.rowid;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            DELETE FROM articles_fts WHERE rowid = old.rowid;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS curation_fts_insert AFTER INSERT ON curation BEGIN
+            UPDATE articles_fts SET user_notes = new.user_notes
+            WHERE rowid = (SELECT rowid FROM articles WHERE id = new.article_id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS curation_fts_update AFTER UPDATE OF user_notes ON curation BEGIN
+            UPDATE articles_fts SET user_notes = new.user_notes
+            WHERE rowid = (SELECT rowid FROM articles WHERE id = new.article_id);
+        END
+    """)
+
+    cursor.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM articles) AS articles,
+            (SELECT COUNT(*) FROM articles_fts) AS indexed,
+            (SELECT COUNT(*) FROM articles a JOIN articles_fts f ON f.rowid = a.rowid
+             WHERE f.article_id = a.id) AS aligned
+    """)
+    row = cursor.fetchone()
+    if row["articles"] == row["indexed"] == row["aligned"]:
+        return
+
+    cursor.execute("DELETE FROM articles_fts")
+    cursor.execute("""
+        INSERT INTO articles_fts (rowid, article_id, title, summary, user_notes)
+        SELECT a.rowid, a.id, a.title, a.summary, c.user_notes
+        FROM articles a
+        LEFT JOIN curation c ON a.id = c.article_id
+    """)
+
+
+FEED_FIELDS = (
+    "feed_url", "no_feed", "discovered_at", "updated_at", "checked_at",
+    "attempts", "retry_after", "etag", "last_modified",
+    "last_fetched_at", "last_new_item_at", "cadence_seconds", "next_due_at",
+)
+
+# Per-fetch state written back after each sync (see update_feed_fetch_state)
+FEED_FETCH_FIELDS = (
+    "etag", "last_modified",
+    "last_fetched_at", "last_new_item_at", "cadence_seconds", "next_due_at",
+)
+
+
+def _import_feeds_cache_json(cursor: sqlite3.Cursor) -> None:
+    """Import feeds_cache.json into the feeds table once, keeping existing rows."""
+    cursor.execute("SELECT value FROM cron_state WHERE key = 'feeds_cache_imported'")
+    if cursor.fetchone():
+        return
+
+    try:
+        with open(config.FEEDS_CACHE_FILE, "r") as f:
+            cache_data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache_data = {}
+
+    rows = [
+        (domain, *_feed_entry_values(entry or {}, FEED_FIELDS))
+        for domain, entry in cache_data.items()
+    ]
+    if rows:
+        placeholders = ", ".join("?" for _ in FEED_FIELDS)
+        cursor.executemany(f"""
+            INSERT OR IGNORE INTO feeds (domain, {", ".join(FEED_FIELDS)})
+            VALUES (?, {placeholders})
+        """, rows)
+
+    now = datetime.now().isoformat()
+    cursor.execute("""
+        INSERT INTO cron_state (key, value, updated_at)
+        VALUES ('feeds_cache_imported', ?, ?)
+    """, (str(len(rows)), now))
+
+
+def _feed_entry_values(entry: dict, fields: tuple) -> list:
+    """Column values for a feeds-cache entry, in `fields` order."""
+    values = []
+    for field in fields:
+        value = entry.get(field)
+        if field == "no_feed":
+            value = 1 if value else 0
+        values.append(value)
+    return values
+
+
+def _feed_row_to_entry(row: sqlite3.Row) -> dict:
+    """Convert a feeds row to the feeds-cache entry shape (unset fields omitted)."""
+    entry = {}
+    for field in FEED_FIELDS:
+        value = row[field]
+        if field == "no_feed":
+            if value:
+                entry["no_feed"] = True
+        elif value is not None:
+            entry[field] = value
+    return entry
+
+
+def get_feeds(subscribed_only: bool = False) -> dict:
+    """
+    Get the feeds cache as {domain: entry}.
+    With subscribed_only, only domains that have a feed URL are returned.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    if subscribed_only:
+        cursor.execute("SELECT * FROM feeds WHERE feed_url IS NOT NULL AND feed_url != ''")
+    else:
+        cursor.execute("SELECT * FROM feeds")
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return {row["domain"]: _feed_row_to_entry(row) for row in rows}
+
+
+def get_feed(domain: str) -> Optional[dict]:
+    """Get the feeds-cache entry for a single domain."""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT * FROM feeds WHERE domain = ?", (domain,))
+    row = cursor.fetchone()
+    conn.close()
+
+    return _feed_row_to_entry(row) if row else None
+
+
+def upsert_feeds(entries: dict, fields: Optional[tuple] = None) -> None:
+    """
+    Insert or update feeds-cache entries ({domain: entry}) in one transaction.
+    By default every field is written (missing keys are cleared); pass `fields`
+    to update only those columns and leave the rest of each row untouched.
+    """
+    if not entries:
+        return
+
+    fields = tuple(fields or FEED_FIELDS)
+    unknown = set(fields) - set(FEED_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown feed fields: {sorted(unknown)}")
+
+    columns = ", ".join(fields)
+    placeholders = ", ".join("?" for _ in fields)
+    assignments = ", ".join(f"{field} = excluded.{field}" for field in fields)
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.executemany(f"""
+        INSERT INTO feeds (domain, {columns})
+        VALUES (?, {placeholders})
+        ON CONFLICT(domain) DO UPDATE SET {assignments}
+    """, [
+        (domain, *_feed_entry_values(entry or {}, fields))
+        for domain, entry in entries.items()
+    ])
+    conn.commit()
+    conn.close()
+
+
+def upsert_feed(domain: str, entry: dict, fields: Optional[tuple] = None) -> None:
+    """Insert or update a single feeds-cache entry (see upsert_feeds)."""
+    upsert_feeds({domain: entry}, fields)
+
+
+def update_feed_fetch_state(entries: dict) -> None:
+    """
+    Store per-fetch state for {domain: entry}: HTTP validators (etag/last_modified)
+    and the polling schedule (see feed_scheduler).
+    Rows whose feed URL has changed since the fetch are left alone.
+    """
+    if not entries:
+        return
+
+    assignments = ", ".join(f"{field} = ?" for field in FEED_FETCH_FIELDS)
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.executemany(f"""
+        UPDATE feeds
+        SET {assignments}
+        WHERE domain = ? AND feed_url = ?
+    """, [
+        (*_feed_entry_values(entry, FEED_FETCH_FIELDS), domain, entry.get("feed_url"))
+        for domain, entry in entries.items()
+    ])
+    conn.commit()
+    conn.close()
+
+
+def delete_feed(domain: str) -> bool:
+    """Delete a feeds-cache entry. Returns True if a row was removed."""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM feeds WHERE domain = ?", (domain,))
+
+    success = cursor.rowcount > 0
+    conn.commit()
+    conn.close()
+
+    return success
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in config.TRACKING_QUERY_PARAMS or name.startswith(config.TRACKING_QUERY_PREFIXES)
+
+
+def _unwrap_redirect(url: str) -> Optional[str]:
+    """Target URL of a known redirect wrapper (see URL_REDIRECT_WRAPPERS), if any."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    params = (config.URL_REDIRECT_WRAPPERS.get(host + parts.path.rstrip("/"))
+              or config.URL_REDIRECT_WRAPPERS.get(host))
+    if not params:
+        return None
+
+    query = parse_qs(parts.query)
+    for param in params:
+        target = (query.get(param) or [""])[0].strip()
+        if target.startswith(("http://", "https://")):
+            return target
+    return None
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of an article URL, used for its ID and for dedup:
+    redirect wrappers resolved, https scheme, lowercase host without www.
+    or default port, tracking params dropped, remaining params sorted,
+    no trailing slash and no fragment. Non-http(s) URLs are returned as-is.
+    """
+    text = (url or "").strip()
+    # Wrappers can be nested (e.g. a Google redirect to a Facebook link shim)
+    for _ in range(3):
+        target = _unwrap_redirect(text)
+        if not target:
+            break
+        text = target
+
+    parts = urlsplit(text)
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        return text
+
+    host = parts.hostname.rstrip(".")
+    # Strip every leading www. (not just one) so the result is canonical too
+    while host.startswith("www."):
+        host = host[4:]
+    if ":" in host:
+        host = f"[{host}]"
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    )
+    return urlunsplit(("https", host, parts.path.rstrip("/"), urlencode(query), ""))
+
+
 def generate_article_id(url: str) -> str:
-    """Generate a unique ID for an article based on its URL."""
-    return hashlib.sha256(url.encode()).hexdigest()[:16]
+    """Generate a unique ID for an article based on its canonical URL."""
+    return hashlib.sha256(canonicalize_url(url).encode()).hexdigest()[:16]
 
 
 def _normalize_host(value: str) -> str:
@@ -153,25 +1067,23 @@ def _get_matching_article_ids_for_subscription(domain: str, feed_url: str) -> li
     Find article IDs associated with a subscription by matching normalized hosts
     against both article source host and article URL host.
     """
-    hosts = _subscription_match_hosts(domain, feed_url)
+    hosts = list(_subscription_match_hosts(domain, feed_url))
     if not hosts:
         return []
 
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT id, url, source FROM articles")
-    rows = cursor.fetchall()
-    conn.close()
 
-    matched_ids = []
-    for row in rows:
-        source_host = _normalize_host(row["source"] or "")
-        url_host = _normalize_host(row["url"] or "")
+    placeholders = ",".join("?" for _ in hosts)
+    cursor.execute(f"""
+        SELECT id FROM articles
+        WHERE host IN ({placeholders}) OR source_host IN ({placeholders})
+    """, hosts + hosts)
 
-        if source_host in hosts or url_host in hosts:
-            matched_ids.append(row["id"])
+    rows = cursor.fetchall()
+    conn.close()
 
-    return matched_ids
+    return [row["id"] for row in rows]
 
 
 def get_current_week() -> str:
@@ -211,6 +1123,258 @@ def set_last_cron_run() -> None:
     conn.close()
 
 
+def _job_row_to_dict(row: sqlite3.Row) -> dict:
+    """Convert a jobs row to a dict, decoding its JSON columns."""
+    job = dict(row)
+    for key in ("params", "progress", "result"):
+        job[key] = json.loads(job[key]) if job[key] else None
+    return job
+
+
+def enqueue_job(kind: str, params: Optional[dict] = None, dedupe_key: Optional[str] = None,
+                max_attempts: int = 1) -> tuple[dict, bool]:
+    """
+    Queue a background job. If dedupe_key is set and a queued/running job
+    already holds it, that job is returned instead of creating a new one.
+    Returns (job, created).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    now = datetime.now().isoformat()
+
+    for _ in range(3):
+        try:
+            cursor.execute("""
+                INSERT INTO jobs (kind, params, dedupe_key, status, attempts, max_attempts,
+                                  run_after, created_at, updated_at)
+                VALUES (?, ?, ?, 'queued', 0, ?, ?, ?, ?)
+            """, (kind, json.dumps(params or {}), dedupe_key, max(1, max_attempts), now, now, now))
+            job_id = cursor.lastrowid
+            conn.commit()
+            conn.close()
+            return get_job(job_id), True
+        except sqlite3.IntegrityError:
+            conn.rollback()
+        cursor.execute("""
+            SELECT * FROM jobs
+            WHERE dedupe_key = ? AND status IN ('queued', 'running')
+        """, (dedupe_key,))
+        row = cursor.fetchone()
+        if row:
+            conn.close()
+            return _job_row_to_dict(row), False
+        # The active job finished between the insert and the lookup; try again
+
+    conn.close()
+    raise RuntimeError(f"Could not enqueue {kind} job for {dedupe_key}")
+
+
+def claim_job(owner: str, lease_seconds: int, kinds: Optional[list[str]] = None,
+              exclusive_kinds: Optional[tuple[str, ...]] = None) -> Optional[dict]:
+    """
+    Claim the next runnable job for `owner`, leasing it for lease_seconds.
+    Running jobs whose lease expired (their worker died) are first requeued,
+    or failed once they are out of attempts. A job of one of exclusive_kinds
+    is not claimed while any job of those kinds is running.
+    Returns None if nothing is due.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    now = datetime.now()
+    now_iso = now.isoformat()
+
+    # Take the write lock up front so two workers can't claim the same job
+    cursor.execute("BEGIN IMMEDIATE")
+    cursor.execute("""
+        UPDATE jobs
+        SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+            finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END,
+            error = 'Lease expired before the job finished',
+            lease_owner = NULL,
+            lease_expires_at = NULL,
+            updated_at = ?
+        WHERE status = 'running' AND lease_expires_at < ?
+    """, (now_iso, now_iso, now_iso))
+
+    query = "SELECT id FROM jobs WHERE status = 'queued' AND run_after <= ?"
+    params = [now_iso]
+    if kinds:
+        query += f" AND kind IN ({','.join('?' * len(kinds))})"
+        params.extend(kinds)
+    if exclusive_kinds:
+        marks = ",".join("?" * len(exclusive_kinds))
+        query += f"""
+            AND NOT (kind IN ({marks}) AND EXISTS (
+                SELECT 1 FROM jobs r WHERE r.status = 'running' AND r.kind IN ({marks})
+            ))
+        """
+        params.extend(exclusive_kinds)
+        params.extend(exclusive_kinds)
+    query += " ORDER BY run_after, id LIMIT 1"
+    cursor.execute(query, params)
+    row = cursor.fetchone()
+    if not row:
+        conn.commit()
+        conn.close()
+        return None
+
+    cursor.execute("""
+        UPDATE jobs
+        SET status = 'running',
+            attempts = attempts + 1,
+            lease_owner = ?,
+            lease_expires_at = ?,
+            started_at = ?,
+            updated_at = ?
+        WHERE id = ?
+    """, (owner, (now + timedelta(seconds=lease_seconds)).isoformat(), now_iso, now_iso, row["id"]))
+    conn.commit()
+    conn.close()
+    return get_job(row["id"])
+
+
+def heartbeat_job(job_id: int, owner: str, lease_seconds: int,
+                  progress: Optional[dict] = None) -> bool:
+    """
+    Extend a running job's lease (and record its latest progress, if given).
+    Returns False if `owner` no longer holds the lease.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    now = datetime.now()
+    cursor.execute("""
+        UPDATE jobs
+        SET lease_expires_at = ?,
+            progress = COALESCE(?, progress),
+            updated_at = ?
+        WHERE id = ? AND lease_owner = ? AND status = 'running'
+    """, (
+        (now + timedelta(seconds=lease_seconds)).isoformat(),
+        json.dumps(progress) if progress is not None else None,
+        now.isoformat(), job_id, owner,
+    ))
+    held = cursor.rowcount > 0
+    conn.commit()
+    conn.close()
+    return held
+
+
+def complete_job(job_id: int, owner: str, result: Optional[dict] = None,
+                 progress: Optional[dict] = None) -> bool:
+    """Mark a running job as succeeded. Returns False if `owner` lost the lease."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    now = datetime.now().isoformat()
+    cursor.execute("""
+        UPDATE jobs
+        SET status = 'succeeded',
+            result = ?,
+            progress = COALESCE(?, progress),
+            error = NULL,
+            lease_owner = NULL,
+            lease_expires_at = NULL,
+            finished_at = ?,
+            updated_at = ?
+        WHERE id = ? AND lease_owner = ? AND status = 'running'
+    """, (
+        json.dumps(result) if result is not None else None,
+        json.dumps(progress) if progress is not None else None,
+        now, now, job_id, owner,
+    ))
+    held = cursor.rowcount > 0
+    conn.commit()
+    conn.close()
+    return held
+
+
+def fail_job(job_id: int, owner: str, error: str, retry_delay_seconds: float = 0,
+             progress: Optional[dict] = None) -> bool:
+    """
+    Record a failed run. The job is requeued to run after retry_delay_seconds
+    while it has attempts left, otherwise marked failed.
+    Returns False if `owner` lost the lease.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    now = datetime.now()
+    now_iso = now.isoformat()
+    cursor.execute("""
+        UPDATE jobs
+        SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+            finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END,
+            run_after = ?,
+            error = ?,
+            progress = COALESCE(?, progress),
+            lease_owner = NULL,
+            lease_expires_at = NULL,
+            updated_at = ?
+        WHERE id = ? AND lease_owner = ? AND status = 'running'
+    """, (
+        now_iso, (now + timedelta(seconds=retry_delay_seconds)).isoformat(), error,
+        json.dumps(progress) if progress is not None else None,
+        now_iso, job_id, owner,
+    ))
+    held = cursor.rowcount > 0
+    conn.commit()
+    conn.close()
+    return held
+
+
+def get_job(job_id: int) -> Optional[dict]:
+    """Get a job by id."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+    row = cursor.fetchone()
+    conn.close()
+    return _job_row_to_dict(row) if row else None
+
+
+def get_latest_job(kind: str) -> Optional[dict]:
+    """Get the most recently queued job of a kind."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM jobs WHERE kind = ? ORDER BY id DESC LIMIT 1", (kind,))
+    row = cursor.fetchone()
+    conn.close()
+    return _job_row_to_dict(row) if row else None
+
+
+def get_jobs(kind: Optional[str] = None, status: Optional[str] = None, limit: int = 50) -> list[dict]:
+    """Get job history, newest first."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    query = "SELECT * FROM jobs WHERE 1 = 1"
+    params = []
+    if kind:
+        query += " AND kind = ?"
+        params.append(kind)
+    if status:
+        query += " AND status = ?"
+        params.append(status)
+    query += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    cursor.execute(query, params)
+    jobs = [_job_row_to_dict(row) for row in cursor.fetchall()]
+    conn.close()
+    return jobs
+
+
+def prune_jobs(older_than_days: int) -> int:
+    """Delete finished jobs older than the given number of days. Returns count deleted."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+    cursor.execute("""
+        DELETE FROM jobs
+        WHERE status IN ('succeeded', 'failed') AND finished_at < ?
+    """, (cutoff,))
+    deleted = cursor.rowcount
+    conn.commit()
+    conn.close()
+    return deleted
+
+
 def add_manual_article(url: str, title: str, summary: str, topic: str = "",
                        notes: str = "", week: Optional[str] = None,
                        auto_shortlist: bool = True) -> str:
@@ -223,7 +1387,8 @@ def add_manual_article(url: str, title: str, summary: str, topic: str = "",
 
     source = urlparse(url).netloc
 
-    article_id = generate_article_id(url)
+    canonical_url = canonicalize_url(url)
+    article_id = generate_article_id(canonical_url)
     fetched_at = datetime.now().isoformat()
 
     conn = get_connection()
@@ -231,12 +1396,13 @@ def add_manual_article(url: str, title: str, summary: str, topic: str = "",
 
     # Insert article
     cursor.execute("""
-        INSERT INTO articles (id, url, title, summary, source, published, topic, fetched_at, week)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO articles (id, url, title, summary, source, published, topic, fetched_at, week,
+                              host, source_host, canonical_url)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ON CONFLICT(id) DO UPDATE SET
             title = excluded.title,
             summary = excluded.summary,
-            topic = excluded.topic,
+            topic = COALESCE(NULLIF(excluded.topic, ''), articles.topic),
             fetched_at = excluded.fetched_at
     """, (
         article_id,
@@ -247,7 +1413,10 @@ def add_manual_article(url: str, title: str, summary: str, topic: str = "",
         datetime.now().isoformat(),
         topic,
         fetched_at,
-        week
+        week,
+        _normalize_host(url),
+        _normalize_host(source),
+        canonical_url,
     ))
 
     # Set curation status
@@ -261,6 +1430,9 @@ def add_manual_article(url: str, title: str, summary: str, topic: str = "",
             curated_at = excluded.curated_at
     """, (article_id, status, notes, fetched_at))
 
+    # Index it so syndicated copies arriving later cluster under it
+    _cluster_near_duplicates(cursor, [article_id])
+
     conn.commit()
     conn.close()
 
@@ -272,49 +1444,86 @@ def upsert_articles(items: list[dict], week: Optional[str] = None) -> int:
     Insert or update articles.
     Returns the number of articles inserted/updated.
     """
+    result = upsert_articles_bulk(items, week)
+    return result["inserted"] + result["updated"]
+
+
+def upsert_articles_bulk(items: list[dict], week: Optional[str] = None,
+                         batch_size: int = 0) -> dict:
+    """
+    Insert or update articles in batches of `batch_size` (default
+    DB_UPSERT_BATCH_SIZE) using executemany, all in a single transaction.
+    New articles that near-duplicate a current article join its cluster.
+    An empty topic keeps the article's existing one (see topic_classifier.py).
+    Returns {"inserted": n, "updated": n, "clustered": n}, counting each
+    distinct article once.
+    """
     if week is None:
         week = get_current_week()
+    batch_size = max(1, batch_size or config.DB_UPSERT_BATCH_SIZE)
 
-    conn = get_connection()
-    cursor = conn.cursor()
     fetched_at = datetime.now().isoformat()
-    count = 0
 
+    # Last occurrence of a canonical URL wins, matching sequential upsert semantics
+    rows = {}
     for item in items:
-        article_id = generate_article_id(item["url"])
-        topic = item.get("topic", "")
-
-        cursor.execute("""
-            INSERT INTO articles (id, url, title, summary, source, published, topic, fetched_at, week)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                title = excluded.title,
-                summary = excluded.summary,
-                topic = excluded.topic,
-                fetched_at = excluded.fetched_at
-        """, (
+        canonical_url = canonicalize_url(item["url"])
+        article_id = generate_article_id(canonical_url)
+        rows[article_id] = (
             article_id,
             item.get("url", ""),
             item.get("title", ""),
             item.get("summary", ""),
             item.get("source", ""),
             item.get("published", ""),
-            topic,
+            item.get("topic", ""),
             fetched_at,
-            week
-        ))
+            week,
+            _normalize_host(item.get("url", "")),
+            _normalize_host(item.get("source", "")),
+            canonical_url,
+        )
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    article_ids = list(rows)
+    inserted = 0
+    updated = 0
+    clustered = 0
+
+    for start in range(0, len(article_ids), batch_size):
+        batch = article_ids[start:start + batch_size]
+
+        placeholders = ",".join("?" for _ in batch)
+        cursor.execute(f"SELECT id FROM articles WHERE id IN ({placeholders})", batch)
+        existing = {row["id"] for row in cursor.fetchall()}
+
+        cursor.executemany("""
+            INSERT INTO articles (id, url, title, summary, source, published, topic, fetched_at, week,
+                                  host, source_host, canonical_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                title = excluded.title,
+                summary = excluded.summary,
+                topic = COALESCE(NULLIF(excluded.topic, ''), articles.topic),
+                fetched_at = excluded.fetched_at
+        """, [rows[article_id] for article_id in batch])
 
         # Initialize curation state if not exists
-        cursor.execute("""
+        cursor.executemany("""
             INSERT OR IGNORE INTO curation (article_id, status, curated_at)
             VALUES (?, 'pending', ?)
-        """, (article_id, fetched_at))
+        """, [(article_id, fetched_at) for article_id in batch])
 
-        count += 1
+        clustered += _cluster_near_duplicates(
+            cursor, [article_id for article_id in batch if article_id not in existing]
+        )
+        inserted += len(batch) - len(existing)
+        updated += len(existing)
 
     conn.commit()
     conn.close()
-    return count
+    return {"inserted": inserted, "updated": updated, "clustered": clustered}
 
 
 def get_articles_for_week(week: str, include_archived: bool = False) -> list[dict]:
@@ -334,8 +1543,8 @@ def get_articles_for_week(week: str, include_archived: bool = False) -> list[dic
         cursor.execute("""
             SELECT a.*, c.status, c.user_notes, c.curated_at, c.archived, c.archived_at, c.top_pick
             FROM articles a
-            LEFT JOIN curation c ON a.id = c.article_id
-            WHERE a.week = ? AND (c.archived = 0 OR c.archived IS NULL)
+            JOIN curation c ON a.id = c.article_id
+            WHERE a.week = ? AND c.archived = 0
             ORDER BY c.top_pick DESC, COALESCE(a.published, a.fetched_at) DESC
         """, (week,))
 
@@ -345,17 +1554,25 @@ def get_articles_for_week(week: str, include_archived: bool = False) -> list[dic
     return [dict(row) for row in rows]
 
 
-def get_current_articles() -> list[dict]:
-    """Get all non-archived articles (the 'current' view)."""
+def _queue_order(sort: str) -> str:
+    """ORDER BY clause for a QUEUE_SORTS ordering. Raises ValueError if unknown."""
+    if sort not in QUEUE_SORTS:
+        raise ValueError(f"Invalid sort: {sort}")
+    return ", ".join(f"{key} DESC" for key in QUEUE_SORTS[sort])
+
+
+def get_current_articles(sort: str = "date") -> list[dict]:
+    """Get all non-archived articles (the 'current' view), ordered by `sort`."""
+    order = _queue_order(sort)
     conn = get_connection()
     cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT a.*, c.status, c.user_notes, c.curated_at, c.archived, c.archived_at, c.top_pick
+    cursor.execute(f"""
+        SELECT {_QUEUE_COLUMNS}
         FROM articles a
-        LEFT JOIN curation c ON a.id = c.article_id
-        WHERE c.archived = 0 OR c.archived IS NULL
-        ORDER BY c.top_pick DESC, COALESCE(a.published, a.fetched_at) DESC
+        {_QUEUE_JOINS}
+        WHERE c.archived = 0 AND {_QUEUE_VISIBLE}
+        ORDER BY {order}
     """)
 
     rows = cursor.fetchall()
@@ -364,9 +1581,116 @@ def get_current_articles() -> list[dict]:
     return [dict(row) for row in rows]
 
 
+def _encode_cursor(values: list) -> str:
+    """Encode keyset pagination values as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, length: int = 3) -> list:
+    """
+    Decode a cursor produced by _encode_cursor holding `length` values, each
+    a string, number or None (the only types sort keys take).
+    Raises ValueError if malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("Invalid cursor")
+    for value in values:
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (str, int, float))):
+            raise ValueError("Invalid cursor")
+    return values
+
+
+def get_current_articles_page(status: Optional[str] = None, limit: int = 50,
+                              cursor: Optional[str] = None,
+                              sort: str = "date") -> tuple[list[dict], Optional[str]]:
+    """
+    Get one page of non-archived articles, optionally filtered by status.
+    Keyset-paginated on the QUEUE_SORTS keys of `sort` (by default top_pick,
+    sort_date, article id), all descending, so each page costs
+    the same regardless of depth. A cursor only continues the sort it came from.
+    Returns (articles, next_cursor); next_cursor is None on the last page.
+    """
+    order = _queue_order(sort)
+    keys = QUEUE_SORTS[sort]
+    where = ["c.archived = 0", _QUEUE_VISIBLE]
+    params = []
+
+    if status:
+        where.append("c.status = ?")
+        params.append(status)
+
+    if cursor:
+        where.append(f"({', '.join(keys)}) < ({', '.join('?' for _ in keys)})")
+        params.extend(_decode_cursor(cursor, len(keys)))
+
+    conn = get_connection()
+    cursor_ = conn.cursor()
+
+    sort_columns = ", ".join(f"{key} AS sort_key_{index}" for index, key in enumerate(keys))
+    cursor_.execute(f"""
+        SELECT {_QUEUE_COLUMNS}, {sort_columns}
+        FROM articles a
+        {_QUEUE_JOINS}
+        WHERE {" AND ".join(where)}
+        ORDER BY {order}
+        LIMIT ?
+    """, (*params, limit + 1))
+
+    rows = cursor_.fetchall()
+    conn.close()
+
+    articles = []
+    for row in rows[:limit]:
+        article = dict(row)
+        for index in range(len(keys)):
+            article.pop(f"sort_key_{index}")
+        articles.append(article)
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = _encode_cursor([last[f"sort_key_{index}"] for index in range(len(keys))])
+
+    return articles, next_cursor
+
+
 def get_subscription_article_count(domain: str, feed_url: str) -> int:
     """Count articles associated with a subscription."""
-    return len(_get_matching_article_ids_for_subscription(domain, feed_url))
+    return get_subscription_article_counts({domain: feed_url}).get(domain, 0)
+
+
+def get_subscription_article_counts(subscriptions: dict) -> dict:
+    """
+    Count articles for many subscriptions ({domain: feed_url}) at once.
+    Uses one GROUP BY over the indexed host columns; returns {domain: count}.
+    """
+    domains_by_host = {}
+    for domain, feed_url in subscriptions.items():
+        for host in _subscription_match_hosts(domain, feed_url):
+            domains_by_host.setdefault(host, set()).add(domain)
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT host, source_host, COUNT(*) as count
+        FROM articles
+        GROUP BY host, source_host
+    """)
+    rows = cursor.fetchall()
+    conn.close()
+
+    counts = {domain: 0 for domain in subscriptions}
+    for row in rows:
+        matched = domains_by_host.get(row["host"], set()) | domains_by_host.get(row["source_host"], set())
+        for domain in matched:
+            counts[domain] += row["count"]
+
+    return counts
 
 
 def delete_articles_for_subscription(domain: str, feed_url: str) -> int:
@@ -389,7 +1713,63 @@ def delete_articles_for_subscription(domain: str, feed_url: str) -> int:
     conn.commit()
     conn.close()
 
-    return deleted_count
+    return deleted_count
+
+
+def _fts_match_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression: every word must match
+    (quoted, so FTS syntax characters are inert) and the last word is a prefix.
+    """
+    terms = re.findall(r"\w+", query or "")
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_articles(query: str, status: Optional[str] = None, week: Optional[str] = None,
+                    limit: int = 20) -> list[dict]:
+    """
+    Full-text search over article titles, summaries and curator notes
+    (archived articles included). Results are BM25-ranked, with titles
+    weighted highest, and carry a `snippet` whose matches are wrapped in
+    SEARCH_MATCH_START/SEARCH_MATCH_END markers.
+    """
+    match = _fts_match_query(query)
+    if not match:
+        return []
+
+    where = ["articles_fts MATCH ?"]
+    params = [match]
+    if status:
+        where.append("c.status = ?")
+        params.append(status)
+    if week:
+        where.append("a.week = ?")
+        params.append(week)
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(f"""
+            SELECT a.*, c.status, c.user_notes, c.curated_at, c.archived, c.archived_at, c.top_pick,
+                   snippet(articles_fts, -1, ?, ?, '…', 16) AS snippet,
+                   bm25(articles_fts, 0.0, 10.0, 3.0, 5.0) AS rank
+            FROM articles_fts
+            JOIN articles a ON a.id = articles_fts.article_id
+            JOIN curation c ON a.id = c.article_id
+            WHERE {" AND ".join(where)}
+            ORDER BY rank
+            LIMIT ?
+        """, (SEARCH_MATCH_START, SEARCH_MATCH_END, *params, limit))
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+
+    return [dict(row) for row in rows]
 
 
 def get_archived_articles(week: Optional[str] = None) -> list[dict]:
@@ -429,7 +1809,7 @@ def archive_all_current() -> int:
     cursor.execute("""
         UPDATE curation
         SET archived = 1, archived_at = ?
-        WHERE archived = 0 OR archived IS NULL
+        WHERE archived = 0
     """, (archived_at,))
 
     count = cursor.rowcount
@@ -448,10 +1828,22 @@ def archive_current_by_status(status: str) -> int:
     cursor = conn.cursor()
     archived_at = datetime.now().isoformat()
 
+    # Hidden near-duplicates leave the queue with their representative
     cursor.execute("""
         UPDATE curation
         SET archived = 1, archived_at = ?
-        WHERE (archived = 0 OR archived IS NULL) AND status = ?
+        WHERE archived = 0 AND status = 'pending' AND article_id IN (
+            SELECT m.id
+            FROM articles m
+            JOIN curation rc ON rc.article_id = m.cluster_id
+            WHERE rc.archived = 0 AND rc.status = ?
+        )
+    """, (archived_at, status))
+
+    cursor.execute("""
+        UPDATE curation
+        SET archived = 1, archived_at = ?
+        WHERE archived = 0 AND status = ?
     """, (archived_at, status))
 
     count = cursor.rowcount
@@ -523,28 +1915,29 @@ def get_all_newsletters() -> list[dict]:
 
 
 def get_articles_by_status(week: Optional[str] = None, status: str = "pending",
-                           include_archived: bool = False) -> list[dict]:
-    """Get articles filtered by curation status."""
+                           include_archived: bool = False, sort: str = "date") -> list[dict]:
+    """Get articles filtered by curation status, ordered by `sort` (see QUEUE_SORTS)."""
+    order = _queue_order(sort)
     conn = get_connection()
     cursor = conn.cursor()
 
-    archive_filter = "" if include_archived else "AND (c.archived = 0 OR c.archived IS NULL)"
+    archive_filter = "" if include_archived else "AND c.archived = 0"
 
     if week:
         cursor.execute(f"""
-            SELECT a.*, c.status, c.user_notes, c.curated_at, c.archived, c.archived_at, c.top_pick
+            SELECT {_QUEUE_COLUMNS}
             FROM articles a
-            LEFT JOIN curation c ON a.id = c.article_id
-            WHERE a.week = ? AND c.status = ? {archive_filter}
-            ORDER BY c.top_pick DESC, COALESCE(a.published, a.fetched_at) DESC
+            {_QUEUE_JOINS}
+            WHERE a.week = ? AND c.status = ? AND {_QUEUE_VISIBLE} {archive_filter}
+            ORDER BY {order}
         """, (week, status))
     else:
         cursor.execute(f"""
-            SELECT a.*, c.status, c.user_notes, c.curated_at, c.archived, c.archived_at, c.top_pick
+            SELECT {_QUEUE_COLUMNS}
             FROM articles a
-            LEFT JOIN curation c ON a.id = c.article_id
-            WHERE c.status = ? {archive_filter}
-            ORDER BY c.top_pick DESC, COALESCE(a.published, a.fetched_at) DESC
+            {_QUEUE_JOINS}
+            WHERE c.status = ? AND {_QUEUE_VISIBLE} {archive_filter}
+            ORDER BY {order}
         """, (status,))
 
     rows = cursor.fetchall()
@@ -581,6 +1974,29 @@ def get_article_by_id(article_id: str) -> Optional[dict]:
     return dict(row) if row else None
 
 
+def get_cluster_articles(article_id: str) -> list[dict]:
+    """
+    All articles in the near-duplicate cluster containing article_id,
+    representative first, then members oldest first.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT a.*, c.status, c.user_notes, c.curated_at, c.archived, c.top_pick
+        FROM articles a
+        LEFT JOIN curation c ON a.id = c.article_id
+        WHERE a.id = (SELECT COALESCE(cluster_id, id) FROM articles WHERE id = ?)
+           OR a.cluster_id = (SELECT COALESCE(cluster_id, id) FROM articles WHERE id = ?)
+        ORDER BY a.cluster_id IS NOT NULL, a.rowid
+    """, (article_id, article_id))
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
 def set_article_status(article_id: str, status: str, notes: Optional[str] = None) -> bool:
     """Update curation state for an article."""
     if status not in ("pending", "shortlisted", "rejected"):
@@ -738,32 +2154,26 @@ def get_current_stats() -> dict:
     conn = get_connection()
     cursor = conn.cursor()
 
-    # Total current articles
-    cursor.execute("""
-        SELECT COUNT(*) as count FROM curation
-        WHERE archived = 0 OR archived IS NULL
-    """)
-    total = cursor.fetchone()["count"]
-
     # Status counts
-    cursor.execute("""
+    cursor.execute(f"""
         SELECT c.status, COUNT(*) as count
         FROM curation c
-        WHERE c.archived = 0 OR c.archived IS NULL
+        JOIN articles a ON a.id = c.article_id
+        WHERE c.archived = 0 AND {_QUEUE_VISIBLE}
         GROUP BY c.status
     """)
     status_counts = {row["status"]: row["count"] for row in cursor.fetchall()}
+    total = sum(status_counts.values())
 
-    # Topic distribution for current articles
-    cursor.execute("""
-        SELECT a.topic, COUNT(*) as count
-        FROM articles a
-        JOIN curation c ON a.id = c.article_id
-        WHERE c.archived = 0 OR c.archived IS NULL
-        GROUP BY a.topic
-        ORDER BY count DESC
+    # Topic distribution for current articles (counted here: grouping on a
+    # column of the joined table would need a temporary sort in SQLite)
+    cursor.execute(f"""
+        SELECT a.topic
+        FROM curation c
+        JOIN articles a ON a.id = c.article_id
+        WHERE c.archived = 0 AND {_QUEUE_VISIBLE}
     """)
-    topics = {row["topic"]: row["count"] for row in cursor.fetchall()}
+    topics = dict(Counter(row["topic"] for row in cursor.fetchall()).most_common())
 
     conn.close()
 
@@ -795,6 +2205,43 @@ def save_newsletter(week: str, article_ids: list[str], output_path: str) -> str:
     return newsletter_id
 
 
+def get_articles_without_topic(after_rowid: int = 0, limit: int = 1000) -> list[dict]:
+    """
+    Up to `limit` articles with no topic, in rowid order after `after_rowid`
+    (pass the last row's rowid to walk through all of them in chunks).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT rowid, id, title, summary, source
+        FROM articles
+        WHERE (topic IS NULL OR topic = '') AND rowid > ?
+        ORDER BY rowid
+        LIMIT ?
+    """, (after_rowid, limit))
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+def set_article_topics(topics: dict[str, str]) -> None:
+    """Set the topic of each article in {article_id: topic}."""
+    if not topics:
+        return
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.executemany(
+        "UPDATE articles SET topic = ? WHERE id = ?",
+        [(topic, article_id) for article_id, topic in topics.items()],
+    )
+    conn.commit()
+    conn.close()
+
+
 def get_curated_examples(limit_per_status: int = 10) -> dict:
     """
     Get examples of previously curated articles for use in scoring prompts.
@@ -822,6 +2269,355 @@ def get_curated_examples(limit_per_status: int = 10) -> dict:
     return result
 
 
+def get_articles_for_scoring() -> list[dict]:
+    """
+    Pending articles shown in the queue, oldest first, with the input hash of
+    their stored LLM score (score_input_hash, None if never scored).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
+        SELECT a.id, a.title, a.summary, a.source, s.input_hash AS score_input_hash
+        FROM articles a
+        JOIN curation c ON a.id = c.article_id
+        LEFT JOIN article_scores s ON s.article_id = a.id
+        WHERE c.archived = 0 AND c.status = 'pending' AND {_QUEUE_VISIBLE}
+        ORDER BY a.rowid
+    """)
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+def save_article_scores(scores: list[dict]) -> None:
+    """
+    Store LLM scores. Each dict has article_id, score, reason, provider,
+    model, input_hash and scored_at; an existing score is replaced.
+    """
+    if not scores:
+        return
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.executemany("""
+        INSERT INTO article_scores (article_id, score, reason, provider, model, input_hash, scored_at)
+        VALUES (:article_id, :score, :reason, :provider, :model, :input_hash, :scored_at)
+        ON CONFLICT(article_id) DO UPDATE SET
+            score = excluded.score,
+            reason = excluded.reason,
+            provider = excluded.provider,
+            model = excluded.model,
+            input_hash = excluded.input_hash,
+            scored_at = excluded.scored_at
+    """, scores)
+
+    conn.commit()
+    conn.close()
+
+
+def get_curation_fingerprint() -> str:
+    """
+    Summary of the shortlisted/rejected decisions that changes whenever one
+    is made or undone (the preference model retrains when it changes).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT COUNT(*) AS decisions,
+               SUM(status = 'shortlisted') AS shortlisted,
+               MAX(curated_at) AS last_curated
+        FROM curation
+        WHERE status IN ('shortlisted', 'rejected')
+    """)
+    row = cursor.fetchone()
+    conn.close()
+
+    return f"{row['decisions']}:{row['shortlisted'] or 0}:{row['last_curated'] or ''}"
+
+
+def get_preference_training_examples() -> list[dict]:
+    """
+    All shortlisted and rejected articles, archived or not, with label 1 for
+    shortlisted and 0 for rejected.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT a.id, a.title, a.summary, a.source, (c.status = 'shortlisted') AS label
+        FROM articles a
+        JOIN curation c ON a.id = c.article_id
+        WHERE c.status IN ('shortlisted', 'rejected')
+        ORDER BY a.rowid
+    """)
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+def get_preference_model() -> Optional[dict]:
+    """The stored preference model row, or None if none has been trained."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM preference_model WHERE id = 1")
+    row = cursor.fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def save_preference_model(weights: bytes, bias: float, idf: bytes, examples: int,
+                          fingerprint: str, trained_at: str) -> None:
+    """Store the preference model, replacing the previous one."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT OR REPLACE INTO preference_model (id, weights, bias, idf, examples, fingerprint, trained_at)
+        VALUES (1, ?, ?, ?, ?, ?, ?)
+    """, (weights, bias, idf, examples, fingerprint, trained_at))
+    conn.commit()
+    conn.close()
+
+
+def get_articles_for_preference(model_trained_at: str) -> list[dict]:
+    """Pending queue articles without a preference score from the given model."""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f"""
+        SELECT a.id, a.title, a.summary, a.source
+        FROM articles a
+        JOIN curation c ON a.id = c.article_id
+        LEFT JOIN article_preferences p ON p.article_id = a.id
+        WHERE c.archived = 0 AND c.status = 'pending' AND {_QUEUE_VISIBLE}
+          AND (p.model_trained_at IS NULL OR p.model_trained_at != ?)
+        ORDER BY a.rowid
+    """, (model_trained_at,))
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+def save_article_preferences(scores: list[dict]) -> None:
+    """Store preference scores (dicts with article_id, score, model_trained_at)."""
+    if not scores:
+        return
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.executemany("""
+        INSERT INTO article_preferences (article_id, score, model_trained_at)
+        VALUES (:article_id, :score, :model_trained_at)
+        ON CONFLICT(article_id) DO UPDATE SET
+            score = excluded.score,
+            model_trained_at = excluded.model_trained_at
+    """, scores)
+
+    conn.commit()
+    conn.close()
+
+
+def get_articles_without_embedding(backend: str, after_rowid: int = 0, limit: int = 1000) -> list[dict]:
+    """
+    Up to `limit` articles with no embedding from `backend`, in rowid order
+    after `after_rowid` (pass the last row's rowid to walk through in chunks).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT a.rowid, a.id, a.title, a.summary
+        FROM articles a
+        LEFT JOIN article_embeddings e ON e.article_id = a.id
+        WHERE (e.article_id IS NULL OR e.backend != ?) AND a.rowid > ?
+        ORDER BY a.rowid
+        LIMIT ?
+    """, (backend, after_rowid, limit))
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+def save_article_embeddings(embeddings: list[tuple[str, str, bytes]]) -> None:
+    """Store (article_id, backend, vector bytes) rows, replacing existing vectors."""
+    if not embeddings:
+        return
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.executemany("""
+        INSERT OR REPLACE INTO article_embeddings (article_id, backend, vector)
+        VALUES (?, ?, ?)
+    """, embeddings)
+    conn.commit()
+    conn.close()
+
+
+def get_embedding_state(backend: str) -> dict:
+    """Number of stored vectors from `backend` and the highest rowid among them."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT COUNT(*) AS count, COALESCE(MAX(rowid), 0) AS max_rowid
+        FROM article_embeddings
+        WHERE backend = ?
+    """, (backend,))
+    row = cursor.fetchone()
+    conn.close()
+    return dict(row)
+
+
+def get_article_embeddings(backend: str, after_rowid: int = 0) -> list[tuple[int, str, bytes]]:
+    """(rowid, article_id, vector bytes) of stored vectors from `backend`, in rowid order."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT rowid, article_id, vector
+        FROM article_embeddings
+        WHERE backend = ? AND rowid > ?
+        ORDER BY rowid
+    """, (backend, after_rowid))
+    rows = [tuple(row) for row in cursor.fetchall()]
+    conn.close()
+    return rows
+
+
+def get_articles_by_ids(article_ids: list[str]) -> list[dict]:
+    """Articles with curation state for the given IDs, in the given order (missing IDs skipped)."""
+    if not article_ids:
+        return []
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    placeholders = ",".join("?" for _ in article_ids)
+    cursor.execute(f"""
+        SELECT a.*, c.status, c.user_notes, c.curated_at, c.archived, c.archived_at, c.top_pick
+        FROM articles a
+        LEFT JOIN curation c ON a.id = c.article_id
+        WHERE a.id IN ({placeholders})
+    """, article_ids)
+    rows = {row["id"]: dict(row) for row in cursor.fetchall()}
+    conn.close()
+
+    return [rows[article_id] for article_id in article_ids if article_id in rows]
+
+
+def get_llm_cache(cache_key: str, template: str, ttl_days: float) -> Optional[str]:
+    """
+    Look up a cached LLM response and count the hit or miss for its template.
+    Entries older than ttl_days (0 = no expiry) are misses. A hit refreshes
+    the entry's last use, which LRU eviction in put_llm_cache goes by.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    now = datetime.now()
+
+    cursor.execute("SELECT response, created_at FROM llm_cache WHERE cache_key = ?", (cache_key,))
+    row = cursor.fetchone()
+    if row and ttl_days and row["created_at"] < (now - timedelta(days=ttl_days)).isoformat():
+        cursor.execute("DELETE FROM llm_cache WHERE cache_key = ?", (cache_key,))
+        row = None
+    if row:
+        cursor.execute("""
+            UPDATE llm_cache SET last_used_at = ?, hits = hits + 1 WHERE cache_key = ?
+        """, (now.isoformat(), cache_key))
+
+    counter = "hits" if row else "misses"
+    cursor.execute(f"""
+        INSERT INTO llm_cache_stats (template, {counter}) VALUES (?, 1)
+        ON CONFLICT(template) DO UPDATE SET {counter} = {counter} + 1
+    """, (template,))
+
+    conn.commit()
+    conn.close()
+    return row["response"] if row else None
+
+
+def put_llm_cache(cache_key: str, template: str, template_version: int, provider: str,
+                  model: str, response: str, ttl_days: float, max_entries: int) -> None:
+    """
+    Store an LLM response, then evict expired entries and, beyond max_entries
+    (0 = unbounded), the least recently used ones.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    now = datetime.now()
+
+    cursor.execute("""
+        INSERT INTO llm_cache (cache_key, template, template_version, provider, model,
+                               response, created_at, last_used_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(cache_key) DO UPDATE SET
+            response = excluded.response,
+            created_at = excluded.created_at,
+            last_used_at = excluded.last_used_at
+    """, (cache_key, template, template_version, provider, model, response,
+          now.isoformat(), now.isoformat()))
+
+    if ttl_days:
+        cutoff = (now - timedelta(days=ttl_days)).isoformat()
+        cursor.execute("DELETE FROM llm_cache WHERE created_at < ?", (cutoff,))
+    if max_entries:
+        cursor.execute("""
+            DELETE FROM llm_cache WHERE cache_key IN (
+                SELECT cache_key FROM llm_cache ORDER BY last_used_at
+                LIMIT max(0, (SELECT COUNT(*) FROM llm_cache) - ?)
+            )
+        """, (max_entries,))
+
+    conn.commit()
+    conn.close()
+
+
+def get_llm_cache_stats() -> dict:
+    """
+    LLM cache size and lookups: {"entries": n, "hits": n, "misses": n,
+    "templates": {template: {"entries", "hits", "misses"}}}.
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    templates = {}
+    cursor.execute("SELECT template, hits, misses FROM llm_cache_stats")
+    for row in cursor.fetchall():
+        templates[row["template"]] = {"entries": 0, "hits": row["hits"], "misses": row["misses"]}
+    cursor.execute("SELECT template, COUNT(*) AS entries FROM llm_cache GROUP BY template")
+    for row in cursor.fetchall():
+        templates.setdefault(row["template"], {"entries": 0, "hits": 0, "misses": 0})
+        templates[row["template"]]["entries"] = row["entries"]
+
+    conn.close()
+
+    return {
+        "entries": sum(t["entries"] for t in templates.values()),
+        "hits": sum(t["hits"] for t in templates.values()),
+        "misses": sum(t["misses"] for t in templates.values()),
+        "templates": templates,
+    }
+
+
+def clear_llm_cache() -> int:
+    """Delete all cached LLM responses (counters are kept). Returns count deleted."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM llm_cache")
+    deleted = cursor.rowcount
+    conn.commit()
+    conn.close()
+    return deleted
+
+
 def get_curation_stats() -> dict:
     """Get overall curation statistics for pattern analysis."""
     conn = get_connection()
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Article embeddings and nearest-neighbour search ("more like this" and
+semantic search), entirely local.
+
+A backend turns texts into unit-length float32 vectors. The default
+"hashed" backend needs no model files or network: words, adjacent word pairs
+and character trigrams are hashed into EMBEDDING_DIM signed buckets, so
+articles sharing vocabulary (including word stems) point the same way.
+Other backends (e.g. a local sentence-transformer) can be added to BACKENDS;
+each stores vectors under its own key, so switching re-embeds everything.
+
+Vectors are stored as float32 blobs in article_embeddings. Each process
+loads them once into a VectorIndex and then only picks up rows added since
+(checked at most every EMBEDDING_INDEX_REFRESH_SECONDS). Up to
+EMBEDDING_ANN_THRESHOLD vectors, a query is one exact matrix-vector product;
+above it the index switches to IVF: vectors are grouped around k-means
+centroids and a query only scans the EMBEDDING_IVF_PROBES nearest groups.
+
+Usage:
+    python embeddings.py             # Embed articles without an up-to-date vector
+    python embeddings.py --benchmark # Time similar-article queries on the current index
+"""
+import argparse
+import math
+import re
+import threading
+import time
+import zlib
+from typing import Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+import config
+import db
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_STOPWORDS = frozenset("""
+    a an and are as at be but by for from has have he her his i in is it its
+    of on or our she that the their they this to was we were will with you
+""".split())
+
+
+class HashedNgramBackend:
+    """
+    Signed feature hashing of words (weight 1), word pairs (1) and character
+    trigrams of words (0.5), L2-normalised. Deterministic across processes.
+    """
+
+    name = "hashed"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.key = f"hashed-ngram-v1:{dim}"
+
+    def _features(self, text: str) -> tuple[list[int], list[float]]:
+        words = [w for w in _TOKEN_RE.findall(text.lower()) if w not in _STOPWORDS]
+        terms = [(word, 1.0) for word in words]
+        terms += [(f"{a} {b}", 1.0) for a, b in zip(words, words[1:])]
+        for word in words:
+            if len(word) > 3:
+                padded = f"#{word}#"
+                terms += [(f"#3{padded[i:i + 3]}", 0.5) for i in range(len(padded) - 2)]
+
+        indices, weights = [], []
+        for term, weight in terms:
+            h = zlib.crc32(term.encode())
+            indices.append(h % self.dim)
+            weights.append(weight if h & 0x80000000 else -weight)
+        return indices, weights
+
+    def embed(self, texts: list[str]):
+        """(len(texts), dim) float32 array of unit vectors (zero for empty texts)."""
+        rows, cols, weights = [], [], []
+        for row, text in enumerate(texts):
+            indices, values = self._features(text)
+            rows.extend([row] * len(indices))
+            cols.extend(indices)
+            weights.extend(values)
+        flat = np.array(rows, dtype=np.int64) * self.dim + np.array(cols, dtype=np.int64)
+        vectors = np.bincount(flat, weights=weights, minlength=len(texts) * self.dim)
+        vectors = vectors.reshape(len(texts), self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms).astype(np.float32)
+
+
+# Embedding backends by EMBEDDING_BACKEND name
+BACKENDS = {
+    "hashed": lambda: HashedNgramBackend(config.EMBEDDING_DIM),
+}
+
+_backend = None
+
+
+def get_backend():
+    """The configured backend. Raises ValueError if EMBEDDING_BACKEND is unknown."""
+    global _backend
+    if _backend is None:
+        if config.EMBEDDING_BACKEND not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {config.EMBEDDING_BACKEND!r} "
+                             f"(expected one of {', '.join(BACKENDS)})")
+        _backend = BACKENDS[config.EMBEDDING_BACKEND]()
+    return _backend
+
+
+def article_text(article: dict) -> str:
+    """The text an article is embedded from."""
+    return f"{article.get('title') or ''}\n{article.get('summary') or ''}"
+
+
+class VectorIndex:
+    """
+    Nearest neighbours by cosine similarity over unit vectors: exact search up
+    to EMBEDDING_ANN_THRESHOLD vectors, an IVF index above it (rebuilt each
+    time the collection doubles; vectors added in between join their nearest
+    existing group).
+    """
+
+    def __init__(self, backend_key: str, dim: int):
+        self.backend_key = backend_key
+        self.ids: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.max_rowid = 0
+        self.centroids = None
+        self.lists: list = []
+        self.built_size = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def copy(self) -> "VectorIndex":
+        """
+        A copy that can be added to without changing this index (arrays are
+        shared: add() and _build_ivf() replace them rather than write into them).
+        """
+        index = VectorIndex.__new__(VectorIndex)
+        index.__dict__.update(self.__dict__)
+        index.ids = list(self.ids)
+        index.positions = dict(self.positions)
+        index.lists = list(self.lists)
+        return index
+
+    def add(self, rows: list[tuple[int, str, bytes]]) -> None:
+        """Append (rowid, article_id, vector bytes) rows, in rowid order."""
+        if not rows:
+            return
+        start = len(self.ids)
+        new_vectors = np.frombuffer(b"".join(row[2] for row in rows), dtype=np.float32)
+        self.vectors = np.vstack([self.vectors, new_vectors.reshape(len(rows), -1)])
+        for offset, (_, article_id, _) in enumerate(rows):
+            self.positions[article_id] = start + offset
+            self.ids.append(article_id)
+        self.max_rowid = rows[-1][0]
+
+        if len(self) > config.EMBEDDING_ANN_THRESHOLD and len(self) >= 2 * self.built_size:
+            self._build_ivf()
+        elif self.centroids is not None:
+            assignments = self._nearest_centroids(self.vectors[start:])
+            for group in np.unique(assignments):
+                members = start + np.flatnonzero(assignments == group)
+                self.lists[group] = np.concatenate([self.lists[group], members])
+
+    def _nearest_centroids(self, vectors):
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), 20000):
+            chunk = vectors[start:start + 20000]
+            assignments[start:start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return assignments
+
+    def _build_ivf(self) -> None:
+        """Fit ~sqrt(n) centroids with spherical k-means on a sample, then group all vectors."""
+        n = len(self)
+        rng = np.random.default_rng(0)
+        sample = self.vectors[rng.choice(n, min(n, config.EMBEDDING_IVF_TRAIN_SAMPLE), replace=False)]
+        n_lists = max(1, min(int(math.sqrt(n)), len(sample)))
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+
+        for _ in range(config.EMBEDDING_IVF_ITERATIONS):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assignments, kind="stable")
+            groups, starts = np.unique(assignments[order], return_index=True)
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids[groups] = sums / norms
+
+        self.centroids = centroids.astype(np.float32)
+        assignments = self._nearest_centroids(self.vectors)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(n_lists)]
+        self.built_size = n
+
+    def search(self, query, k: int, exclude: frozenset = frozenset()) -> list[tuple[str, float]]:
+        """Up to k (article_id, cosine similarity) pairs nearest the query, best first."""
+        if not len(self) or k <= 0:
+            return []
+        if self.centroids is None:
+            candidates = None
+            scores = self.vectors @ query
+        else:
+            probes = min(config.EMBEDDING_IVF_PROBES, len(self.centroids))
+            nearest = np.argpartition(-(self.centroids @ query), probes - 1)[:probes]
+            candidates = np.concatenate([self.lists[group] for group in nearest])
+            scores = self.vectors[candidates] @ query
+
+        wanted = min(k + len(exclude), len(scores))
+        if not wanted:
+            return []
+        top = np.argpartition(-scores, wanted - 1)[:wanted]
+        top = top[np.argsort(-scores[top])]
+        results = []
+        for index in top:
+            article_id = self.ids[index if candidates is None else candidates[index]]
+            if article_id not in exclude:
+                results.append((article_id, float(scores[index])))
+                if len(results) == k:
+                    break
+        return results
+
+
+_index: Optional[VectorIndex] = None
+_index_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_index() -> VectorIndex:
+    """
+    The process's index, loading vectors stored since the last check.
+    A returned index is never modified (new vectors go into a copy that
+    replaces it), so callers can search it without holding _index_lock.
+    """
+    global _index, _index_checked_at
+    backend = get_backend()
+    with _index_lock:
+        if _index is not None and _index.backend_key == backend.key \
+                and time.monotonic() - _index_checked_at < config.EMBEDDING_INDEX_REFRESH_SECONDS:
+            return _index
+        _index_checked_at = time.monotonic()
+
+        state = db.get_embedding_state(backend.key)
+        index = _index
+        if index is not None and index.backend_key == backend.key:
+            if state["count"] == len(index) and state["max_rowid"] == index.max_rowid:
+                return index
+            new_rows = db.get_article_embeddings(backend.key, after_rowid=index.max_rowid)
+            # Only appends can be applied in place; anything else (deleted or
+            # replaced vectors) reloads the whole index
+            if len(index) + len(new_rows) == state["count"] \
+                    and not any(row[1] in index.positions for row in new_rows):
+                index = index.copy()
+                index.add(new_rows)
+                _index = index
+                return index
+
+        index = VectorIndex(backend.key, backend.dim)
+        index.add(db.get_article_embeddings(backend.key))
+        _index = index
+        return index
+
+
+def embed_missing(limit: int = 0, verbose: bool = True) -> int:
+    """
+    Embed articles without a vector from the current backend (new articles,
+    articles whose text changed, or all of them after a backend change),
+    EMBEDDING_BATCH_SIZE at a time. Returns the number embedded.
+    """
+    global _index_checked_at
+    if not NUMPY_AVAILABLE:
+        if verbose:
+            print("  Skipping embeddings: numpy is not installed")
+        return 0
+
+    backend = get_backend()
+    embedded = 0
+    after_rowid = 0
+    chunk_size = max(1, config.EMBEDDING_BATCH_SIZE)
+    while not limit or embedded < limit:
+        size = min(chunk_size, limit - embedded) if limit else chunk_size
+        articles = db.get_articles_without_embedding(backend.key, after_rowid=after_rowid, limit=size)
+        if not articles:
+            break
+        vectors = backend.embed([article_text(article) for article in articles])
+        db.save_article_embeddings([
+            (article["id"], backend.key, vector.tobytes())
+            for article, vector in zip(articles, vectors)
+        ])
+        embedded += len(articles)
+        after_rowid = articles[-1]["rowid"]
+
+    if embedded:
+        # Let this process's index pick the new vectors up on its next query
+        _index_checked_at = 0.0
+        if verbose:
+            print(f"  Embedded {embedded} articles")
+    return embedded
+
+
+def _cluster_key(article: dict) -> str:
+    return article.get("cluster_id") or article["id"]
+
+
+def similar_articles(article: dict, limit: int = 10) -> list[dict]:
+    """
+    Articles most similar to `article` (any status, archived or not), best
+    first, each with a "similarity" (cosine, -1 to 1). Near-duplicates of
+    the article itself are left out (they are listed as its cluster).
+    """
+    index = get_index()
+    position = index.positions.get(article["id"])
+    if position is not None:
+        query = index.vectors[position]
+    else:
+        query = get_backend().embed([article_text(article)])[0]
+
+    # Fetch extra neighbours to make up for cluster members filtered below
+    neighbours = index.search(query, 2 * limit + 5, exclude=frozenset([article["id"]]))
+    similarity = dict(neighbours)
+    cluster = _cluster_key(article)
+    results = []
+    for candidate in db.get_articles_by_ids([article_id for article_id, _ in neighbours]):
+        if _cluster_key(candidate) != cluster:
+            candidate["similarity"] = round(similarity[candidate["id"]], 4)
+            results.append(candidate)
+            if len(results) == limit:
+                break
+    return results
+
+
+def search_text(query: str, limit: int = 20, status: Optional[str] = None,
+                week: Optional[str] = None) -> list[dict]:
+    """
+    Articles most similar in meaning to a free-text query, best first, each
+    with a "similarity". Status and week filters are applied to the nearest
+    5 * limit articles, so a narrow filter can return fewer than limit.
+    """
+    vector = get_backend().embed([query])[0]
+    if not vector.any():
+        return []
+    neighbours = get_index().search(vector, limit if not (status or week) else 5 * limit)
+    similarity = dict(neighbours)
+    results = []
+    for article in db.get_articles_by_ids([article_id for article_id, _ in neighbours]):
+        if (status and article["status"] != status) or (week and article["week"] != week):
+            continue
+        article["similarity"] = round(similarity[article["id"]], 4)
+        results.append(article)
+        if len(results) == limit:
+            break
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed articles for related-article and semantic search.")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=0,
+        help="Embed at most N articles (default: all without an up-to-date vector)",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="After embedding, time 100 similar-article queries",
+    )
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("numpy is not installed (pip install -r requirements.txt)")
+        return
+    embed_missing(limit=args.limit)
+
+    if args.benchmark:
+        started = time.perf_counter()
+        index = get_index()
+        print(f"Loaded {len(index)} vectors in {time.perf_counter() - started:.2f}s "
+              f"({'IVF' if index.centroids is not None else 'exact'} search)")
+        if len(index):
+            queries = [index.vectors[i] for i in range(0, len(index), max(1, len(index) // 100))][:100]
+            started = time.perf_counter()
+            for query in queries:
+                index.search(query, 10)
+            elapsed = (time.perf_counter() - started) / len(queries)
+            print(f"Average query: {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
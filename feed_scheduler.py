@@ -0,0 +1,97 @@
+"""
+Adaptive per-feed polling schedule.
+
+After each fetch, a feed's publication cadence (median gap between its newest
+items) and the time of its newest item are recorded on its feeds-cache entry,
+along with when it was fetched and when it is next due. A feed is due again
+after a fraction of its cadence, stretched for feeds that have gone quiet and
+clamped to [FEED_POLL_MIN_SECONDS, FEED_POLL_MAX_SECONDS]. A frequent cron
+tick (`rss_feed_scorer.py --cron --due-only`) then only fetches due feeds.
+"""
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Optional
+
+import config
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def observe_items(entry: dict, published: list[datetime], now: Optional[datetime] = None) -> None:
+    """
+    Update a feed's cadence and newest-item time from the publication dates
+    of the items currently in the feed.
+    """
+    now = now or datetime.now()
+    # Future-dated items (bad clocks/timezones) would make the feed look busier than it is
+    dates = sorted((d for d in published if d <= now), reverse=True)
+    if not dates:
+        return
+
+    newest = dates[0]
+    last_new = _parse_time(entry.get("last_new_item_at"))
+    if last_new is None or newest > last_new:
+        entry["last_new_item_at"] = newest.isoformat()
+
+    recent = dates[:config.FEED_CADENCE_SAMPLE_ITEMS]
+    gaps = [
+        (newer - older).total_seconds()
+        for newer, older in zip(recent, recent[1:])
+        if newer > older
+    ]
+    if gaps:
+        entry["cadence_seconds"] = int(median(gaps))
+
+
+def poll_interval(entry: dict, now: Optional[datetime] = None) -> float:
+    """Seconds to wait before fetching a feed again, based on its recorded cadence."""
+    now = now or datetime.now()
+    cadence = entry.get("cadence_seconds")
+    if not cadence:
+        interval = config.FEED_POLL_DEFAULT_SECONDS
+    else:
+        interval = cadence * config.FEED_POLL_CADENCE_FRACTION
+        last_new = _parse_time(entry.get("last_new_item_at"))
+        if last_new is not None:
+            # A feed that has been silent for longer than its usual gap is polled less often
+            quiet = (now - last_new).total_seconds()
+            if quiet > cadence:
+                interval = max(interval, quiet * config.FEED_POLL_CADENCE_FRACTION)
+    return min(max(interval, config.FEED_POLL_MIN_SECONDS), config.FEED_POLL_MAX_SECONDS)
+
+
+def record_fetch(entry: dict, ok: bool, now: Optional[datetime] = None) -> None:
+    """Record a fetch attempt and schedule the feed's next poll."""
+    now = now or datetime.now()
+    if ok:
+        entry["last_fetched_at"] = now.isoformat()
+        interval = poll_interval(entry, now)
+    else:
+        interval = config.FEED_POLL_FAILURE_SECONDS
+    entry["next_due_at"] = (now + timedelta(seconds=interval)).isoformat()
+
+
+def is_due(entry: dict, now: Optional[datetime] = None) -> bool:
+    """True if the feed has never been scheduled or its next poll time has passed."""
+    next_due = _parse_time(entry.get("next_due_at"))
+    return next_due is None or next_due <= (now or datetime.now())
+
+
+def feed_cutoff(entry: dict, default: datetime, now: Optional[datetime] = None) -> datetime:
+    """
+    Oldest publication date worth reading from a feed: shortly before its last
+    fetch (to catch late or backdated posts), or `default` if it was never fetched.
+    """
+    now = now or datetime.now()
+    last_fetched = _parse_time(entry.get("last_fetched_at"))
+    if last_fetched is None:
+        return default
+    cutoff = last_fetched - timedelta(hours=config.FEED_POLL_CUTOFF_OVERLAP_HOURS)
+    return max(cutoff, now - timedelta(days=config.DAYS_LOOKBACK))
@@ -0,0 +1,241 @@
+"""
+Streaming RSS/Atom entry parser with early cutoff.
+
+parse_entries() feeds the response body to an incremental XML parser chunk
+by chunk and builds one entry at a time, discarding each element once read.
+For reverse-chronological feeds it stops reading as soon as a few entries in
+a row fall before the cutoff, so a feed carrying full-text content for
+hundreds of posts is read only as far as the new items. Anything it can't
+handle (malformed XML, undefined HTML entities, unknown formats) is reported
+back so the caller can fall back to feedparser on the complete body.
+"""
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+# Root elements of RSS 0.9x/2.0, RSS 1.0 (RDF) and Atom documents
+_FEED_ROOTS = {"rss", "RDF", "feed"}
+_ENTRY_TAGS = {"item", "entry"}
+
+# Date elements in feedparser's published > updated > created preference order
+_DATE_TAGS = (
+    ("pubDate", "published", "issued"),
+    ("updated", "modified", "date"),
+    ("created",),
+)
+
+# Byte-level patterns for read_to_cutoff(); namespace prefixes are ignored
+_ENTRY_START_RE = re.compile(rb"<(?:[\w.-]+:)?(?:item|entry)[\s/>]")
+_ENTRY_END_RE = re.compile(rb"</(?:[\w.-]+:)?(?:item|entry)\s*>")
+_DATE_RES = tuple(
+    re.compile(rb"<(?:[\w.-]+:)?(?:%s)(?:\s[^>]*)?>\s*(?:<!\[CDATA\[)?([^<\]]*)"
+               % b"|".join(name.encode() for name in names))
+    for names in _DATE_TAGS
+)
+
+
+def _local(tag: str) -> str:
+    """Tag name without its {namespace} prefix."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    """Parse an RFC 822 or ISO 8601 date to naive UTC (as feedparser's *_parsed)."""
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    # feedparser's time tuples have whole-second precision
+    return parsed.replace(microsecond=0)
+
+
+def _text(elem: Element) -> str:
+    """Element content as text; XHTML content is flattened to its text."""
+    if elem.get("type") == "xhtml":
+        return "".join(elem.itertext()).strip()
+    return (elem.text or "").strip()
+
+
+def _entry_from_element(elem: Element) -> dict:
+    """Extract title, link, summary and publication date from an item/entry element."""
+    children: dict[str, list[Element]] = {}
+    for child in elem:
+        children.setdefault(_local(child.tag), []).append(child)
+
+    def first_text(*names: str) -> str:
+        for name in names:
+            for child in children.get(name, []):
+                text = _text(child)
+                if text:
+                    return text
+        return ""
+
+    # FeedBurner feeds link to a redirect; origLink is the real article
+    link = first_text("origLink")
+    if not link:
+        for child in children.get("link", []):
+            href = child.get("href")
+            if href is None:
+                link = (child.text or "").strip()
+            elif child.get("rel", "alternate") == "alternate":
+                link = href.strip()
+            if link:
+                break
+    if not link:
+        for guid in children.get("guid", []):
+            text = (guid.text or "").strip()
+            if guid.get("isPermaLink", "true") != "false" and text.startswith(("http://", "https://")):
+                link = text
+                break
+
+    published = None
+    for names in _DATE_TAGS:
+        published = _parse_date(first_text(*names))
+        if published is not None:
+            break
+
+    return {
+        "title": first_text("title"),
+        "link": link,
+        "summary": first_text("description", "summary") or first_text("encoded", "content"),
+        "published": published,
+    }
+
+
+def parse_entries(chunks: Iterable[bytes], cutoff_date: Optional[datetime], max_items: int,
+                  stop_after_old: int = 3) -> tuple[Optional[list[dict]], bytes]:
+    """
+    Incrementally parse feed entries from an iterable of body chunks.
+
+    Reading stops after max_items entries, or once stop_after_old consecutive
+    entries are older than cutoff_date while the feed has been in
+    reverse-chronological order so far (those old entries are still returned).
+
+    Returns (entries, consumed). entries is None if the body could not be
+    stream-parsed; consumed then holds every byte read so far, so the caller
+    can append the rest of the body and hand it to feedparser.
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    consumed = []
+    stack: list[Element] = []
+    entries = []
+    checked_root = False
+    old_streak = 0
+    descending = True
+    previous_date = None
+
+    for chunk in chunks:
+        consumed.append(chunk)
+        try:
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == "start":
+                    if not checked_root:
+                        if _local(elem.tag) not in _FEED_ROOTS:
+                            return None, b"".join(consumed)
+                        checked_root = True
+                    stack.append(elem)
+                    continue
+
+                stack.pop()
+                if _local(elem.tag) not in _ENTRY_TAGS:
+                    continue
+
+                entry = _entry_from_element(elem)
+                entries.append(entry)
+                # Drop the parsed entry so memory stays flat on huge feeds
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+
+                published = entry["published"]
+                if published is not None:
+                    if previous_date is not None and published > previous_date:
+                        descending = False
+                    previous_date = published
+                    if cutoff_date is not None and published < cutoff_date:
+                        old_streak += 1
+                    else:
+                        old_streak = 0
+
+                if len(entries) >= max_items or (descending and old_streak >= stop_after_old):
+                    return entries, b"".join(consumed)
+        except ParseError:
+            return None, b"".join(consumed)
+
+    try:
+        parser.close()
+    except ParseError:
+        return None, b"".join(consumed)
+    if not checked_root:
+        return None, b"".join(consumed)
+    return entries, b"".join(consumed)
+
+
+def _scan_date(entry: bytes) -> Optional[datetime]:
+    """Publication date of a raw item/entry element, by the _DATE_TAGS preference."""
+    for pattern in _DATE_RES:
+        match = pattern.search(entry)
+        if match:
+            published = _parse_date(match.group(1).decode("utf-8", "replace"))
+            if published is not None:
+                return published
+    return None
+
+
+def read_to_cutoff(chunks: Iterable[bytes], cutoff_date: Optional[datetime], max_items: int,
+                   stop_after_old: int = 3) -> bytes:
+    """
+    Read a feed body from an iterable of chunks, stopping where parse_entries()
+    would stop (max_items entries, or stop_after_old consecutive pre-cutoff
+    entries of a reverse-chronological feed), and return the bytes read up to
+    the end of that entry.
+
+    Only entry boundaries and date elements are located, with regular
+    expressions rather than an XML parser, so the fetch threads can cut a
+    download short without doing the parse stage's work. Bodies it can't read
+    entries from are returned whole.
+    """
+    body = bytearray()
+    position = 0
+    count = 0
+    old_streak = 0
+    descending = True
+    previous_date = None
+
+    for chunk in chunks:
+        body += chunk
+        while True:
+            start = _ENTRY_START_RE.search(body, position)
+            if start is None:
+                break
+            end = _ENTRY_END_RE.search(body, start.end())
+            if end is None:
+                break
+            position = end.end()
+            count += 1
+
+            published = _scan_date(bytes(body[start.start():end.start()]))
+            if published is not None:
+                if previous_date is not None and published > previous_date:
+                    descending = False
+                previous_date = published
+                if cutoff_date is not None and published < cutoff_date:
+                    old_streak += 1
+                else:
+                    old_streak = 0
+
+            if count >= max_items or (descending and old_streak >= stop_after_old):
+                return bytes(body[:position])
+
+    return bytes(body)
@@ -24,6 +24,7 @@ declare global {
     removeSubscriptionByEncoded: (encodedDomain: string, deleteArticles: boolean) => void;
     setQueueStatus: (status: string) => void;
     onSubscriptionsSortChange: () => void;
+    onQueueSortChange: () => void;
     curate: (articleId: string, status: string) => Promise<void>;
     openReader: (articleId: string) => void;
     removeFeedForArticle: (articleId: string, deleteArticles?: boolean) => Promise<void>;
@@ -40,7 +41,12 @@ declare global {
         const queueStatuses = ['pending', 'shortlisted', 'rejected'];
         let nextQueueIndexAfterMutation = null;
         const queueScrollTopByStatus = { pending: 0, shortlisted: 0, rejected: 0 };
+        const QUEUE_PAGE_SIZE = 50;
+        const queueCursors = { pending: null, shortlisted: null, rejected: null };
+        const queueLoadingMore = { pending: false, shortlisted: false, rejected: false };
+        const queueTotals = { pending: null, shortlisted: null, rejected: null };
         let subscriptionsSort = 'domain_asc';
+        let queueSort = 'date';
         const READING_METRICS_KEY = 'curator_reading_metrics_v1';
         const READING_STREAK_THRESHOLD_SECONDS = 60;
         const READING_TICK_MS = 5000;
@@ -56,18 +62,28 @@ declare global {
             updateReadingTrackerState();
         }
 
+        async function fetchArticlesPage(status, limit, cursor = null) {
+            const params = new URLSearchParams({ status, limit: String(limit), sort: queueSort });
+            if (cursor) params.set('cursor', cursor);
+            const response = await fetch(`/api/articles?${params.toString()}`);
+            if (!response.ok) {
+                throw new Error('Failed to load articles');
+            }
+            return response.json();
+        }
+
         async function loadArticles() {
             try {
-                const response = await fetch('/api/articles');
-                const data = await response.json();
+                // Reload at least as many rows as are already shown so scroll depth survives mutations
+                const pages = await Promise.all(queueStatuses.map(status => {
+                    const limit = Math.max(QUEUE_PAGE_SIZE, (articles[status] || []).length);
+                    return fetchArticlesPage(status, limit);
+                }));
 
-                // Group by status
                 articles = { pending: [], shortlisted: [], rejected: [] };
-                data.articles.forEach(article => {
-                    const status = article.status || 'pending';
-                    if (articles[status]) {
-                        articles[status].push(article);
-                    }
+                queueStatuses.forEach((status, idx) => {
+                    articles[status] = pages[idx].articles || [];
+                    queueCursors[status] = pages[idx].next_cursor || null;
                 });
 
                 renderQueue();
@@ -78,6 +94,26 @@ declare global {
             }
         }
 
+        async function loadMoreArticles(status = activeQueueStatus) {
+            const cursor = queueCursors[status];
+            if (!cursor || queueLoadingMore[status]) return;
+            queueLoadingMore[status] = true;
+            try {
+                const data = await fetchArticlesPage(status, QUEUE_PAGE_SIZE, cursor);
+                const seen = new Set(articles[status].map(article => article.id));
+                const fresh = (data.articles || []).filter(article => !seen.has(article.id));
+                articles[status] = articles[status].concat(fresh);
+                queueCursors[status] = data.next_cursor || null;
+                if (status === activeQueueStatus) {
+                    renderQueue({ preserveScroll: true, animate: false });
+                }
+            } catch (error) {
+                showToast('Failed to load more articles', 'error');
+            } finally {
+                queueLoadingMore[status] = false;
+            }
+        }
+
         async function loadStats() {
             try {
                 const response = await fetch('/api/stats');
@@ -87,6 +123,13 @@ declare global {
                 document.getElementById('stat-pending').textContent = stats.pending;
                 document.getElementById('stat-shortlisted').textContent = stats.shortlisted;
                 document.getElementById('stat-rejected').textContent = stats.rejected;
+
+                // Queue tabs show full totals, not just the pages loaded so far
+                queueStatuses.forEach(status => {
+                    queueTotals[status] = stats[status] ?? null;
+                    const countEl = document.getElementById(`count-${status}`);
+                    if (countEl && queueTotals[status] !== null) countEl.textContent = queueTotals[status];
+                });
             } catch (error) {
                 console.error('Failed to load stats:', error);
             }
@@ -116,6 +159,18 @@ declare global {
             }
         }
 
+        async function onQueueSortChange() {
+            const sortEl = document.getElementById('queue-sort');
+            queueSort = sortEl ? sortEl.value : 'date';
+            // Cursors belong to the previous ordering, so start every queue over
+            articles = { pending: [], shortlisted: [], rejected: [] };
+            queueStatuses.forEach(status => {
+                queueCursors[status] = null;
+                queueScrollTopByStatus[status] = 0;
+            });
+            await loadArticles();
+        }
+
         function onSubscriptionsSortChange() {
             const sortEl = document.getElementById('subscriptions-sort');
             subscriptionsSort = sortEl ? sortEl.value : 'domain_asc';
@@ -305,7 +360,10 @@ declare global {
                     showToast(result.error || 'Failed to pull feeds', 'error');
                     return;
                 }
-                await waitForFeedSyncCompletion(90);
+                const streamed = await streamFeedSyncProgress(button, result.job_id);
+                if (!streamed) {
+                    await waitForFeedSyncCompletion(90);
+                }
             } catch (_error) {
                 showToast('Failed to pull feeds', 'error');
             } finally {
@@ -316,6 +374,59 @@ declare global {
             }
         }
 
+        function describeSyncProgress(progress) {
+            if (!progress) {
+                return 'Pulling...';
+            }
+            const prefix = `${progress.stage}/${progress.stages}`;
+            if (progress.feeds_fetched !== undefined) {
+                return `${prefix} Feeds ${progress.feeds_fetched}/${progress.feeds}`;
+            }
+            return `${prefix} ${progress.label}...`;
+        }
+
+        async function finishFeedSync(status) {
+            if (status.error) {
+                showToast(`Feed pull failed: ${status.error}`, 'error');
+                return;
+            }
+            showToast(`Pulled feeds: ${status.stored_count || 0} article(s) stored`, 'success');
+            await loadArticles();
+            await loadSubscriptions();
+        }
+
+        // Follow sync progress over Server-Sent Events. Resolves false if the
+        // stream could not be used, so the caller can fall back to polling.
+        function streamFeedSyncProgress(button, jobId) {
+            if (typeof EventSource === 'undefined') {
+                return Promise.resolve(false);
+            }
+            return new Promise(resolve => {
+                const query = jobId ? `?job_id=${encodeURIComponent(jobId)}` : '';
+                const source = new EventSource(`/api/sync-feeds/events${query}`);
+                let finished = false;
+                source.addEventListener('progress', event => {
+                    const status = JSON.parse(event.data);
+                    if (button) {
+                        button.textContent = describeSyncProgress(status.progress);
+                    }
+                });
+                source.addEventListener('done', async event => {
+                    finished = true;
+                    source.close();
+                    await finishFeedSync(JSON.parse(event.data));
+                    resolve(true);
+                });
+                source.onerror = () => {
+                    if (finished) {
+                        return;
+                    }
+                    source.close();
+                    resolve(false);
+                };
+            });
+        }
+
         async function waitForFeedSyncCompletion(timeoutSeconds = 90) {
             const startedAt = Date.now();
             while ((Date.now() - startedAt) / 1000 < timeoutSeconds) {
@@ -330,13 +441,7 @@ declare global {
                     if (status.running) {
                         continue;
                     }
-                    if (status.error) {
-                        showToast(`Feed pull failed: ${status.error}`, 'error');
-                        return;
-                    }
-                    showToast(`Pulled feeds: ${status.stored_count || 0} article(s) stored`, 'success');
-                    await loadArticles();
-                    await loadSubscriptions();
+                    await finishFeedSync(status);
                     return;
                 } catch (_error) {
                     showToast('Could not read feed sync status', 'error');
@@ -448,7 +553,7 @@ declare global {
             queueStatuses.forEach(status => {
                 const countEl = document.getElementById(`count-${status}`);
                 const filterEl = document.getElementById(`queue-filter-${status}`);
-                const count = (articles[status] || []).length;
+                const count = queueTotals[status] ?? (articles[status] || []).length;
                 if (countEl) countEl.textContent = count;
                 if (filterEl) filterEl.classList.toggle('active', activeQueueStatus === status);
             });
@@ -479,6 +584,9 @@ declare global {
                         <div class="queue-item-meta">
                             <span class="queue-pill source">${escapeHtml(article.source)}</span>
                             ${article.topic ? `<span class="queue-pill topic">${escapeHtml(article.topic)}</span>` : ''}
+                            ${article.cluster_size ? `<span class="queue-pill cluster" title="Near-duplicate stories from other sources">+${article.cluster_size} similar</span>` : ''}
+                            ${article.relevance_score != null ? `<span class="queue-pill relevance" title="${escapeHtml(article.relevance_reason || 'LLM relevance score').replace(/"/g, '&quot;')}">${Number(article.relevance_score).toFixed(1)}/10</span>` : ''}
+                            ${article.preference_score != null ? `<span class="queue-pill preference" title="Chance you shortlist it, learned from your past curation">${Math.round(Number(article.preference_score) * 100)}% match</span>` : ''}
                         </div>
                         ${summary ? `<p class="queue-item-summary">${escapeHtml(summary)}</p>` : ''}
                         <div class="queue-item-actions">
@@ -715,7 +823,9 @@ declare global {
 
                 const result = await response.json();
 
-                if (result.success) {
+                if (result.running) {
+                    showToast('Newsletter is still generating in the background', 'success');
+                } else if (result.success) {
                     showToast(`Newsletter generated with ${result.article_count} articles`, 'success');
                     viewNewsletter(result.newsletter_id);
                 } else {
@@ -799,6 +909,57 @@ declare global {
             return all.find(article => article.id === articleId);
         }
 
+        async function loadClusterSources(articleId, metaEl) {
+            try {
+                const response = await fetch(`/api/articles/${articleId}/cluster`);
+                if (!response.ok) return;
+                const data = await response.json();
+                if (activeReaderArticleId !== articleId) return;
+
+                const span = document.createElement('span');
+                span.append('Also from: ');
+                data.articles.filter(item => item.id !== articleId).forEach((item, idx) => {
+                    if (idx) span.append(', ');
+                    const link = document.createElement('a');
+                    link.href = item.url;
+                    link.target = '_blank';
+                    link.rel = 'noopener';
+                    link.title = item.title || '';
+                    link.textContent = item.source || item.url;
+                    span.append(link);
+                });
+                metaEl.append(span);
+            } catch (error) {
+                console.error('Failed to load similar articles:', error);
+            }
+        }
+
+        async function loadRelatedArticles(articleId, metaEl) {
+            try {
+                const response = await fetch(`/api/articles/${articleId}/similar?limit=5`);
+                if (!response.ok) return;
+                const data = await response.json();
+                if (activeReaderArticleId !== articleId || !data.articles.length) return;
+
+                const span = document.createElement('span');
+                span.append('Related: ');
+                data.articles.forEach((item, idx) => {
+                    if (idx) span.append(' · ');
+                    const link = document.createElement('a');
+                    link.href = item.url;
+                    link.target = '_blank';
+                    link.rel = 'noopener';
+                    link.title = `${item.source || ''} (${item.archived ? 'archived' : item.status || 'pending'})`;
+                    const title = item.title || item.url;
+                    link.textContent = title.length > 60 ? `${title.slice(0, 57)}...` : title;
+                    span.append(link);
+                });
+                metaEl.append(span);
+            } catch (error) {
+                console.error('Failed to load related articles:', error);
+            }
+        }
+
         function openReader(articleId, options = {}) {
             const article = findArticleById(articleId);
             if (!article) {
@@ -838,6 +999,10 @@ declare global {
                 ${article.topic ? `<span>Topic: ${escapeHtml(article.topic)}</span>` : ''}
                 <span>Status: ${escapeHtml(currentStatus)}</span>
             `;
+            if (article.cluster_size) {
+                loadClusterSources(articleId, metaEl);
+            }
+            loadRelatedArticles(articleId, metaEl);
 
             openLink.href = article.url;
             iframe.src = article.url;
@@ -1213,6 +1378,10 @@ declare global {
         if (queueList) {
             queueList.addEventListener('scroll', () => {
                 queueScrollTopByStatus[activeQueueStatus] = queueList.scrollTop;
+                // Fetch the next page before the user reaches the end of the list
+                if (queueList.scrollTop + queueList.clientHeight >= queueList.scrollHeight - 200) {
+                    loadMoreArticles(activeQueueStatus);
+                }
             });
         }
 
@@ -1229,6 +1398,7 @@ declare global {
         window.openAddArticle = openAddArticle;
         window.openArchives = openArchives;
         window.onSubscriptionsSortChange = onSubscriptionsSortChange;
+        window.onQueueSortChange = onQueueSortChange;
         window.openReader = openReader;
         window.pullFromFeeds = pullFromFeeds;
         window.removeFeedForArticle = removeFeedForArticle;
@@ -0,0 +1,157 @@
+"""
+Lightweight HTML-to-text conversion for feed summaries.
+
+html_to_text() produces the same text as
+BeautifulSoup(markup, "html.parser").get_text(separator=" ", strip=True)[:limit]
+for well-formed markup, without building a tree. It streams through the markup
+with the standard library's HTMLParser, skips script/style/template contents
+and stops as soon as `limit` characters of visible text have been collected.
+
+Usage:
+    python html_text.py --benchmark              # Time against BeautifulSoup on tests/fixtures/summaries
+    python html_text.py --benchmark a.html b.html  # ... on other summaries
+"""
+import argparse
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+
+# Summary corpus used by the equivalence tests and --benchmark
+FIXTURE_DIR = Path(__file__).parent / "tests" / "fixtures" / "summaries"
+
+# Elements whose contents are not visible text (as in BeautifulSoup.get_text)
+_SKIP_TAGS = {"script", "style", "template"}
+
+
+class _LimitReached(Exception):
+    pass
+
+
+class _TextExtractor(HTMLParser):
+    """Collect stripped text nodes until `limit` characters of output are reached."""
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.parts: list[str] = []
+        self.length = 0
+        self.pending: list[str] = []
+        self.skip_depth = 0
+
+    def flush(self) -> None:
+        """End the current text node (adjacent data chunks form one node, as in bs4)."""
+        if not self.pending:
+            return
+        text = "".join(self.pending).strip()
+        self.pending = []
+        if not text:
+            return
+        self.length += len(text) + (1 if self.parts else 0)
+        self.parts.append(text)
+        if self.length >= self.limit:
+            raise _LimitReached
+
+    def handle_starttag(self, tag, attrs):
+        self.flush()
+        if tag in _SKIP_TAGS:
+            self.skip_depth += 1
+
+    def handle_endtag(self, tag):
+        self.flush()
+        if tag in _SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.pending.append(data)
+
+    def handle_comment(self, data):
+        self.flush()
+
+    def handle_decl(self, decl):
+        self.flush()
+
+    def handle_pi(self, data):
+        self.flush()
+
+    def unknown_decl(self, data):
+        self.flush()
+        # <![CDATA[...]]> sections count as text
+        if data.startswith("CDATA[") and not self.skip_depth:
+            self.pending.append(data[len("CDATA["):])
+            self.flush()
+
+
+def html_to_text(markup: str, limit: int = 500) -> str:
+    """Visible text of an HTML fragment, space-joined and cut to `limit` characters."""
+    if "<" not in markup and "&" not in markup:
+        return markup.strip()[:limit]
+
+    parser = _TextExtractor(limit)
+    try:
+        parser.feed(markup)
+        parser.close()
+        parser.flush()
+    except _LimitReached:
+        pass
+    return " ".join(parser.parts)[:limit]
+
+
+def benchmark(paths: list, rounds: int = 200, limit: int = 500) -> None:
+    """Time html_to_text against the BeautifulSoup path over the given files."""
+    from bs4 import BeautifulSoup
+
+    corpus = [Path(path).read_text(encoding="utf-8") for path in paths]
+    mismatches = sum(
+        html_to_text(markup, limit)
+        != BeautifulSoup(markup, "html.parser").get_text(separator=" ", strip=True)[:limit]
+        for markup in corpus
+    )
+
+    timings = {}
+    for name, convert in (
+        ("html_to_text", lambda markup: html_to_text(markup, limit)),
+        ("BeautifulSoup", lambda markup: BeautifulSoup(markup, "html.parser").get_text(
+            separator=" ", strip=True)[:limit]),
+    ):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for markup in corpus:
+                convert(markup)
+        timings[name] = time.perf_counter() - started
+
+    conversions = rounds * len(corpus)
+    print(f"{len(corpus)} summaries x {rounds} rounds, {mismatches} with different output")
+    for name, elapsed in timings.items():
+        print(f"  {name:<14} {elapsed:.2f}s ({elapsed / conversions * 1e6:.1f} us per summary)")
+    print(f"  Speedup: {timings['BeautifulSoup'] / timings['html_to_text']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert feed summary HTML to text.")
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="Time html_to_text against BeautifulSoup and compare their output",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=200,
+        help="Passes over the corpus for --benchmark (default: 200)",
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help=f"Summary files (default: {FIXTURE_DIR.relative_to(Path(__file__).parent)})",
+    )
+    args = parser.parse_args()
+
+    if not args.benchmark:
+        parser.print_help()
+        return
+    benchmark(args.files or sorted(FIXTURE_DIR.iterdir()), rounds=args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Shared HTTP client for feed discovery, feed polling and URL metadata fetches.
+
+All outbound requests go through one pooled requests.Session, so connections
+to the same host are kept alive and reused instead of paying a fresh TCP/TLS
+handshake per request. Pool sizes, retries, timeout and User-Agent are tuned
+in config.py.
+
+Feed discovery goes through probe() instead, on a second pooled session
+without retries: most candidate URLs are expected to fail (missing feed paths,
+dead domains), and retrying each with backoff would only slow discovery
+down. A domain whose discovery fails is retried later by the negative cache.
+"""
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+
+_session: Optional[requests.Session] = None
+_probe_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _build_session(retries: int) -> requests.Session:
+    """Create a session with per-host connection pools and a retry adapter."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=config.HTTP_RETRY_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=config.HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.headers["User-Agent"] = config.USER_AGENT
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(config.HTTP_RETRIES)
+    return _session
+
+
+def get_probe_session() -> requests.Session:
+    """Get the process-wide session for discovery probes (no retries)."""
+    global _probe_session
+    if _probe_session is None:
+        with _session_lock:
+            if _probe_session is None:
+                _probe_session = _build_session(0)
+    return _probe_session
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """GET a URL through the shared session with the default timeout."""
+    kwargs.setdefault("timeout", config.REQUEST_TIMEOUT)
+    return get_session().get(url, **kwargs)
+
+
+def probe(url: str, **kwargs) -> requests.Response:
+    """GET a URL once, without retries, through the probe session with the default timeout."""
+    kwargs.setdefault("timeout", config.REQUEST_TIMEOUT)
+    return get_probe_session().get(url, **kwargs)
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Background jobs: feed sync, feed discovery, LLM scoring, newsletter generation
+and preference-model refreshes.
+
+Jobs live in the SQLite jobs table, so their state and history survive
+restarts and are shared by every curator API process and standalone worker.
+A worker claims a job under a time-limited lease and renews it while the job
+runs; if the worker dies, another one reclaims the job once the lease expires.
+Failed jobs are retried with exponential backoff up to JOB_MAX_ATTEMPTS.
+Sync, discovery and scoring jobs are deduplicated, so only one of each runs at a time.
+Sync and discovery both write the feeds table, so they are also exclusive of
+each other: a queued one is not claimed while the other is running.
+Newsletter and preference jobs, whose results the dashboard is waiting for,
+also have a worker lane of their own (INTERACTIVE_KINDS), so they never wait
+behind a sync or scoring run.
+A run whose lease is lost (its renewals kept failing, or another worker took
+the job over) is stopped at its next progress report, so a reclaimed job is
+never run twice at once.
+
+Usage:
+    python jobs.py worker                  # Run jobs until interrupted
+    python jobs.py worker --once           # Run all due jobs, then exit
+    python jobs.py enqueue sync            # Queue an incremental sync
+    python jobs.py enqueue sync --full --discover
+    python jobs.py enqueue sync --due-only  # Only feeds due under their polling schedule
+    python jobs.py enqueue discovery --rediscover-stale
+    python jobs.py enqueue score            # LLM-score pending articles (see scoring.py)
+    python jobs.py enqueue newsletter --week 2026-W05
+    python jobs.py enqueue preference       # Retrain/rescore the local preference model
+"""
+import argparse
+import os
+import socket
+import threading
+import time
+from typing import Callable, Optional
+
+import config
+import db
+import preference
+import scoring
+from newsletter_generator import generate_newsletter
+from rss_feed_scorer import run_discovery, run_sync
+
+FINISHED_STATUSES = ("succeeded", "failed")
+
+# Job kinds that write the feeds table; at most one of them runs at a time
+EXCLUSIVE_KINDS = ("sync", "discovery")
+
+# Job kinds the dashboard waits on; a worker lane of their own runs them, so
+# they never queue behind a long sync or scoring run
+INTERACTIVE_KINDS = ("newsletter", "preference")
+
+_worker_threads: dict[str, threading.Thread] = {}
+_worker_lock = threading.Lock()
+
+
+class LeaseLost(Exception):
+    """The running job's lease expired or was taken over; the run must stop."""
+
+
+def _sync_job(params: dict, progress: Callable[[dict], None]) -> dict:
+    full_sync = bool(params.get("full_sync"))
+    stored_count = run_sync(
+        cron_mode=not full_sync,
+        skip_discovery=not params.get("discover"),
+        due_only=bool(params.get("due_only")),
+        verbose=False,
+        progress=progress,
+        score=params.get("score"),
+    )
+    return {"stored_count": stored_count}
+
+
+def _discovery_job(params: dict, progress: Callable[[dict], None]) -> dict:
+    feed_count = run_discovery(
+        verbose=False,
+        rediscover_stale=bool(params.get("rediscover_stale")),
+        progress=progress,
+    )
+    return {"feed_count": feed_count}
+
+
+def _score_job(params: dict, progress: Callable[[dict], None]) -> dict:
+    return scoring.score_articles(
+        limit=int(params.get("limit") or 0),
+        provider=params.get("provider"),
+        verbose=False,
+        progress=progress,
+    )
+
+
+def _newsletter_job(params: dict, progress: Callable[[dict], None]) -> dict:
+    return generate_newsletter(params.get("week"))
+
+
+def _preference_job(params: dict, progress: Callable[[dict], None]) -> dict:
+    # Curation changes made during a run are deduplicated onto it, so go again
+    # until the stored model has seen the latest decisions
+    for _ in range(3):
+        result = preference.refresh(verbose=False)
+        model = db.get_preference_model()
+        if model is None or model["fingerprint"] == db.get_curation_fingerprint():
+            break
+    return result
+
+
+JOB_HANDLERS = {
+    "sync": _sync_job,
+    "discovery": _discovery_job,
+    "score": _score_job,
+    "newsletter": _newsletter_job,
+    "preference": _preference_job,
+}
+
+
+def _dedupe_key(kind: str, params: dict) -> str:
+    """One active job per kind; newsletters are per week."""
+    if kind == "newsletter":
+        return f"newsletter:{params.get('week') or ''}"
+    return kind
+
+
+def enqueue(kind: str, params: Optional[dict] = None) -> tuple[dict, bool]:
+    """
+    Queue a job of the given kind. If an equivalent job is already queued or
+    running, that job is returned instead. Returns (job, created).
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    params = params or {}
+    return db.enqueue_job(
+        kind,
+        params,
+        dedupe_key=_dedupe_key(kind, params),
+        max_attempts=config.JOB_MAX_ATTEMPTS,
+    )
+
+
+def wait_for_job(job_id: int, timeout: float) -> Optional[dict]:
+    """Poll a job until it finishes or timeout seconds pass. Returns its latest state."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = db.get_job(job_id)
+        if job is None or job["status"] in FINISHED_STATUSES or time.monotonic() >= deadline:
+            return job
+        time.sleep(0.25)
+
+
+def run_job(job: dict, owner: str) -> None:
+    """
+    Run a claimed job, renewing its lease until the handler returns. If the
+    lease is lost, the handler's next progress report raises LeaseLost and
+    the run is abandoned without recording a result.
+    """
+    handler = JOB_HANDLERS.get(job["kind"])
+    lease = config.JOB_LEASE_SECONDS
+    state = {"progress": job.get("progress"), "written_at": 0.0, "renewed_at": time.monotonic()}
+    done = threading.Event()
+    lost = threading.Event()
+
+    def _renew(progress: Optional[dict]) -> None:
+        # A failed write (e.g. "database is locked" behind a long sync
+        # transaction) is retried on the next tick; the lease only counts as
+        # lost once it has gone a full lease period without renewal.
+        try:
+            held = db.heartbeat_job(job["id"], owner, lease, progress=progress)
+        except Exception as e:
+            print(f"  Job {job['id']} ({job['kind']}): could not renew lease: {e}")
+            if time.monotonic() - state["renewed_at"] >= lease:
+                lost.set()
+            return
+        if held:
+            state["renewed_at"] = time.monotonic()
+        else:
+            lost.set()
+
+    def _progress(event: dict) -> None:
+        if lost.is_set():
+            raise LeaseLost(f"Job {job['id']} lost its lease")
+        state["progress"] = event
+        now = time.monotonic()
+        if now - state["written_at"] >= config.JOB_PROGRESS_INTERVAL_SECONDS:
+            state["written_at"] = now
+            _renew(event)
+
+    def _heartbeat() -> None:
+        try:
+            while not done.wait(lease / 3):
+                _renew(state["progress"])
+                if lost.is_set():
+                    print(f"  Job {job['id']} ({job['kind']}): lease lost, stopping at the next progress report")
+                    return
+        finally:
+            db.release_connection()
+
+    heartbeat = threading.Thread(target=_heartbeat, daemon=True)
+    heartbeat.start()
+    try:
+        if handler is None:
+            raise ValueError(f"Unknown job kind: {job['kind']}")
+        result = handler(job.get("params") or {}, _progress)
+    except Exception as e:
+        done.set()
+        # Roll back whatever the handler left uncommitted before recording the failure
+        db.release_connection()
+        if lost.is_set():
+            print(f"  Job {job['id']} ({job['kind']}) abandoned after losing its lease: {e}")
+        else:
+            delay = config.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job["attempts"] - 1)
+            print(f"  Job {job['id']} ({job['kind']}) failed on attempt {job['attempts']}: {e}")
+            db.fail_job(job["id"], owner, str(e), retry_delay_seconds=delay, progress=state["progress"])
+    else:
+        done.set()
+        if not db.complete_job(job["id"], owner, result, progress=state["progress"]):
+            print(f"  Job {job['id']} ({job['kind']}) finished after losing its lease; result discarded")
+    heartbeat.join()
+
+
+def _worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def run_worker(once: bool = False, kinds: Optional[list[str]] = None,
+               stop_event: Optional[threading.Event] = None) -> None:
+    """
+    Claim and run jobs until stopped. With once, return as soon as no job is due.
+    """
+    owner = _worker_id()
+    stop_event = stop_event or threading.Event()
+    db.prune_jobs(config.JOB_HISTORY_DAYS)
+
+    while not stop_event.is_set():
+        try:
+            job = db.claim_job(owner, config.JOB_LEASE_SECONDS, kinds=kinds,
+                               exclusive_kinds=EXCLUSIVE_KINDS)
+        except Exception as e:
+            print(f"  Job worker could not claim a job: {e}")
+            job = None
+        if job is None:
+            if once:
+                return
+            stop_event.wait(config.JOB_POLL_SECONDS)
+            continue
+        run_job(job, owner)
+
+
+def start_worker_thread() -> threading.Thread:
+    """
+    Start the in-process background workers once per process: one for every
+    job kind and one lane for INTERACTIVE_KINDS. Returns the general worker.
+    """
+    with _worker_lock:
+        for name, kinds in (("job-worker", None), ("job-worker-interactive", list(INTERACTIVE_KINDS))):
+            thread = _worker_threads.get(name)
+            if thread is None or not thread.is_alive():
+                thread = threading.Thread(target=run_worker, kwargs={"kinds": kinds}, name=name, daemon=True)
+                thread.start()
+                _worker_threads[name] = thread
+        return _worker_threads["job-worker"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run or queue background jobs (feed sync, discovery, scoring, newsletter)."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker_parser = subparsers.add_parser("worker", help="Run queued jobs")
+    worker_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Exit once no job is due instead of polling forever",
+    )
+    worker_parser.add_argument(
+        "--kind",
+        action="append",
+        choices=sorted(JOB_HANDLERS),
+        help="Only run jobs of this kind (repeatable)",
+    )
+
+    enqueue_parser = subparsers.add_parser("enqueue", help="Queue a job")
+    enqueue_parser.add_argument("kind", choices=sorted(JOB_HANDLERS))
+    enqueue_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="sync: fetch the full lookback window instead of since the last run",
+    )
+    enqueue_parser.add_argument(
+        "--discover",
+        action="store_true",
+        help="sync: discover feeds for new domains",
+    )
+    enqueue_parser.add_argument(
+        "--due-only",
+        action="store_true",
+        help="sync: only fetch feeds that are due under their adaptive polling schedule",
+    )
+    enqueue_parser.add_argument(
+        "--rediscover-stale",
+        action="store_true",
+        help="discovery: only revisit no-feed domains whose retry backoff expired",
+    )
+    enqueue_parser.add_argument(
+        "--score",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="sync: LLM-score pending articles after storing (default: LLM_SCORING_ENABLED)",
+    )
+    enqueue_parser.add_argument(
+        "--week",
+        type=str,
+        default=None,
+        help="newsletter: week identifier (e.g., '2026-W05'). Defaults to current week.",
+    )
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        if not args.once and not args.kind:
+            threading.Thread(target=run_worker, kwargs={"kinds": list(INTERACTIVE_KINDS)},
+                             name="job-worker-interactive", daemon=True).start()
+        try:
+            run_worker(once=args.once, kinds=args.kind)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.kind == "sync":
+        params = {"full_sync": args.full, "discover": args.discover, "due_only": args.due_only,
+                  "score": args.score}
+    elif args.kind == "discovery":
+        params = {"rediscover_stale": args.rediscover_stale}
+    elif args.kind in ("score", "preference"):
+        params = {}
+    else:
+        params = {"week": args.week or db.get_current_week()}
+    job, created = enqueue(args.kind, params)
+    if created:
+        print(f"Queued {args.kind} job {job['id']}")
+    else:
+        print(f"{args.kind} job {job['id']} is already {job['status']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+LLM client for the configured provider (LLM_PROVIDER in config.py).
+
+complete() sends one prompt to Gemini (google-genai SDK), Z.ai/Zhipu (chat
+completions over HTTP) or the offline "mock" provider, and returns the reply
+text. Calls are spaced to LLM_REQUESTS_PER_MINUTE per provider across all
+threads of the process, and rate-limit or transient failures are retried
+with exponential backoff. The mock provider makes no network calls: callers
+pass a `mock` function producing the reply, so LLM stages can run offline.
+
+Callers that name their prompt template (`cache=(template, version)`) get
+replies from a persistent cache in the database when the same provider,
+model, template version and prompt were seen before (LLM_CACHE_* in
+config.py), so regenerating output does not pay for identical prompts again.
+Bump the template version whenever the template's wording changes.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from typing import Any, Callable, Optional
+
+try:
+    from google import genai
+    GEMINI_AVAILABLE = True
+except ImportError:
+    GEMINI_AVAILABLE = False
+
+import config
+import db
+import http_client
+
+PROVIDERS = ("gemini", "zhipu", "mock")
+
+# HTTP statuses worth retrying (rate limiting and transient server errors)
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """An LLM call failed or the provider is not configured."""
+
+
+class _RetryableError(LLMError):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """Space calls at least 60 / requests_per_minute seconds apart (thread-safe)."""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+_gemini_client = None
+
+
+def _limiter(provider: str) -> RateLimiter:
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = RateLimiter(config.LLM_REQUESTS_PER_MINUTE)
+        return _limiters[provider]
+
+
+def provider_name(provider: Optional[str] = None) -> str:
+    """The provider to use: `provider` if given, else LLM_PROVIDER."""
+    name = (provider or config.LLM_PROVIDER or "").lower()
+    if name not in PROVIDERS:
+        raise LLMError(f"Unknown LLM provider: {name!r} (expected one of {', '.join(PROVIDERS)})")
+    return name
+
+
+def model_name(provider: Optional[str] = None) -> str:
+    """Model used by a provider, as recorded alongside LLM results."""
+    return {
+        "gemini": config.GEMINI_MODEL,
+        "zhipu": config.ZHIPU_MODEL,
+        "mock": "mock",
+    }[provider_name(provider)]
+
+
+def is_configured(provider: Optional[str] = None) -> bool:
+    """True if the provider has its SDK and API key available."""
+    try:
+        name = provider_name(provider)
+    except LLMError:
+        return False
+    if name == "gemini":
+        return GEMINI_AVAILABLE and bool(config.GEMINI_API_KEY)
+    if name == "zhipu":
+        return bool(config.ZHIPU_API_KEY)
+    return True
+
+
+def _gemini_complete(prompt: str, json_mode: bool) -> str:
+    global _gemini_client
+    if _gemini_client is None:
+        _gemini_client = genai.Client(api_key=config.GEMINI_API_KEY)
+    generation_config = {"temperature": 0}
+    if json_mode:
+        generation_config["response_mime_type"] = "application/json"
+    try:
+        response = _gemini_client.models.generate_content(
+            model=config.GEMINI_MODEL,
+            contents=prompt,
+            config=generation_config,
+        )
+    except Exception as e:
+        if getattr(e, "code", None) in _RETRY_STATUSES:
+            raise _RetryableError(f"Gemini: {e}") from e
+        raise LLMError(f"Gemini: {e}") from e
+    return response.text or ""
+
+
+def _zhipu_complete(prompt: str, json_mode: bool) -> str:
+    payload = {
+        "model": config.ZHIPU_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0,
+    }
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    try:
+        response = http_client.get_session().post(
+            config.ZHIPU_API_ENDPOINT,
+            json=payload,
+            headers={"Authorization": f"Bearer {config.ZHIPU_API_KEY}"},
+            timeout=config.LLM_TIMEOUT_SECONDS,
+        )
+    except Exception as e:
+        raise _RetryableError(f"Zhipu: {e}") from e
+
+    if response.status_code in _RETRY_STATUSES:
+        retry_after = response.headers.get("Retry-After")
+        raise _RetryableError(
+            f"Zhipu: HTTP {response.status_code}",
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+        )
+    if response.status_code != 200:
+        raise LLMError(f"Zhipu: HTTP {response.status_code}: {response.text[:200]}")
+    try:
+        return response.json()["choices"][0]["message"]["content"] or ""
+    except (ValueError, KeyError, IndexError) as e:
+        raise LLMError(f"Zhipu: unexpected response: {response.text[:200]}") from e
+
+
+def cache_key(provider: str, model: str, template: str, template_version: int,
+              prompt: str, json_mode: bool = False) -> str:
+    """Key of a reply in the LLM cache: hash of everything the reply depends on."""
+    payload = json.dumps([provider, model, template, template_version, json_mode, prompt])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _call(name: str, prompt: str, json_mode: bool, mock: Optional[Callable[[str], str]]) -> str:
+    if name == "mock":
+        return mock(prompt) if mock else ""
+    if not is_configured(name):
+        raise LLMError(f"LLM provider {name!r} is not configured (missing API key or SDK)")
+
+    call = _gemini_complete if name == "gemini" else _zhipu_complete
+    attempt = 0
+    while True:
+        _limiter(name).acquire()
+        try:
+            return call(prompt, json_mode)
+        except _RetryableError as e:
+            if attempt >= config.LLM_MAX_RETRIES:
+                raise LLMError(str(e)) from e
+            time.sleep(e.retry_after or config.LLM_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+            attempt += 1
+
+
+def complete(prompt: str, provider: Optional[str] = None, json_mode: bool = False,
+             mock: Optional[Callable[[str], str]] = None,
+             cache: Optional[tuple[str, int]] = None,
+             validate: Optional[Callable[[str], Any]] = None) -> str:
+    """
+    Send a prompt to the provider and return the reply text.
+    With json_mode the provider is asked for a JSON reply (see parse_json).
+    The mock provider returns mock(prompt), or "" without a mock function.
+    With cache=(template name, template version) the reply is looked up in
+    and stored to the LLM cache. A fresh reply is passed to validate (if
+    given) first and only cached if that doesn't raise, so a malformed reply
+    is asked for again next time rather than served from the cache.
+    Raises LLMError if the provider is not configured or the call keeps failing.
+    """
+    name = provider_name(provider)
+    if not cache or not config.LLM_CACHE_ENABLED:
+        return _call(name, prompt, json_mode, mock)
+
+    template, version = cache
+    model = model_name(name)
+    key = cache_key(name, model, template, version, prompt, json_mode)
+    reply = db.get_llm_cache(key, template, config.LLM_CACHE_TTL_DAYS)
+    if reply is not None:
+        return reply
+
+    reply = _call(name, prompt, json_mode, mock)
+    if validate:
+        validate(reply)
+    if reply:
+        db.put_llm_cache(key, template, version, name, model, reply,
+                         config.LLM_CACHE_TTL_DAYS, config.LLM_CACHE_MAX_ENTRIES)
+    return reply
+
+
+def parse_json(text: str) -> Any:
+    """Parse a JSON reply, tolerating Markdown code fences around it."""
+    text = text.strip()
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise LLMError(f"Invalid JSON in LLM reply: {text[:200]}") from e
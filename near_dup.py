@@ -0,0 +1,108 @@
+"""
+Near-duplicate detection for articles (MinHash with a banded LSH index).
+
+An article's title and summary are reduced to a set of shingles (title words
+plus adjacent word pairs, stopwords dropped) and summarised by a MinHash
+signature of NEAR_DUP_BANDS * NEAR_DUP_BAND_ROWS values. The fraction of
+positions where two signatures agree estimates the Jaccard similarity of the
+shingle sets.
+
+For lookup, each signature is cut into bands of NEAR_DUP_BAND_ROWS values and
+every band is hashed to a bucket key. Articles sharing any bucket are
+candidates; with the default 20 bands of 3 rows, a pair at similarity 0.5 is
+found with ~93% probability and a pair at 0.1 with ~2%. db stores the bucket
+keys in an indexed table, so finding candidates costs one index lookup per
+band however large the archive grows, and only the candidates' signatures are
+compared against NEAR_DUP_THRESHOLD.
+"""
+import hashlib
+import re
+from array import array
+from functools import lru_cache
+from typing import Optional
+
+import config
+
+# Shingle hashes are 64-bit: the top _BIN_BITS pick the bin, the rest is the value
+_BIN_BITS = 16
+_BIN_RANGE = 1 << (64 - _BIN_BITS)
+_EMPTY = 1 << 64
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_STOPWORDS = frozenset("""
+    a an and are as at be but by for from has have he her his i in is it its
+    of on or our she that the their they this to was we were will with you
+""".split())
+
+
+def _tokens(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def shingles(title: str, summary: str) -> set[str]:
+    """Title words and adjacent word pairs of title + summary."""
+    title_tokens = _tokens(title)
+    tokens = title_tokens + _tokens(summary)
+    return set(title_tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+@lru_cache(maxsize=65536)
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+
+
+def signature(title: str, summary: str) -> Optional[bytes]:
+    """
+    MinHash signature of an article as bytes, or None if its text has fewer
+    than NEAR_DUP_MIN_TOKENS words (too little to judge duplication).
+
+    Uses one-permutation hashing: each shingle is hashed once and the hash
+    range is split into one bin per signature value, each keeping its minimum.
+    Empty bins borrow from the next non-empty bin (rotation densification),
+    offset by the distance borrowed so only identical borrows compare equal.
+    """
+    if len(_tokens(title)) + len(_tokens(summary)) < config.NEAR_DUP_MIN_TOKENS:
+        return None
+
+    size = config.NEAR_DUP_BANDS * config.NEAR_DUP_BAND_ROWS
+    bins = [_EMPTY] * size
+    for shingle in shingles(title, summary):
+        bin_index, value = divmod(_shingle_hash(shingle), _BIN_RANGE)
+        bin_index = bin_index * size >> _BIN_BITS
+        if value < bins[bin_index]:
+            bins[bin_index] = value
+
+    values = []
+    for index, value in enumerate(bins):
+        offset = 0
+        while value == _EMPTY:
+            offset += 1
+            value = bins[(index + offset) % size]
+        values.append(value + offset * _BIN_RANGE)
+    return array("Q", values).tobytes()
+
+
+def _values(sig: bytes) -> array:
+    values = array("Q")
+    values.frombytes(sig)
+    return values
+
+
+def bucket_keys(sig: bytes) -> list[tuple[int, int]]:
+    """(band, bucket key) pairs for a signature; keys are signed 64-bit for SQLite."""
+    rows = config.NEAR_DUP_BAND_ROWS
+    values = _values(sig)
+    keys = []
+    for band in range(len(values) // rows):
+        digest = hashlib.blake2b(values[band * rows:(band + 1) * rows].tobytes(), digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, "big", signed=True)))
+    return keys
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    values_a, values_b = _values(a), _values(b)
+    if len(values_a) != len(values_b) or not values_a:
+        return 0.0
+    return sum(x == y for x, y in zip(values_a, values_b)) / len(values_a)
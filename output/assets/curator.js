@@ -1,73 +1,212 @@
-let y={pending:[],shortlisted:[],rejected:[]},S=[],j={},A=null,p=null,P="articles",d="shortlisted";const Y=["pending","shortlisted","rejected"];let w=null;const g={pending:0,shortlisted:0,rejected:0};let x="domain_asc";const z="curator_reading_metrics_v1",Q=60,fe=5e3;let f={monthly_seconds:{},daily_seconds:{}},B=null,b=null;async function ye(){De(),de(),await h(),await k(),F()}async function h(){try{const n=await(await fetch("/api/articles")).json();y={pending:[],shortlisted:[],rejected:[]},n.articles.forEach(t=>{const s=t.status||"pending";y[s]&&y[s].push(t)}),R(),te(),await he()}catch{o("Failed to load articles","error")}}async function he(){try{const n=await(await fetch("/api/stats")).json();document.getElementById("stat-total").textContent=n.total,document.getElementById("stat-pending").textContent=n.pending,document.getElementById("stat-shortlisted").textContent=n.shortlisted,document.getElementById("stat-rejected").textContent=n.rejected}catch(e){console.error("Failed to load stats:",e)}}function ve(e){P=e,document.getElementById("tab-articles").classList.toggle("active",e==="articles"),document.getElementById("tab-subscriptions").classList.toggle("active",e==="subscriptions"),document.getElementById("articles-view").classList.toggle("active",e==="articles"),document.getElementById("subscriptions-view").classList.toggle("active",e==="subscriptions"),F()}async function k(){const e=document.getElementById("subscriptions-list"),n=document.getElementById("subscriptions-count");try{S=(await(await fetch("/api/rss-subscriptions")).json()).subscriptions||[],n.textContent=`${S.length} subscriptions`,V()}catch{e.innerHTML='<div class="empty-state"><p>Failed to load subscriptions</p></div>',n.textContent="Error loading subscriptions"}}function ge(){const e=document.getElementById("subscriptions-sort");x=e?e.value:"domain_asc",V()}function V(){const e=document.getElementById("subscriptions-list");if(!S.length){e.innerHTML='<div class="empty-state"><p>No active subscriptions found.</p></div>';return}const n=[...S];x==="articles_desc"?n.sort((t,s)=>(s.article_count||0)-(t.article_count||0)):x==="articles_asc"?n.sort((t,s)=>(t.article_count||0)-(s.article_count||0)):n.sort((t,s)=>(t.domain||"").localeCompare(s.domain||"")),e.innerHTML=n.map((t,s)=>{const i=`subscription-feed-${s}`,a=t.updated_at||t.discovered_at,r=encodeURIComponent(t.domain||"");return`
+let articles={pending:[],shortlisted:[],rejected:[]};let subscriptions=[];let notesSaveTimeout={};let notesStatusResetTimeout=null;let activeReaderArticleId=null;let activeView='articles';let activeQueueStatus='shortlisted';const queueStatuses=['pending','shortlisted','rejected'];let nextQueueIndexAfterMutation=null;const queueScrollTopByStatus={pending:0,shortlisted:0,rejected:0};const QUEUE_PAGE_SIZE=50;const queueCursors={pending:null,shortlisted:null,rejected:null};const queueLoadingMore={pending:false,shortlisted:false,rejected:false};const queueTotals={pending:null,shortlisted:null,rejected:null};let subscriptionsSort='domain_asc';let queueSort='date';const READING_METRICS_KEY='curator_reading_metrics_v1';const READING_STREAK_THRESHOLD_SECONDS=60;const READING_TICK_MS=5000;let readingMetrics={monthly_seconds:{},daily_seconds:{}};let readingTicker=null;let readingLastTickAt=null;async function init(){loadReadingMetrics();renderReadingMetrics();await loadArticles();await loadSubscriptions();updateReadingTrackerState();}
+async function fetchArticlesPage(status,limit,cursor=null){const params=new URLSearchParams({status,limit:String(limit),sort:queueSort});if(cursor)params.set('cursor',cursor);const response=await fetch(`/api/articles?${params.toString()}`);if(!response.ok){throw new Error('Failed to load articles');}
+return response.json();}
+async function loadArticles(){try{const pages=await Promise.all(queueStatuses.map(status=>{const limit=Math.max(QUEUE_PAGE_SIZE,(articles[status]||[]).length);return fetchArticlesPage(status,limit);}));articles={pending:[],shortlisted:[],rejected:[]};queueStatuses.forEach((status,idx)=>{articles[status]=pages[idx].articles||[];queueCursors[status]=pages[idx].next_cursor||null;});renderQueue();syncReaderSelection();await loadStats();}catch(error){showToast('Failed to load articles','error');}}
+async function loadMoreArticles(status=activeQueueStatus){const cursor=queueCursors[status];if(!cursor||queueLoadingMore[status])return;queueLoadingMore[status]=true;try{const data=await fetchArticlesPage(status,QUEUE_PAGE_SIZE,cursor);const seen=new Set(articles[status].map(article=>article.id));const fresh=(data.articles||[]).filter(article=>!seen.has(article.id));articles[status]=articles[status].concat(fresh);queueCursors[status]=data.next_cursor||null;if(status===activeQueueStatus){renderQueue({preserveScroll:true,animate:false});}}catch(error){showToast('Failed to load more articles','error');}finally{queueLoadingMore[status]=false;}}
+async function loadStats(){try{const response=await fetch('/api/stats');const stats=await response.json();document.getElementById('stat-total').textContent=stats.total;document.getElementById('stat-pending').textContent=stats.pending;document.getElementById('stat-shortlisted').textContent=stats.shortlisted;document.getElementById('stat-rejected').textContent=stats.rejected;queueStatuses.forEach(status=>{queueTotals[status]=stats[status]??null;const countEl=document.getElementById(`count-${status}`);if(countEl&&queueTotals[status]!==null)countEl.textContent=queueTotals[status];});}catch(error){console.error('Failed to load stats:',error);}}
+function switchView(viewName){activeView=viewName;document.getElementById('tab-articles').classList.toggle('active',viewName==='articles');document.getElementById('tab-subscriptions').classList.toggle('active',viewName==='subscriptions');document.getElementById('articles-view').classList.toggle('active',viewName==='articles');document.getElementById('subscriptions-view').classList.toggle('active',viewName==='subscriptions');updateReadingTrackerState();}
+async function loadSubscriptions(){const container=document.getElementById('subscriptions-list');const countEl=document.getElementById('subscriptions-count');try{const response=await fetch('/api/rss-subscriptions');const data=await response.json();subscriptions=data.subscriptions||[];countEl.textContent=`${subscriptions.length} subscriptions`;renderSubscriptions();}catch(error){container.innerHTML='<div class="empty-state"><p>Failed to load subscriptions</p></div>';countEl.textContent='Error loading subscriptions';}}
+async function onQueueSortChange(){const sortEl=document.getElementById('queue-sort');queueSort=sortEl?sortEl.value:'date';articles={pending:[],shortlisted:[],rejected:[]};queueStatuses.forEach(status=>{queueCursors[status]=null;queueScrollTopByStatus[status]=0;});await loadArticles();}
+function onSubscriptionsSortChange(){const sortEl=document.getElementById('subscriptions-sort');subscriptionsSort=sortEl?sortEl.value:'domain_asc';renderSubscriptions();}
+function renderSubscriptions(){const container=document.getElementById('subscriptions-list');if(!subscriptions.length){container.innerHTML='<div class="empty-state"><p>No active subscriptions found.</p></div>';return;}
+const sortedSubscriptions=[...subscriptions];if(subscriptionsSort==='articles_desc'){sortedSubscriptions.sort((a,b)=>(b.article_count||0)-(a.article_count||0));}else if(subscriptionsSort==='articles_asc'){sortedSubscriptions.sort((a,b)=>(a.article_count||0)-(b.article_count||0));}else{sortedSubscriptions.sort((a,b)=>(a.domain||'').localeCompare(b.domain||''));}
+container.innerHTML=sortedSubscriptions.map((sub,index)=>{const inputId=`subscription-feed-${index}`;const updatedAt=sub.updated_at||sub.discovered_at;const encodedDomain=encodeURIComponent(sub.domain||'');return`
                     <div class="subscription-item">
                         <div class="subscription-top">
-                            <div class="subscription-domain">${m(t.domain)}</div>
-                            <div class="subscription-meta">${t.article_count||0} articles in feed</div>
+                            <div class="subscription-domain">${escapeHtml(sub.domain)}</div>
+                            <div class="subscription-meta">${sub.article_count || 0} articles in feed</div>
                         </div>
                         <div class="subscription-meta" style="margin-bottom: 8px;">
-                            ${a?`Updated: ${new Date(a).toLocaleString()}`:"No update timestamp"}
+                            ${updatedAt ? `Updated:${new Date(updatedAt).toLocaleString()}` : 'No update timestamp'}
                         </div>
                         <div class="subscription-edit">
-                            <input id="${i}" type="url" value="${m(t.feed_url||"")}" placeholder="https://example.com/feed.xml" />
+                            <input id="${inputId}" type="url" value="${escapeHtml(sub.feed_url || '')}" placeholder="https://example.com/feed.xml" />
                             <div class="subscription-actions">
-                                <button class="btn btn-success" onclick="saveSubscriptionByEncoded('${r}', '${i}')">Save</button>
-                                <button class="btn btn-danger" onclick="removeSubscriptionByEncoded('${r}', false)">Remove Subscription</button>
-                                <button class="btn btn-warning" onclick="removeSubscriptionByEncoded('${r}', true)">Remove + Delete Articles</button>
+                                <button class="btn btn-success" onclick="saveSubscriptionByEncoded('${encodedDomain}', '${inputId}')">Save</button>
+                                <button class="btn btn-danger" onclick="removeSubscriptionByEncoded('${encodedDomain}', false)">Remove Subscription</button>
+                                <button class="btn btn-warning" onclick="removeSubscriptionByEncoded('${encodedDomain}', true)">Remove + Delete Articles</button>
                             </div>
                         </div>
                     </div>
-                `}).join("")}function W(e){try{return decodeURIComponent(e||"")}catch{return""}}function we(e,n){const t=W(e);if(!t){o("Invalid subscription domain","error");return}be(t,n)}async function be(e,n){const t=document.getElementById(n).value.trim();if(!t){o("Feed URL cannot be empty","error");return}try{const s=await fetch(`/api/rss-subscriptions/${encodeURIComponent(e)}`,{method:"PUT",headers:{"Content-Type":"application/json"},body:JSON.stringify({feed_url:t})}),i=await s.json();if(!s.ok){o(i.error||"Failed to update subscription","error");return}o(`Subscription updated: ${e}`,"success"),await k()}catch{o("Failed to update subscription","error")}}function Ee(e,n){const t=W(e);if(!t){o("Invalid subscription domain","error");return}$e(t,n)}async function $e(e,n){const t=n?`Remove ${e} and delete all related articles from the feed?`:`Remove ${e} subscription?`;if(confirm(t))try{const s=`/api/rss-subscriptions/${encodeURIComponent(e)}?delete_articles=${n?"true":"false"}`,i=await fetch(s,{method:"DELETE"}),a=await i.json();if(!i.ok){o(a.error||"Failed to remove subscription","error");return}n?(o(`Removed ${e} and deleted ${a.deleted_articles||0} articles`,"success"),await h()):o(`Removed ${e} subscription`,"success"),await k()}catch{o("Failed to remove subscription","error")}}async function X(e){if(!["pending","shortlisted","rejected"].includes(e)){o("Invalid status","error");return}const n=e.charAt(0).toUpperCase()+e.slice(1);if(!confirm(`Archive all ${n.toLowerCase()} articles?`))return;const t=document.getElementById("queue-list");t&&(g[d]=t.scrollTop);try{const s=await fetch("/api/archive-status",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({status:e})}),i=await s.json();if(!s.ok){o(i.error||"Failed to archive","error");return}o(`Archived ${i.archived_count} ${e} article(s)`,"success"),await h()}catch{o("Failed to archive","error")}}async function Se(){await X(d)}async function ke(){const e=document.getElementById("pull-feeds-btn"),n=e?e.textContent:"";e&&(e.disabled=!0,e.textContent="Pulling..."),o("Pulling feeds... this may take a minute","success");try{const t=await fetch("/api/sync-feeds",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({full_sync:!1,discover:!1})}),s=await t.json();if(!t.ok){o(s.error||"Failed to pull feeds","error");return}o(`Pulled feeds: ${s.stored_count||0} article(s) stored`,"success"),await h(),await k()}catch{o("Failed to pull feeds","error")}finally{e&&(e.disabled=!1,e.textContent=n||"Pull From Feeds")}}async function Te(){document.getElementById("archives-modal").classList.add("active"),await Ie(),await ee()}function Z(){document.getElementById("archives-modal").classList.remove("active")}async function Ie(){try{const n=await(await fetch("/api/archived/weeks")).json(),t=document.getElementById("archive-week-filter");t.innerHTML='<option value="">All weeks</option>'+n.weeks.map(s=>`<option value="${s.week}">${s.week} (${s.shortlisted} shortlisted, ${s.rejected} rejected)</option>`).join("")}catch(e){console.error("Failed to load archive weeks:",e)}}async function ee(){const e=document.getElementById("archive-week-filter").value,n=document.getElementById("archived-list"),t=document.getElementById("archive-count");try{const s=e?`/api/archived?week=${e}`:"/api/archived",a=await(await fetch(s)).json();if(t.textContent=`${a.count} archived articles`,a.articles.length===0){n.innerHTML='<div class="empty-state"><p>No archived articles</p></div>';return}n.innerHTML=a.articles.map(r=>`
+                `;}).join('');}
+function decodeDomain(encodedDomain){try{return decodeURIComponent(encodedDomain||'');}catch(_error){return'';}}
+function saveSubscriptionByEncoded(encodedDomain,inputId){const domain=decodeDomain(encodedDomain);if(!domain){showToast('Invalid subscription domain','error');return;}
+saveSubscription(domain,inputId);}
+async function saveSubscription(domain,inputId){const feedUrl=document.getElementById(inputId).value.trim();if(!feedUrl){showToast('Feed URL cannot be empty','error');return;}
+try{const response=await fetch(`/api/rss-subscriptions/${encodeURIComponent(domain)}`,{method:'PUT',headers:{'Content-Type':'application/json'},body:JSON.stringify({feed_url:feedUrl})});const result=await response.json();if(!response.ok){showToast(result.error||'Failed to update subscription','error');return;}
+showToast(`Subscription updated: ${domain}`,'success');await loadSubscriptions();}catch(error){showToast('Failed to update subscription','error');}}
+function removeSubscriptionByEncoded(encodedDomain,deleteArticles){const domain=decodeDomain(encodedDomain);if(!domain){showToast('Invalid subscription domain','error');return;}
+removeSubscription(domain,deleteArticles);}
+async function removeSubscription(domain,deleteArticles){const prompt=deleteArticles?`Remove ${domain} and delete all related articles from the feed?`:`Remove ${domain} subscription?`;if(!confirm(prompt)){return;}
+try{const url=`/api/rss-subscriptions/${encodeURIComponent(domain)}?delete_articles=${deleteArticles ? 'true' : 'false'}`;const response=await fetch(url,{method:'DELETE'});const result=await response.json();if(!response.ok){showToast(result.error||'Failed to remove subscription','error');return;}
+if(deleteArticles){showToast(`Removed ${domain} and deleted ${result.deleted_articles || 0} articles`,'success');await loadArticles();}else{showToast(`Removed ${domain} subscription`,'success');}
+await loadSubscriptions();}catch(error){showToast('Failed to remove subscription','error');}}
+async function archiveStatus(status){if(!['pending','shortlisted','rejected'].includes(status)){showToast('Invalid status','error');return;}
+const label=status.charAt(0).toUpperCase()+status.slice(1);if(!confirm(`Archive all ${label.toLowerCase()} articles?`)){return;}
+const queueList=document.getElementById('queue-list');if(queueList){queueScrollTopByStatus[activeQueueStatus]=queueList.scrollTop;}
+try{const response=await fetch('/api/archive-status',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({status})});const result=await response.json();if(!response.ok){showToast(result.error||'Failed to archive','error');return;}
+showToast(`Archived ${result.archived_count} ${status} article(s)`,'success');await loadArticles();}catch(_error){showToast('Failed to archive','error');}}
+async function archiveCurrentFolder(){await archiveStatus(activeQueueStatus);}
+async function pullFromFeeds(){const button=document.getElementById('pull-feeds-btn');const original=button?button.textContent:'';if(button){button.disabled=true;button.textContent='Pulling...';}
+showToast('Pulling feeds... this may take a minute','success');try{const response=await fetch('/api/sync-feeds',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({full_sync:false,discover:false}),});const result=await response.json();if(!response.ok){showToast(result.error||'Failed to pull feeds','error');return;}
+const streamed=await streamFeedSyncProgress(button,result.job_id);if(!streamed){await waitForFeedSyncCompletion(90);}}catch(_error){showToast('Failed to pull feeds','error');}finally{if(button){button.disabled=false;button.textContent=original||'Pull From Feeds';}}}
+function describeSyncProgress(progress){if(!progress){return'Pulling...';}
+const prefix=`${progress.stage}/${progress.stages}`;if(progress.feeds_fetched!==undefined){return`${prefix} Feeds ${progress.feeds_fetched}/${progress.feeds}`;}
+return`${prefix} ${progress.label}...`;}
+async function finishFeedSync(status){if(status.error){showToast(`Feed pull failed: ${status.error}`,'error');return;}
+showToast(`Pulled feeds: ${status.stored_count || 0} article(s) stored`,'success');await loadArticles();await loadSubscriptions();}
+function streamFeedSyncProgress(button,jobId){if(typeof EventSource==='undefined'){return Promise.resolve(false);}
+return new Promise(resolve=>{const query=jobId?`?job_id=${encodeURIComponent(jobId)}`:'';const source=new EventSource(`/api/sync-feeds/events${query}`);let finished=false;source.addEventListener('progress',event=>{const status=JSON.parse(event.data);if(button){button.textContent=describeSyncProgress(status.progress);}});source.addEventListener('done',async event=>{finished=true;source.close();await finishFeedSync(JSON.parse(event.data));resolve(true);});source.onerror=()=>{if(finished){return;}
+source.close();resolve(false);};});}
+async function waitForFeedSyncCompletion(timeoutSeconds=90){const startedAt=Date.now();while((Date.now()-startedAt)/1000<timeoutSeconds){await new Promise(resolve=>setTimeout(resolve,2000));try{const response=await fetch('/api/sync-feeds/status');const status=await response.json();if(!response.ok){showToast('Could not read feed sync status','error');return;}
+if(status.running){continue;}
+await finishFeedSync(status);return;}catch(_error){showToast('Could not read feed sync status','error');return;}}
+showToast('Feed pull is still running in background','success');}
+async function openArchives(){document.getElementById('archives-modal').classList.add('active');await loadArchiveWeeks();await loadArchivedArticles();}
+function closeArchives(){document.getElementById('archives-modal').classList.remove('active');}
+async function loadArchiveWeeks(){try{const response=await fetch('/api/archived/weeks');const data=await response.json();const select=document.getElementById('archive-week-filter');select.innerHTML='<option value="">All weeks</option>'+
+data.weeks.map(w=>`<option value="${w.week}">${w.week} (${w.shortlisted} shortlisted, ${w.rejected} rejected)</option>`).join('');}catch(error){console.error('Failed to load archive weeks:',error);}}
+async function loadArchivedArticles(){const week=document.getElementById('archive-week-filter').value;const container=document.getElementById('archived-list');const countEl=document.getElementById('archive-count');try{const url=week?`/api/archived?week=${week}`:'/api/archived';const response=await fetch(url);const data=await response.json();countEl.textContent=`${data.count} archived articles`;if(data.articles.length===0){container.innerHTML='<div class="empty-state"><p>No archived articles</p></div>';return;}
+container.innerHTML=data.articles.map(article=>`
                     <div class="archived-item">
                         <div class="archived-item-info">
                             <div class="archived-item-title">
-                                <a href="${m(r.url)}" target="_blank">${m(r.title)}</a>
+                                <a href="${escapeHtml(article.url)}" target="_blank">${escapeHtml(article.title)}</a>
                             </div>
                             <div class="archived-item-meta">
-                                <span class="status-badge status-${r.status}">${r.status}</span>
-                                <span>${r.source}</span>
-                                <span>Week: ${r.week}</span>
-                                <span>Archived: ${new Date(r.archived_at).toLocaleDateString()}</span>
+                                <span class="status-badge status-${article.status}">${article.status}</span>
+                                <span>${article.source}</span>
+                                <span>Week: ${article.week}</span>
+                                <span>Archived: ${new Date(article.archived_at).toLocaleDateString()}</span>
                             </div>
                         </div>
                         <div class="archived-item-actions">
-                            <button class="btn btn-primary" onclick="unarchiveArticle('${r.id}')" style="padding: 4px 10px; font-size: 0.75rem;">Unarchive</button>
+                            <button class="btn btn-primary" onclick="unarchiveArticle('${article.id}')" style="padding: 4px 10px; font-size: 0.75rem;">Unarchive</button>
                         </div>
                     </div>
-                `).join("")}catch{n.innerHTML='<div class="empty-state"><p>Failed to load archives</p></div>'}}async function Be(e){try{(await(await fetch(`/api/articles/${e}/unarchive`,{method:"POST"})).json()).success?(o("Article unarchived","success"),await ee(),await h()):o("Failed to unarchive","error")}catch{o("Failed to unarchive","error")}}function Le(e){if(!Y.includes(e))return;const n=document.getElementById("queue-list");n&&(g[d]=n.scrollTop),d=e,R({preserveScroll:!0,animate:!1}),te()}function _(){return y[d]||[]}function R(e={}){const n=e.preserveScroll!==!1,t=e.animate!==!1;Y.forEach(r=>{const c=document.getElementById(`count-${r}`),l=document.getElementById(`queue-filter-${r}`),u=(y[r]||[]).length;c&&(c.textContent=u),l&&l.classList.toggle("active",d===r)});const s=document.getElementById("queue-list"),i=s?s.scrollTop:0,a=_();if(!a.length){s.innerHTML=`<div class="empty-state"><p>No ${d} articles</p></div>`,g[d]=0;return}if(s.innerHTML=a.map((r,c)=>{const l=r.id===p,u=r.summary?r.summary.length>120?r.summary.substring(0,120)+"...":r.summary:"",v=t?`animation-delay: ${Math.min(c*28,280)}ms;`:"animation: none; opacity: 1; transform: translateY(0);";return`
-                    <article class="queue-item ${l?"active":""}" data-article-id="${r.id}" tabindex="0" style="${v}" onclick="openReader('${r.id}')">
+                `).join('');}catch(error){container.innerHTML='<div class="empty-state"><p>Failed to load archives</p></div>';}}
+async function unarchiveArticle(articleId){try{const response=await fetch(`/api/articles/${articleId}/unarchive`,{method:'POST'});const result=await response.json();if(result.success){showToast('Article unarchived','success');await loadArchivedArticles();await loadArticles();}else{showToast('Failed to unarchive','error');}}catch(error){showToast('Failed to unarchive','error');}}
+function setQueueStatus(status){if(!queueStatuses.includes(status))return;const queueList=document.getElementById('queue-list');if(queueList){queueScrollTopByStatus[activeQueueStatus]=queueList.scrollTop;}
+activeQueueStatus=status;renderQueue({preserveScroll:true,animate:false});syncReaderSelection();}
+function getQueueItems(){return articles[activeQueueStatus]||[];}
+function renderQueue(options={}){const preserveScroll=options.preserveScroll!==false;const animate=options.animate!==false;queueStatuses.forEach(status=>{const countEl=document.getElementById(`count-${status}`);const filterEl=document.getElementById(`queue-filter-${status}`);const count=queueTotals[status]??(articles[status]||[]).length;if(countEl)countEl.textContent=count;if(filterEl)filterEl.classList.toggle('active',activeQueueStatus===status);});const container=document.getElementById('queue-list');const previousScrollTop=container?container.scrollTop:0;const items=getQueueItems();if(!items.length){container.innerHTML=`<div class="empty-state"><p>No ${activeQueueStatus} articles</p></div>`;queueScrollTopByStatus[activeQueueStatus]=0;return;}
+container.innerHTML=items.map((article,idx)=>{const isActive=article.id===activeReaderArticleId;const summary=article.summary?(article.summary.length>120?article.summary.substring(0,120)+'...':article.summary):'';const animationStyle=animate?`animation-delay: ${Math.min(idx * 28, 280)}ms;`:'animation: none; opacity: 1; transform: translateY(0);';return`
+                    <article class="queue-item ${isActive ? 'active' : ''}" data-article-id="${article.id}" tabindex="0" style="${animationStyle}" onclick="openReader('${article.id}')">
                         <div class="queue-item-top">
-                            <h3 class="queue-item-title">${m(r.title)}</h3>
-                            ${r.top_pick?'<span class="queue-pill top-pick">Top Pick</span>':""}
+                            <h3 class="queue-item-title">${escapeHtml(article.title)}</h3>
+                            ${article.top_pick ? '<span class="queue-pill top-pick">Top Pick</span>' : ''}
                         </div>
                         <div class="queue-item-meta">
-                            <span class="queue-pill source">${m(r.source)}</span>
-                            ${r.topic?`<span class="queue-pill topic">${m(r.topic)}</span>`:""}
+                            <span class="queue-pill source">${escapeHtml(article.source)}</span>
+                            ${article.topic ? `<span class="queue-pill topic">${escapeHtml(article.topic)}</span>` : ''}
+                            ${article.cluster_size ? `<span class="queue-pill cluster"title="Near-duplicate stories from other sources">+${article.cluster_size}similar</span>` : ''}
+                            ${article.relevance_score != null ? `<span class="queue-pill relevance"title="${escapeHtml(article.relevance_reason || 'LLM relevance score').replace(/"/g,'&quot;')}">${Number(article.relevance_score).toFixed(1)}/10</span>` : ''}
+                            ${article.preference_score != null ? `<span class="queue-pill preference"title="Chance you shortlist it, learned from your past curation">${Math.round(Number(article.preference_score)*100)}%match</span>` : ''}
                         </div>
-                        ${u?`<p class="queue-item-summary">${m(u)}</p>`:""}
+                        ${summary ? `<p class="queue-item-summary">${escapeHtml(summary)}</p>` : ''}
                         <div class="queue-item-actions">
-                            ${_e(r.id,d)}
+                            ${renderQueueActions(article.id, activeQueueStatus)}
                         </div>
                     </article>
-                `}).join(""),s){const r=g[d]||i||0;s.scrollTop=n?r:0}}function _e(e,n){return n==="pending"?`
-                    <button class="btn btn-success" onclick="event.stopPropagation(); curate('${e}', 'shortlisted')">Shortlist</button>
-                    <button class="btn btn-danger" onclick="event.stopPropagation(); curate('${e}', 'rejected')">Reject</button>
-                    <button class="btn btn-feed-remove" onclick="event.stopPropagation(); removeFeedForArticle('${e}', true)">Remove Feed</button>
-                `:n==="shortlisted"?`
-                    <button class="btn btn-secondary" onclick="event.stopPropagation(); curate('${e}', 'pending')">Reset</button>
-                    <button class="btn btn-danger" onclick="event.stopPropagation(); curate('${e}', 'rejected')">Reject</button>
-                    <button class="btn btn-feed-remove" onclick="event.stopPropagation(); removeFeedForArticle('${e}', true)">Remove Feed</button>
-                `:`
-                <button class="btn btn-secondary" onclick="event.stopPropagation(); curate('${e}', 'pending')">Reset</button>
-                <button class="btn btn-success" onclick="event.stopPropagation(); curate('${e}', 'shortlisted')">Shortlist</button>
-                <button class="btn btn-feed-remove" onclick="event.stopPropagation(); removeFeedForArticle('${e}', true)">Remove Feed</button>
-            `}function te(){const e=_();if(!e.length){ce();return}if(!e.some(t=>t.id===p)){const t=typeof w=="number"?Math.min(w,e.length-1):0;w=null,L(e[t].id,{refreshQueue:!1,animatedSwitch:!0});return}w=null,L(p,{refreshQueue:!1,animatedSwitch:!1})}async function $(e,n){try{const s=_().findIndex(r=>r.id===e);s>=0&&(w=s);const i=document.getElementById("queue-list");i&&(g[d]=i.scrollTop),await Qe(e,n),(await fetch(`/api/articles/${e}/curate`,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({status:n})})).ok?(await h(),o(`Article ${n}`,"success")):o("Failed to update article","error")}catch{o("Failed to update article","error")}}async function ne(e,n){try{(await fetch(`/api/articles/${e}/top-pick`,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({top_pick:n})})).ok?(await h(),o(n?"Marked as Top Pick":"Top Pick removed","success")):o("Failed to update Top Pick","error")}catch{o("Failed to update Top Pick","error")}}function N(e){return(e||"").toLowerCase().replace(/^www\./,"")}function U(e){if(!e)return"";try{return N(new URL(e).hostname)}catch{return""}}function Fe(e){const n=N(e?.source||""),t=U(e?.url||""),s=[n,t].filter(Boolean);if(!s.length)return"";const i=S.find(a=>{const r=N(a.domain||""),c=U(a.feed_url||"");return s.some(l=>l===r||l===c)});return i?i.domain:""}async function se(e,n=!0){const t=ae(e);if(!t){o("Article not found","error");return}S.length||await k();const s=Fe(t);if(!s){o("Could not map article to an RSS subscription","error");return}const i=n?`Remove feed "${s}" and delete all related articles?`:`Remove feed "${s}" subscription?`;if(!confirm(i))return;const r=_().findIndex(l=>l.id===e);r>=0&&(w=r);const c=document.getElementById("queue-list");c&&(g[d]=c.scrollTop);try{const l=`/api/rss-subscriptions/${encodeURIComponent(s)}?delete_articles=${n?"true":"false"}`,u=await fetch(l,{method:"DELETE"}),v=await u.json();if(!u.ok){o(v.error||"Failed to remove feed subscription","error");return}o(n?`Removed ${s} and deleted ${v.deleted_articles||0} related articles`:`Removed ${s} subscription`,"success"),await k(),await h()}catch{o("Failed to remove feed subscription","error")}}function Re(e,n){E("saving","Saving notes..."),j[e]&&clearTimeout(j[e]),A&&clearTimeout(A),j[e]=setTimeout(async()=>{try{if(!(await fetch(`/api/articles/${e}/curate`,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({notes:n})})).ok)throw new Error("Failed to save notes");E("saved","Saved"),A=setTimeout(()=>{E("idle","Notes auto-save as you type.")},1400)}catch(t){console.error("Failed to save notes:",t),E("error","Save failed. Retrying on next edit.")}},500)}async function Ce(){if(y.shortlisted.length===0){o("No shortlisted articles to include","error");return}o("Generating newsletter...","success");try{const t=await(await fetch("/api/generate-newsletter",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({})})).json();t.success?(o(`Newsletter generated with ${t.article_count} articles`,"success"),oe(t.newsletter_id)):o(t.error||"Failed to generate newsletter","error")}catch{o("Failed to generate newsletter","error")}}async function oe(e=null){const n=document.getElementById("newsletter-modal"),t=document.getElementById("newsletter-list"),s=document.getElementById("newsletter-content");n.classList.add("active"),t.innerHTML='<h3>Past Newsletters</h3><div class="loading">Loading...</div>';try{const a=await(await fetch("/api/newsletters")).json();if(a.newsletters.length===0){t.innerHTML='<h3>Past Newsletters</h3><div class="empty-state"><p>No newsletters generated yet.</p></div>',s.innerHTML='<div class="empty-state"><p>Shortlist some articles and click "Generate Newsletter".</p></div>';return}t.innerHTML="<h3>Past Newsletters</h3>"+a.newsletters.map(c=>`
-                        <div class="newsletter-item" data-id="${c.id}"
-                             onclick="loadNewsletterContent('${c.id}')">
-                            <span>${c.week}</span>
-                            <span style="font-size: 0.8rem; opacity: 0.7;">${new Date(c.generated_at).toLocaleString()}</span>
+                `;}).join('');if(container){const savedScrollTop=queueScrollTopByStatus[activeQueueStatus]||previousScrollTop||0;container.scrollTop=preserveScroll?savedScrollTop:0;}}
+function renderQueueActions(articleId,currentStatus){if(currentStatus==='pending'){return`
+                    <button class="btn btn-success" onclick="event.stopPropagation(); curate('${articleId}', 'shortlisted')">Shortlist</button>
+                    <button class="btn btn-danger" onclick="event.stopPropagation(); curate('${articleId}', 'rejected')">Reject</button>
+                    <button class="btn btn-feed-remove" onclick="event.stopPropagation(); removeFeedForArticle('${articleId}', true)">Remove Feed</button>
+                `;}
+if(currentStatus==='shortlisted'){return`
+                    <button class="btn btn-secondary" onclick="event.stopPropagation(); curate('${articleId}', 'pending')">Reset</button>
+                    <button class="btn btn-danger" onclick="event.stopPropagation(); curate('${articleId}', 'rejected')">Reject</button>
+                    <button class="btn btn-feed-remove" onclick="event.stopPropagation(); removeFeedForArticle('${articleId}', true)">Remove Feed</button>
+                `;}
+return`
+                <button class="btn btn-secondary" onclick="event.stopPropagation(); curate('${articleId}', 'pending')">Reset</button>
+                <button class="btn btn-success" onclick="event.stopPropagation(); curate('${articleId}', 'shortlisted')">Shortlist</button>
+                <button class="btn btn-feed-remove" onclick="event.stopPropagation(); removeFeedForArticle('${articleId}', true)">Remove Feed</button>
+            `;}
+function syncReaderSelection(){const items=getQueueItems();if(!items.length){closeReader();return;}
+const stillExists=items.some(a=>a.id===activeReaderArticleId);if(!stillExists){const fallbackIndex=typeof nextQueueIndexAfterMutation==='number'?Math.min(nextQueueIndexAfterMutation,items.length-1):0;nextQueueIndexAfterMutation=null;openReader(items[fallbackIndex].id,{refreshQueue:false,animatedSwitch:true});return;}
+nextQueueIndexAfterMutation=null;openReader(activeReaderArticleId,{refreshQueue:false,animatedSwitch:false});}
+async function curate(articleId,status){try{const currentQueueItems=getQueueItems();const currentIndex=currentQueueItems.findIndex(item=>item.id===articleId);if(currentIndex>=0){nextQueueIndexAfterMutation=currentIndex;}
+const queueList=document.getElementById('queue-list');if(queueList){queueScrollTopByStatus[activeQueueStatus]=queueList.scrollTop;}
+await animateStatusTransition(articleId,status);const response=await fetch(`/api/articles/${articleId}/curate`,{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({status})});if(response.ok){await loadArticles();showToast(`Article ${status}`,'success');}else{showToast('Failed to update article','error');}}catch(error){showToast('Failed to update article','error');}}
+async function toggleTopPick(articleId,topPick){try{const response=await fetch(`/api/articles/${articleId}/top-pick`,{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({top_pick:topPick})});if(response.ok){await loadArticles();showToast(topPick?'Marked as Top Pick':'Top Pick removed','success');}else{showToast('Failed to update Top Pick','error');}}catch(error){showToast('Failed to update Top Pick','error');}}
+function normalizeHost(value){return(value||'').toLowerCase().replace(/^www\./,'');}
+function extractHost(url){if(!url)return'';try{return normalizeHost(new URL(url).hostname);}catch(_error){return'';}}
+function resolveSubscriptionDomainForArticle(article){const sourceHost=normalizeHost(article?.source||'');const articleHost=extractHost(article?.url||'');const candidates=[sourceHost,articleHost].filter(Boolean);if(!candidates.length)return'';const match=subscriptions.find(sub=>{const subDomainHost=normalizeHost(sub.domain||'');const subFeedHost=extractHost(sub.feed_url||'');return candidates.some(candidate=>candidate===subDomainHost||candidate===subFeedHost);});return match?match.domain:'';}
+async function removeFeedForArticle(articleId,deleteArticles=true){const article=findArticleById(articleId);if(!article){showToast('Article not found','error');return;}
+if(!subscriptions.length){await loadSubscriptions();}
+const domain=resolveSubscriptionDomainForArticle(article);if(!domain){showToast('Could not map article to an RSS subscription','error');return;}
+const prompt=deleteArticles?`Remove feed "${domain}" and delete all related articles?`:`Remove feed "${domain}" subscription?`;if(!confirm(prompt)){return;}
+const currentQueueItems=getQueueItems();const currentIndex=currentQueueItems.findIndex(item=>item.id===articleId);if(currentIndex>=0){nextQueueIndexAfterMutation=currentIndex;}
+const queueList=document.getElementById('queue-list');if(queueList){queueScrollTopByStatus[activeQueueStatus]=queueList.scrollTop;}
+try{const url=`/api/rss-subscriptions/${encodeURIComponent(domain)}?delete_articles=${deleteArticles ? 'true' : 'false'}`;const response=await fetch(url,{method:'DELETE'});const result=await response.json();if(!response.ok){showToast(result.error||'Failed to remove feed subscription','error');return;}
+showToast(deleteArticles?`Removed ${domain} and deleted ${result.deleted_articles || 0} related articles`:`Removed ${domain} subscription`,'success');await loadSubscriptions();await loadArticles();}catch(_error){showToast('Failed to remove feed subscription','error');}}
+function saveNotes(articleId,notes){setNotesSaveState('saving','Saving notes...');if(notesSaveTimeout[articleId]){clearTimeout(notesSaveTimeout[articleId]);}
+if(notesStatusResetTimeout){clearTimeout(notesStatusResetTimeout);}
+notesSaveTimeout[articleId]=setTimeout(async()=>{try{const response=await fetch(`/api/articles/${articleId}/curate`,{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({notes})});if(!response.ok)throw new Error('Failed to save notes');setNotesSaveState('saved','Saved');notesStatusResetTimeout=setTimeout(()=>{setNotesSaveState('idle','Notes auto-save as you type.');},1400);}catch(error){console.error('Failed to save notes:',error);setNotesSaveState('error','Save failed. Retrying on next edit.');}},500);}
+async function generateNewsletter(){const shortlistedCount=articles.shortlisted.length;if(shortlistedCount===0){showToast('No shortlisted articles to include','error');return;}
+showToast('Generating newsletter...','success');try{const response=await fetch('/api/generate-newsletter',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({})});const result=await response.json();if(result.running){showToast('Newsletter is still generating in the background','success');}else if(result.success){showToast(`Newsletter generated with ${result.article_count} articles`,'success');viewNewsletter(result.newsletter_id);}else{showToast(result.error||'Failed to generate newsletter','error');}}catch(error){showToast('Failed to generate newsletter','error');}}
+async function viewNewsletter(selectedWeek=null){const modal=document.getElementById('newsletter-modal');const listContainer=document.getElementById('newsletter-list');const content=document.getElementById('newsletter-content');modal.classList.add('active');listContainer.innerHTML='<h3>Past Newsletters</h3><div class="loading">Loading...</div>';try{const listResponse=await fetch('/api/newsletters');const listData=await listResponse.json();if(listData.newsletters.length===0){listContainer.innerHTML='<h3>Past Newsletters</h3><div class="empty-state"><p>No newsletters generated yet.</p></div>';content.innerHTML='<div class="empty-state"><p>Shortlist some articles and click "Generate Newsletter".</p></div>';return;}
+listContainer.innerHTML='<h3>Past Newsletters</h3>'+
+listData.newsletters.map(n=>`
+                        <div class="newsletter-item" data-id="${n.id}"
+                             onclick="loadNewsletterContent('${n.id}')">
+                            <span>${n.week}</span>
+                            <span style="font-size: 0.8rem; opacity: 0.7;">${new Date(n.generated_at).toLocaleString()}</span>
                         </div>
-                    `).join("");const r=e||a.newsletters[0].id;await re(r)}catch{t.innerHTML='<h3>Past Newsletters</h3><div class="empty-state"><p>Failed to load newsletters.</p></div>'}}async function re(e){const n=document.getElementById("newsletter-content");n.innerHTML='<div class="loading">Loading...</div>',document.querySelectorAll(".newsletter-item").forEach(t=>{t.classList.toggle("active",t.dataset.id===e)});try{const t=await fetch(`/api/newsletter/${e}`);if(t.ok){const s=await t.json();n.innerHTML=Ue(s.content)}else n.innerHTML='<div class="empty-state"><p>Newsletter not found.</p></div>'}catch{n.innerHTML='<div class="empty-state"><p>Failed to load newsletter.</p></div>'}}function ie(){document.getElementById("newsletter-modal").classList.remove("active")}function je(){document.getElementById("add-article-modal").classList.add("active"),document.getElementById("article-url").focus()}function ae(e){return[...y.pending,...y.shortlisted,...y.rejected].find(t=>t.id===e)}function L(e,n={}){const t=ae(e);if(!t){o("Article not found","error");return}const s=n.refreshQueue!==!1,i=n.animatedSwitch!==!1;if(p=e,s&&R({preserveScroll:!0,animate:!1}),i){const I=document.querySelector(".reader-panel");I&&(I.classList.remove("reader-switching"),I.offsetWidth,I.classList.add("reader-switching"),setTimeout(()=>I.classList.remove("reader-switching"),220))}const a=document.getElementById("reader-title"),r=document.getElementById("reader-meta"),c=document.getElementById("reader-open-link"),l=document.getElementById("reader-iframe"),u=document.getElementById("reader-notes-input"),v=document.getElementById("reader-reset"),pe=document.getElementById("reader-remove-feed"),C=document.getElementById("reader-top-pick"),T=t.status||"pending";a.textContent=t.title||"Article",r.innerHTML=`
-                <span>${m(t.source||"")}</span>
-                ${t.topic?`<span>Topic: ${m(t.topic)}</span>`:""}
-                <span>Status: ${m(T)}</span>
-            `,c.href=t.url,l.src=t.url,u.value=t.user_notes||"",u.oninput=()=>Re(e,u.value),E("idle","Notes auto-save as you type.");const H=document.getElementById("reader-shortlist"),O=document.getElementById("reader-reject");H.style.display=T==="shortlisted"?"none":"inline-flex",O.style.display=T==="rejected"?"none":"inline-flex",v.style.display=T==="pending"?"none":"inline-flex",C.style.display=T==="shortlisted"?"inline-flex":"none",C.classList.toggle("active",!!t.top_pick),H.onclick=async()=>{await $(e,"shortlisted")},O.onclick=async()=>{await $(e,"rejected")},v.onclick=async()=>{await $(e,"pending")},pe.onclick=async()=>{await se(e,!0)},C.onclick=async()=>{await ne(e,!t.top_pick)},F()}function ce(){document.getElementById("reader-title").textContent="Select an article",document.getElementById("reader-meta").innerHTML="",document.getElementById("reader-iframe").src="about:blank",document.getElementById("reader-notes-input").value="",document.getElementById("reader-open-link").removeAttribute("href"),E("idle","Notes auto-save as you type."),p=null,R({preserveScroll:!0,animate:!1}),F()}function q(){document.getElementById("add-article-modal").classList.remove("active"),document.getElementById("add-article-form").reset()}async function Ae(){const e=document.getElementById("article-url").value.trim();if(!e){o("Please enter a URL first","error");return}o("Fetching article metadata...","success");try{const t=await(await fetch("/api/fetch-url",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({url:e})})).json();t.success?(t.title&&(document.getElementById("article-title").value=t.title),t.summary&&(document.getElementById("article-summary").value=t.summary),o("Metadata fetched!","success")):o("Could not fetch metadata: "+(t.error||"Unknown error"),"error")}catch{o("Failed to fetch metadata","error")}}async function Me(e){e.preventDefault();const n=document.getElementById("article-url").value.trim(),t=document.getElementById("article-title").value.trim();if(!n||!t){o("URL and title are required","error");return}try{const i=await(await fetch("/api/articles/manual",{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify({url:n,title:t,summary:document.getElementById("article-summary").value.trim(),topic:document.getElementById("article-topic").value,notes:document.getElementById("article-notes").value.trim(),auto_shortlist:document.getElementById("article-shortlist").checked})})).json();i.success?(o("Article added successfully!","success"),q(),await h()):o(i.error||"Failed to add article","error")}catch{o("Failed to add article","error")}}function xe(e){if(P!=="articles"||e.metaKey||e.ctrlKey||e.altKey)return;const n=e.target;if(n&&["INPUT","TEXTAREA","SELECT"].includes(n.tagName))return;const t=_();if(!t.length)return;const s=t.findIndex(a=>a.id===p),i=s>=0?s:0;if(e.key==="j"||e.key==="J"){e.preventDefault();const a=Math.min(t.length-1,i+1);L(t[a].id);return}if(e.key==="k"||e.key==="K"){e.preventDefault();const a=Math.max(0,i-1);L(t[a].id);return}if(p){if(e.key==="s"||e.key==="S"){e.preventDefault(),$(p,"shortlisted");return}if(e.key==="r"||e.key==="R"){e.preventDefault(),$(p,"rejected");return}(e.key==="n"||e.key==="N")&&(e.preventDefault(),document.getElementById("reader-notes-input").focus())}}function D(e=new Date){const n=e.getFullYear(),t=String(e.getMonth()+1).padStart(2,"0"),s=String(e.getDate()).padStart(2,"0");return`${n}-${t}-${s}`}function le(e=new Date){const n=e.getFullYear(),t=String(e.getMonth()+1).padStart(2,"0");return`${n}-${t}`}function Ne(e){const n=Math.floor((e||0)/60),t=Math.floor(n/60),s=n%60;return t>0?`${t}h ${s}m`:`${s}m`}function De(){try{const e=localStorage.getItem(z);if(!e)return;const n=JSON.parse(e);f={monthly_seconds:n.monthly_seconds||{},daily_seconds:n.daily_seconds||{}}}catch{f={monthly_seconds:{},daily_seconds:{}}}}function Pe(){try{localStorage.setItem(z,JSON.stringify(f))}catch{}}function qe(){const e=new Date,n=new Date(e);n.setDate(e.getDate()-1);let t=(f.daily_seconds[D(e)]||0)>=Q?new Date(e):new Date(n),s=0;for(let i=0;i<366;i+=1){const a=D(t);if((f.daily_seconds[a]||0)<Q)break;s+=1,t.setDate(t.getDate()-1)}return s}function de(){const e=f.monthly_seconds[le()]||0,n=qe(),t=document.getElementById("metric-reading-time"),s=document.getElementById("metric-reading-streak");t&&(t.textContent=Ne(e)),s&&(s.textContent=String(n))}function He(e){if(!e||e<=0)return;const n=Math.min(e,20),t=le(),s=D();f.monthly_seconds[t]=(f.monthly_seconds[t]||0)+n,f.daily_seconds[s]=(f.daily_seconds[s]||0)+n,Pe(),de()}function ue(){if(!b){b=Date.now();return}const e=Date.now(),n=Math.round((e-b)/1e3);b=e,He(n)}function Oe(){B||(b=Date.now(),B=setInterval(ue,fe))}function me(){B&&(clearInterval(B),B=null,ue(),b=null)}function F(){P==="articles"&&!!p&&document.visibilityState==="visible"?Oe():me()}function E(e,n){const t=document.getElementById("notes-save-status");t&&(t.className=`notes-save-status ${e}`,t.textContent=n)}async function Qe(e,n){const t=document.querySelector(`.queue-item[data-article-id="${e}"]`);t&&(t.classList.remove("status-shift-shortlisted","status-shift-rejected","status-shift-pending"),t.classList.add(`status-shift-${n}`),await new Promise(s=>setTimeout(s,170)))}function Ue(e){return e?e.replace(/^### \[(.*?)\]\((.*?)\)/gm,'<h3><a href="$2" target="_blank">$1</a></h3>').replace(/^## (.*$)/gm,"<h2>$1</h2>").replace(/^# (.*$)/gm,"<h1>$1</h1>").replace(/\*\*(.*?)\*\*/g,"<strong>$1</strong>").replace(/\*(.*?)\*/g,"<em>$1</em>").replace(/^> (.*$)/gm,"<blockquote>$1</blockquote>").replace(/^- (.*$)/gm,"<li>$1</li>").replace(/(<li>.*<\/li>)/s,"<ul>$1</ul>").replace(/^---$/gm,"<hr>").replace(/\n\n/g,"</p><p>").replace(/\n/g,"<br>"):""}function m(e){const n=document.createElement("div");return n.textContent=e||"",n.innerHTML}function o(e,n="success"){const t=document.querySelector(".toast");t&&t.remove();const s=document.createElement("div");s.className=`toast ${n}`,s.textContent=e,document.body.appendChild(s),setTimeout(()=>s.remove(),3e3)}const J=document.getElementById("newsletter-modal");J&&J.addEventListener("click",e=>{e.target.classList.contains("modal")&&ie()});const K=document.getElementById("add-article-modal");K&&K.addEventListener("click",e=>{e.target.classList.contains("modal")&&q()});const G=document.getElementById("archives-modal");G&&G.addEventListener("click",e=>{e.target.classList.contains("modal")&&Z()});document.addEventListener("keydown",xe);document.addEventListener("visibilitychange",F);window.addEventListener("beforeunload",me);const M=document.getElementById("queue-list");M&&M.addEventListener("scroll",()=>{g[d]=M.scrollTop});window.archiveCurrentFolder=Se;window.archiveStatus=X;window.closeAddArticle=q;window.closeArchives=Z;window.closeModal=ie;window.closeReader=ce;window.curate=$;window.fetchMetadata=Ae;window.generateNewsletter=Ce;window.loadNewsletterContent=re;window.openAddArticle=je;window.openArchives=Te;window.onSubscriptionsSortChange=ge;window.openReader=L;window.pullFromFeeds=ke;window.removeFeedForArticle=se;window.removeSubscriptionByEncoded=Ee;window.saveSubscriptionByEncoded=we;window.setQueueStatus=Le;window.submitArticle=Me;window.switchView=ve;window.toggleTopPick=ne;window.unarchiveArticle=Be;window.viewNewsletter=oe;ye();
+                    `).join('');const idToLoad=selectedWeek||listData.newsletters[0].id;await loadNewsletterContent(idToLoad);}catch(error){listContainer.innerHTML='<h3>Past Newsletters</h3><div class="empty-state"><p>Failed to load newsletters.</p></div>';}}
+async function loadNewsletterContent(newsletterId){const content=document.getElementById('newsletter-content');content.innerHTML='<div class="loading">Loading...</div>';document.querySelectorAll('.newsletter-item').forEach(item=>{item.classList.toggle('active',item.dataset.id===newsletterId);});try{const response=await fetch(`/api/newsletter/${newsletterId}`);if(response.ok){const data=await response.json();content.innerHTML=markdownToHtml(data.content);}else{content.innerHTML='<div class="empty-state"><p>Newsletter not found.</p></div>';}}catch(error){content.innerHTML='<div class="empty-state"><p>Failed to load newsletter.</p></div>';}}
+function closeModal(){document.getElementById('newsletter-modal').classList.remove('active');}
+function openAddArticle(){document.getElementById('add-article-modal').classList.add('active');document.getElementById('article-url').focus();}
+function findArticleById(articleId){const all=[...articles.pending,...articles.shortlisted,...articles.rejected];return all.find(article=>article.id===articleId);}
+async function loadClusterSources(articleId,metaEl){try{const response=await fetch(`/api/articles/${articleId}/cluster`);if(!response.ok)return;const data=await response.json();if(activeReaderArticleId!==articleId)return;const span=document.createElement('span');span.append('Also from: ');data.articles.filter(item=>item.id!==articleId).forEach((item,idx)=>{if(idx)span.append(', ');const link=document.createElement('a');link.href=item.url;link.target='_blank';link.rel='noopener';link.title=item.title||'';link.textContent=item.source||item.url;span.append(link);});metaEl.append(span);}catch(error){console.error('Failed to load similar articles:',error);}}
+async function loadRelatedArticles(articleId,metaEl){try{const response=await fetch(`/api/articles/${articleId}/similar?limit=5`);if(!response.ok)return;const data=await response.json();if(activeReaderArticleId!==articleId||!data.articles.length)return;const span=document.createElement('span');span.append('Related: ');data.articles.forEach((item,idx)=>{if(idx)span.append(' · ');const link=document.createElement('a');link.href=item.url;link.target='_blank';link.rel='noopener';link.title=`${item.source || ''} (${item.archived ? 'archived' : item.status || 'pending'})`;const title=item.title||item.url;link.textContent=title.length>60?`${title.slice(0, 57)}...`:title;span.append(link);});metaEl.append(span);}catch(error){console.error('Failed to load related articles:',error);}}
+function openReader(articleId,options={}){const article=findArticleById(articleId);if(!article){showToast('Article not found','error');return;}
+const refreshQueue=options.refreshQueue!==false;const animatedSwitch=options.animatedSwitch!==false;activeReaderArticleId=articleId;if(refreshQueue){renderQueue({preserveScroll:true,animate:false});}
+if(animatedSwitch){const readerPanel=document.querySelector('.reader-panel');if(readerPanel){readerPanel.classList.remove('reader-switching');void readerPanel.offsetWidth;readerPanel.classList.add('reader-switching');setTimeout(()=>readerPanel.classList.remove('reader-switching'),220);}}
+const titleEl=document.getElementById('reader-title');const metaEl=document.getElementById('reader-meta');const openLink=document.getElementById('reader-open-link');const iframe=document.getElementById('reader-iframe');const notesInput=document.getElementById('reader-notes-input');const resetBtn=document.getElementById('reader-reset');const removeFeedBtn=document.getElementById('reader-remove-feed');const topPickBtn=document.getElementById('reader-top-pick');const currentStatus=article.status||'pending';titleEl.textContent=article.title||'Article';metaEl.innerHTML=`
+                <span>${escapeHtml(article.source || '')}</span>
+                ${article.topic ? `<span>Topic:${escapeHtml(article.topic)}</span>` : ''}
+                <span>Status: ${escapeHtml(currentStatus)}</span>
+            `;if(article.cluster_size){loadClusterSources(articleId,metaEl);}
+loadRelatedArticles(articleId,metaEl);openLink.href=article.url;iframe.src=article.url;notesInput.value=article.user_notes||'';notesInput.oninput=()=>saveNotes(articleId,notesInput.value);setNotesSaveState('idle','Notes auto-save as you type.');const shortlistBtn=document.getElementById('reader-shortlist');const rejectBtn=document.getElementById('reader-reject');shortlistBtn.style.display=currentStatus==='shortlisted'?'none':'inline-flex';rejectBtn.style.display=currentStatus==='rejected'?'none':'inline-flex';resetBtn.style.display=currentStatus==='pending'?'none':'inline-flex';topPickBtn.style.display=currentStatus==='shortlisted'?'inline-flex':'none';topPickBtn.classList.toggle('active',!!article.top_pick);shortlistBtn.onclick=async()=>{await curate(articleId,'shortlisted');};rejectBtn.onclick=async()=>{await curate(articleId,'rejected');};resetBtn.onclick=async()=>{await curate(articleId,'pending');};removeFeedBtn.onclick=async()=>{await removeFeedForArticle(articleId,true);};topPickBtn.onclick=async()=>{await toggleTopPick(articleId,!article.top_pick);};updateReadingTrackerState();}
+function closeReader(){document.getElementById('reader-title').textContent='Select an article';document.getElementById('reader-meta').innerHTML='';document.getElementById('reader-iframe').src='about:blank';document.getElementById('reader-notes-input').value='';document.getElementById('reader-open-link').removeAttribute('href');setNotesSaveState('idle','Notes auto-save as you type.');activeReaderArticleId=null;renderQueue({preserveScroll:true,animate:false});updateReadingTrackerState();}
+function closeAddArticle(){document.getElementById('add-article-modal').classList.remove('active');document.getElementById('add-article-form').reset();}
+async function fetchMetadata(){const url=document.getElementById('article-url').value.trim();if(!url){showToast('Please enter a URL first','error');return;}
+showToast('Fetching article metadata...','success');try{const response=await fetch('/api/fetch-url',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({url})});const data=await response.json();if(data.success){if(data.title){document.getElementById('article-title').value=data.title;}
+if(data.summary){document.getElementById('article-summary').value=data.summary;}
+showToast('Metadata fetched!','success');}else{showToast('Could not fetch metadata: '+(data.error||'Unknown error'),'error');}}catch(error){showToast('Failed to fetch metadata','error');}}
+async function submitArticle(event){event.preventDefault();const url=document.getElementById('article-url').value.trim();const title=document.getElementById('article-title').value.trim();if(!url||!title){showToast('URL and title are required','error');return;}
+try{const response=await fetch('/api/articles/manual',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({url:url,title:title,summary:document.getElementById('article-summary').value.trim(),topic:document.getElementById('article-topic').value,notes:document.getElementById('article-notes').value.trim(),auto_shortlist:document.getElementById('article-shortlist').checked})});const result=await response.json();if(result.success){showToast('Article added successfully!','success');closeAddArticle();await loadArticles();}else{showToast(result.error||'Failed to add article','error');}}catch(error){showToast('Failed to add article','error');}}
+async function migrateData(){try{const response=await fetch('/api/migrate',{method:'POST'});const result=await response.json();if(result.success){showToast(`Migrated ${result.migrated} articles`,'success');await loadArticles();}else{showToast('Migration failed','error');}}catch(error){showToast('Migration failed','error');}}
+function handleQueueKeyboardShortcuts(event){if(activeView!=='articles')return;if(event.metaKey||event.ctrlKey||event.altKey)return;const target=event.target;if(target&&['INPUT','TEXTAREA','SELECT'].includes(target.tagName))return;const items=getQueueItems();if(!items.length)return;const currentIndex=items.findIndex(item=>item.id===activeReaderArticleId);const safeIndex=currentIndex>=0?currentIndex:0;if(event.key==='j'||event.key==='J'){event.preventDefault();const nextIndex=Math.min(items.length-1,safeIndex+1);openReader(items[nextIndex].id);return;}
+if(event.key==='k'||event.key==='K'){event.preventDefault();const prevIndex=Math.max(0,safeIndex-1);openReader(items[prevIndex].id);return;}
+if(!activeReaderArticleId)return;if(event.key==='s'||event.key==='S'){event.preventDefault();curate(activeReaderArticleId,'shortlisted');return;}
+if(event.key==='r'||event.key==='R'){event.preventDefault();curate(activeReaderArticleId,'rejected');return;}
+if(event.key==='n'||event.key==='N'){event.preventDefault();document.getElementById('reader-notes-input').focus();}}
+function getTodayKey(date=new Date()){const year=date.getFullYear();const month=String(date.getMonth()+1).padStart(2,'0');const day=String(date.getDate()).padStart(2,'0');return`${year}-${month}-${day}`;}
+function getMonthKey(date=new Date()){const year=date.getFullYear();const month=String(date.getMonth()+1).padStart(2,'0');return`${year}-${month}`;}
+function formatReadingDuration(seconds){const totalMinutes=Math.floor((seconds||0)/60);const hours=Math.floor(totalMinutes/60);const minutes=totalMinutes%60;if(hours>0){return`${hours}h ${minutes}m`;}
+return`${minutes}m`;}
+function loadReadingMetrics(){try{const raw=localStorage.getItem(READING_METRICS_KEY);if(!raw)return;const parsed=JSON.parse(raw);readingMetrics={monthly_seconds:parsed.monthly_seconds||{},daily_seconds:parsed.daily_seconds||{},};}catch(_error){readingMetrics={monthly_seconds:{},daily_seconds:{}};}}
+function saveReadingMetrics(){try{localStorage.setItem(READING_METRICS_KEY,JSON.stringify(readingMetrics));}catch(_error){}}
+function computeReadingStreakDays(){const today=new Date();const yesterday=new Date(today);yesterday.setDate(today.getDate()-1);let cursor=(readingMetrics.daily_seconds[getTodayKey(today)]||0)>=READING_STREAK_THRESHOLD_SECONDS?new Date(today):new Date(yesterday);let streak=0;for(let i=0;i<366;i+=1){const key=getTodayKey(cursor);const seconds=readingMetrics.daily_seconds[key]||0;if(seconds<READING_STREAK_THRESHOLD_SECONDS)break;streak+=1;cursor.setDate(cursor.getDate()-1);}
+return streak;}
+function renderReadingMetrics(){const monthSeconds=readingMetrics.monthly_seconds[getMonthKey()]||0;const streakDays=computeReadingStreakDays();const monthEl=document.getElementById('metric-reading-time');const streakEl=document.getElementById('metric-reading-streak');if(monthEl)monthEl.textContent=formatReadingDuration(monthSeconds);if(streakEl)streakEl.textContent=String(streakDays);}
+function addReadingSeconds(seconds){if(!seconds||seconds<=0)return;const clamped=Math.min(seconds,20);const monthKey=getMonthKey();const dayKey=getTodayKey();readingMetrics.monthly_seconds[monthKey]=(readingMetrics.monthly_seconds[monthKey]||0)+clamped;readingMetrics.daily_seconds[dayKey]=(readingMetrics.daily_seconds[dayKey]||0)+clamped;saveReadingMetrics();renderReadingMetrics();}
+function onReadingTick(){if(!readingLastTickAt){readingLastTickAt=Date.now();return;}
+const now=Date.now();const elapsed=Math.round((now-readingLastTickAt)/1000);readingLastTickAt=now;addReadingSeconds(elapsed);}
+function startReadingTracker(){if(readingTicker)return;readingLastTickAt=Date.now();readingTicker=setInterval(onReadingTick,READING_TICK_MS);}
+function stopReadingTracker(){if(!readingTicker)return;clearInterval(readingTicker);readingTicker=null;onReadingTick();readingLastTickAt=null;}
+function updateReadingTrackerState(){const shouldTrack=activeView==='articles'&&!!activeReaderArticleId&&document.visibilityState==='visible';if(shouldTrack){startReadingTracker();}else{stopReadingTracker();}}
+function setNotesSaveState(state,message){const statusEl=document.getElementById('notes-save-status');if(!statusEl)return;statusEl.className=`notes-save-status ${state}`;statusEl.textContent=message;}
+async function animateStatusTransition(articleId,status){const item=document.querySelector(`.queue-item[data-article-id="${articleId}"]`);if(!item)return;item.classList.remove('status-shift-shortlisted','status-shift-rejected','status-shift-pending');item.classList.add(`status-shift-${status}`);await new Promise(resolve=>setTimeout(resolve,170));}
+function markdownToHtml(markdown){if(!markdown)return'';return markdown.replace(/^### \[(.*?)\]\((.*?)\)/gm,'<h3><a href="$2" target="_blank">$1</a></h3>').replace(/^## (.*$)/gm,'<h2>$1</h2>').replace(/^# (.*$)/gm,'<h1>$1</h1>').replace(/\*\*(.*?)\*\*/g,'<strong>$1</strong>').replace(/\*(.*?)\*/g,'<em>$1</em>').replace(/^> (.*$)/gm,'<blockquote>$1</blockquote>').replace(/^- (.*$)/gm,'<li>$1</li>').replace(/(<li>.*<\/li>)/s,'<ul>$1</ul>').replace(/^---$/gm,'<hr>').replace(/\n\n/g,'</p><p>').replace(/\n/g,'<br>');}
+function escapeHtml(text){const div=document.createElement('div');div.textContent=text||'';return div.innerHTML;}
+function showToast(message,type='success'){const existing=document.querySelector('.toast');if(existing)existing.remove();const toast=document.createElement('div');toast.className=`toast ${type}`;toast.textContent=message;document.body.appendChild(toast);setTimeout(()=>toast.remove(),3000);}
+const newsletterModal=document.getElementById('newsletter-modal');if(newsletterModal){newsletterModal.addEventListener('click',(e)=>{if(e.target.classList.contains('modal'))closeModal();});}
+const addModal=document.getElementById('add-article-modal');if(addModal){addModal.addEventListener('click',(e)=>{if(e.target.classList.contains('modal'))closeAddArticle();});}
+const archivesModal=document.getElementById('archives-modal');if(archivesModal){archivesModal.addEventListener('click',(e)=>{if(e.target.classList.contains('modal'))closeArchives();});}
+document.addEventListener('keydown',handleQueueKeyboardShortcuts);document.addEventListener('visibilitychange',updateReadingTrackerState);window.addEventListener('beforeunload',stopReadingTracker);const queueList=document.getElementById('queue-list');if(queueList){queueList.addEventListener('scroll',()=>{queueScrollTopByStatus[activeQueueStatus]=queueList.scrollTop;if(queueList.scrollTop+queueList.clientHeight>=queueList.scrollHeight-200){loadMoreArticles(activeQueueStatus);}});}
+window.archiveCurrentFolder=archiveCurrentFolder;window.archiveStatus=archiveStatus;window.closeAddArticle=closeAddArticle;window.closeArchives=closeArchives;window.closeModal=closeModal;window.closeReader=closeReader;window.curate=curate;window.fetchMetadata=fetchMetadata;window.generateNewsletter=generateNewsletter;window.loadNewsletterContent=loadNewsletterContent;window.openAddArticle=openAddArticle;window.openArchives=openArchives;window.onSubscriptionsSortChange=onSubscriptionsSortChange;window.onQueueSortChange=onQueueSortChange;window.openReader=openReader;window.pullFromFeeds=pullFromFeeds;window.removeFeedForArticle=removeFeedForArticle;window.removeSubscriptionByEncoded=removeSubscriptionByEncoded;window.saveSubscriptionByEncoded=saveSubscriptionByEncoded;window.setQueueStatus=setQueueStatus;window.submitArticle=submitArticle;window.switchView=switchView;window.toggleTopPick=toggleTopPick;window.unarchiveArticle=unarchiveArticle;window.viewNewsletter=viewNewsletter;init();
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Local curation-preference model: hashed TF-IDF features and logistic
+regression in NumPy, trained on shortlisted (liked) vs rejected articles.
+
+Each article becomes a sparse vector of hashed title/summary words, word
+pairs and its source (2**PREFERENCE_FEATURE_BITS buckets, sublinear TF times
+IDF, L2-normalised). Vectors for a whole batch are kept as coordinate arrays,
+so training and scoring are a few NumPy bincounts over all articles at once,
+with no per-article Python loop beyond tokenizing.
+
+refresh() keeps the model current: when the set of curation decisions has
+changed since the stored model was trained, it retrains starting from the
+stored weights (a short update rather than a fit from scratch), then scores
+every pending article without a score from the current model and stores the
+probabilities in article_preferences for /api/articles?sort=preference.
+No network calls, so it runs after every sync.
+
+Usage:
+    python preference.py            # Retrain if curation changed, score pending articles
+    python preference.py --retrain  # Fit from scratch
+"""
+import argparse
+import re
+import threading
+import zlib
+from datetime import datetime
+from typing import Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+import config
+import db
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# One refresh at a time per process (sync thread and API requests)
+_refresh_lock = threading.Lock()
+
+
+def _feature_indices(article: dict, mask: int) -> list[int]:
+    """Hashed features of an article (repeated for repeated terms)."""
+    tokens = _TOKEN_RE.findall(f"{article.get('title') or ''} {article.get('summary') or ''}".lower())
+    terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    source = (article.get("source") or "").lower()
+    if source:
+        terms.append(f"source:{source}")
+    return [zlib.crc32(term.encode()) & mask for term in terms]
+
+
+def _term_counts(articles: list[dict], dim: int):
+    """(rows, cols, counts) coordinate arrays of term counts, one row per article."""
+    rows, cols = [], []
+    for index, article in enumerate(articles):
+        features = _feature_indices(article, dim - 1)
+        rows.extend([index] * len(features))
+        cols.extend(features)
+    keys, counts = np.unique(np.array(rows, dtype=np.int64) * dim + np.array(cols, dtype=np.int64),
+                             return_counts=True)
+    return keys // dim, keys % dim, counts.astype(np.float64)
+
+
+def _tfidf(rows, cols, counts, idf, n_rows: int):
+    """Sublinear TF-IDF values for the coordinates, L2-normalised per row."""
+    values = (1.0 + np.log(counts)) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=n_rows))
+    norms[norms == 0] = 1.0
+    return values / norms[rows]
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30.0, 30.0)))
+
+
+def train(examples: list[dict], previous: Optional[dict] = None) -> dict:
+    """
+    Fit the model on examples (dicts with title, summary, source and label
+    1 = shortlisted, 0 = rejected). With a previous model of the same size,
+    start from its weights and run PREFERENCE_UPDATE_EPOCHS instead of
+    PREFERENCE_TRAIN_EPOCHS. Classes are weighted equally however unbalanced.
+    Returns {"weights", "bias", "idf", "examples"}.
+    """
+    dim = 1 << config.PREFERENCE_FEATURE_BITS
+    n = len(examples)
+    labels = np.array([example["label"] for example in examples], dtype=np.float64)
+    rows, cols, counts = _term_counts(examples, dim)
+
+    doc_freq = np.bincount(cols, minlength=dim)
+    idf = np.log((1.0 + n) / (1.0 + doc_freq)) + 1.0
+    values = _tfidf(rows, cols, counts, idf, n)
+
+    positive = labels.mean()
+    sample_weights = np.where(labels == 1, 0.5 / positive, 0.5 / (1.0 - positive)) / n
+
+    if previous is not None and len(previous["weights"]) == dim:
+        weights = previous["weights"].astype(np.float64)
+        bias = previous["bias"]
+        epochs = config.PREFERENCE_UPDATE_EPOCHS
+    else:
+        weights = np.zeros(dim)
+        bias = 0.0
+        epochs = config.PREFERENCE_TRAIN_EPOCHS
+
+    rate, l2 = config.PREFERENCE_LEARNING_RATE, config.PREFERENCE_L2
+    for _ in range(epochs):
+        predictions = _sigmoid(np.bincount(rows, weights=weights[cols] * values, minlength=n) + bias)
+        errors = (predictions - labels) * sample_weights
+        gradient = np.bincount(cols, weights=errors[rows] * values, minlength=dim) + l2 * weights
+        weights -= rate * gradient
+        bias -= rate * errors.sum()
+
+    return {"weights": weights.astype(np.float32), "bias": float(bias),
+            "idf": idf.astype(np.float32), "examples": n}
+
+
+def predict(model: dict, articles: list[dict]):
+    """Probability (0-1) that the curator shortlists each article, as an array."""
+    if not articles:
+        return np.zeros(0)
+    dim = len(model["weights"])
+    rows, cols, counts = _term_counts(articles, dim)
+    values = _tfidf(rows, cols, counts, model["idf"].astype(np.float64), len(articles))
+    weights = model["weights"].astype(np.float64)
+    return _sigmoid(np.bincount(rows, weights=weights[cols] * values, minlength=len(articles))
+                    + model["bias"])
+
+
+def _load_model() -> Optional[dict]:
+    stored = db.get_preference_model()
+    if stored is None:
+        return None
+    return {
+        "weights": np.frombuffer(stored["weights"], dtype=np.float32),
+        "bias": stored["bias"],
+        "idf": np.frombuffer(stored["idf"], dtype=np.float32),
+        "examples": stored["examples"],
+        "fingerprint": stored["fingerprint"],
+        "trained_at": stored["trained_at"],
+    }
+
+
+def refresh(retrain: bool = False, verbose: bool = True) -> dict:
+    """
+    Retrain if curation decisions changed (or with retrain, from scratch),
+    then score pending articles lacking a score from the current model.
+    Returns {"trained": bool, "examples": n, "scored": n}. Does nothing until
+    NumPy is installed and there are PREFERENCE_MIN_EXAMPLES decisions of
+    each kind.
+    """
+    result = {"trained": False, "examples": 0, "scored": 0}
+    if not NUMPY_AVAILABLE:
+        if verbose:
+            print("  Skipping preference model: numpy is not installed")
+        return result
+
+    with _refresh_lock:
+        model = _load_model()
+        fingerprint = db.get_curation_fingerprint()
+
+        if retrain or model is None or model["fingerprint"] != fingerprint:
+            examples = db.get_preference_training_examples()
+            positives = sum(example["label"] for example in examples)
+            if min(positives, len(examples) - positives) < config.PREFERENCE_MIN_EXAMPLES:
+                if verbose:
+                    print(f"  Preference model needs {config.PREFERENCE_MIN_EXAMPLES} shortlisted and "
+                          f"rejected articles ({positives} and {len(examples) - positives} so far)")
+                return result
+            model = train(examples, previous=None if retrain else model)
+            model["fingerprint"] = fingerprint
+            model["trained_at"] = datetime.now().isoformat()
+            db.save_preference_model(
+                weights=model["weights"].tobytes(),
+                bias=model["bias"],
+                idf=model["idf"].tobytes(),
+                examples=model["examples"],
+                fingerprint=fingerprint,
+                trained_at=model["trained_at"],
+            )
+            result["trained"] = True
+
+        result["examples"] = model["examples"]
+        articles = db.get_articles_for_preference(model["trained_at"])
+        probabilities = predict(model, articles)
+        db.save_article_preferences([
+            {"article_id": article["id"], "score": float(probability),
+             "model_trained_at": model["trained_at"]}
+            for article, probability in zip(articles, probabilities)
+        ])
+        result["scored"] = len(articles)
+
+    if verbose:
+        trained = f"retrained on {result['examples']} decisions, " if result["trained"] else ""
+        print(f"  Preference model: {trained}scored {result['scored']} pending articles")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train the local curation-preference model and score pending articles."
+    )
+    parser.add_argument(
+        "--retrain",
+        action="store_true",
+        help="Fit from scratch instead of updating the stored model",
+    )
+    args = parser.parse_args()
+
+    refresh(retrain=args.retrain)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,17 +8,29 @@ fetching articles since the last run. Duplicates are avoided by URL-based dedup.
 """
 import argparse
 import json
+import multiprocessing
 import sys
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait,
+)
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Iterator, Mapping, Optional
 from urllib.parse import urljoin, urlparse
 
-import feedparser
-import requests
 from bs4 import BeautifulSoup
 
 import config
 import db
+import embeddings
+import feed_parser
+import feed_scheduler
+import feed_stream
+import http_client
+import llm
+import preference
+import scoring
+import topic_classifier
 
 
 def load_crawl_results() -> dict:
@@ -56,18 +68,13 @@ def extract_domains_from_crawl(crawl_data: dict) -> set[str]:
 
 
 def load_feeds_cache() -> dict:
-    """Load the feeds cache file."""
-    try:
-        with open(config.FEEDS_CACHE_FILE, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+    """Load the feeds cache ({domain: entry}) from the database."""
+    return db.get_feeds()
 
 
-def save_feeds_cache(cache: dict) -> None:
-    """Save the feeds cache file."""
-    with open(config.FEEDS_CACHE_FILE, "w") as f:
-        json.dump(cache, f, indent=2)
+def save_feeds_cache(cache: dict, domains) -> None:
+    """Persist the feeds cache entries for the given domains (per-row upserts)."""
+    db.upsert_feeds({domain: cache[domain] for domain in domains if domain in cache})
 
 
 def discover_rss_from_html(url: str) -> Optional[str]:
@@ -76,8 +83,7 @@ def discover_rss_from_html(url: str) -> Optional[str]:
     <link rel="alternate" type="application/rss+xml"> or similar.
     """
     try:
-        headers = {"User-Agent": config.USER_AGENT}
-        response = requests.get(url, headers=headers, timeout=config.REQUEST_TIMEOUT)
+        response = http_client.probe(url)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, "html.parser")
@@ -97,47 +103,125 @@ def discover_rss_from_html(url: str) -> Optional[str]:
         return None
 
 
-def try_rss_patterns(domain: str) -> Optional[str]:
-    """Try common RSS URL patterns for a domain."""
+def _pattern_hit_counts(cache: dict) -> dict[str, int]:
+    """Count how many cached feeds were found at each RSS_PATTERNS path."""
+    counts = {pattern: 0 for pattern in config.RSS_PATTERNS}
+    # Snapshot values: parallel discovery may add entries while we iterate
+    for entry in list(cache.values()):
+        path = urlparse((entry or {}).get("feed_url") or "").path
+        if path in counts:
+            counts[path] += 1
+    return counts
+
+
+def _probe_feed_url(feed_url: str) -> Optional[str]:
+    """
+    Fetch only the first bytes of a candidate URL (ranged, streamed GET) and
+    return the URL if it looks like an RSS/Atom feed.
+    """
+    try:
+        response = http_client.probe(
+            feed_url,
+            headers={"Range": f"bytes=0-{config.DISCOVERY_PROBE_BYTES - 1}"},
+            allow_redirects=True,
+            stream=True,
+        )
+        try:
+            # 206 when the server honours the range, 200 when it ignores it
+            if response.status_code not in (200, 206):
+                return None
+
+            # Verify it's actually a feed
+            content_type = response.headers.get("content-type", "").lower()
+            head = next(response.iter_content(config.DISCOVERY_PROBE_BYTES), b"")
+            content_start = head[:500].decode("utf-8", errors="ignore").lower()
+        finally:
+            response.close()
+
+        if any(x in content_type for x in ["xml", "rss", "atom"]) or \
+           any(x in content_start for x in ["<rss", "<feed", "<atom", "<?xml"]):
+            return feed_url
+    except Exception:
+        pass
+    return None
+
+
+def try_rss_patterns(domain: str, cache: Optional[dict] = None) -> Optional[str]:
+    """
+    Try common RSS URL patterns for a domain.
+
+    Candidates are probed concurrently, ordered by each pattern's historical
+    hit rate across the feeds cache. The first verified feed wins and the
+    remaining probes are cancelled.
+    """
     base_urls = [f"https://{domain}", f"https://www.{domain}"]
+    hit_counts = _pattern_hit_counts(cache or {})
+    patterns = sorted(config.RSS_PATTERNS, key=lambda pattern: -hit_counts[pattern])
+    candidates = [base_url + pattern for pattern in patterns for base_url in base_urls]
 
-    for base_url in base_urls:
-        for pattern in config.RSS_PATTERNS:
-            feed_url = base_url + pattern
-            try:
-                headers = {"User-Agent": config.USER_AGENT}
-                response = requests.get(
-                    feed_url,
-                    headers=headers,
-                    timeout=config.REQUEST_TIMEOUT,
-                    allow_redirects=True
-                )
-
-                if response.status_code == 200:
-                    # Verify it's actually a feed
-                    content_type = response.headers.get("content-type", "").lower()
-                    content_start = response.text[:500].lower()
-
-                    if any(x in content_type for x in ["xml", "rss", "atom"]) or \
-                       any(x in content_start for x in ["<rss", "<feed", "<atom", "<?xml"]):
-                        return feed_url
-            except Exception:
-                continue
+    executor = ThreadPoolExecutor(max_workers=max(1, config.DISCOVERY_PROBE_WORKERS))
+    try:
+        futures = [executor.submit(_probe_feed_url, url) for url in candidates]
+        for future in as_completed(futures):
+            feed_url = future.result()
+            if feed_url:
+                return feed_url
+    finally:
+        # Don't wait on in-flight probes once we have an answer
+        executor.shutdown(wait=False, cancel_futures=True)
 
     return None
 
 
+def is_negative_cache_expired(entry: dict, now: Optional[datetime] = None) -> bool:
+    """Check whether a no_feed cache entry is due for another discovery attempt."""
+    now = now or datetime.now()
+    try:
+        if entry.get("retry_after"):
+            return now >= datetime.fromisoformat(entry["retry_after"])
+        # Legacy entries (no retry schedule): treat as a single failed attempt
+        if entry.get("checked_at"):
+            checked_at = datetime.fromisoformat(entry["checked_at"])
+            return now >= checked_at + timedelta(hours=config.NO_FEED_RETRY_HOURS)
+    except ValueError:
+        pass
+    return True
+
+
+def _no_feed_entry(previous: Optional[dict]) -> dict:
+    """
+    Build a negative cache entry, backing off exponentially from
+    NO_FEED_RETRY_HOURS up to NO_FEED_RETRY_MAX_DAYS per failed attempt.
+    """
+    attempts = 1
+    if previous and previous.get("no_feed"):
+        attempts = int(previous.get("attempts") or 1) + 1
+
+    now = datetime.now()
+    delay = min(
+        timedelta(hours=config.NO_FEED_RETRY_HOURS) * 2 ** min(attempts - 1, 16),
+        timedelta(days=config.NO_FEED_RETRY_MAX_DAYS),
+    )
+    return {
+        "no_feed": True,
+        "checked_at": now.isoformat(),
+        "attempts": attempts,
+        "retry_after": (now + delay).isoformat(),
+    }
+
+
 def discover_rss_feed(domain: str, cache: dict) -> Optional[str]:
     """
     Discover RSS feed URL for a domain.
     Uses cache if available, otherwise tries discovery methods.
+    Negative (no_feed) entries are retried once their backoff has expired.
     """
     # Check cache first
     if domain in cache:
         cached = cache[domain]
         if cached.get("feed_url"):
             return cached["feed_url"]
-        elif cached.get("no_feed"):
+        elif cached.get("no_feed") and not is_negative_cache_expired(cached):
             return None
 
     print(f"  Discovering feed for {domain}...")
@@ -152,118 +236,289 @@ def discover_rss_feed(domain: str, cache: dict) -> Optional[str]:
 
     if not feed_url:
         # Try common patterns
-        feed_url = try_rss_patterns(domain)
+        feed_url = try_rss_patterns(domain, cache)
 
     # Update cache
     if feed_url:
         cache[domain] = {"feed_url": feed_url, "discovered_at": datetime.now().isoformat()}
     else:
-        cache[domain] = {"no_feed": True, "checked_at": datetime.now().isoformat()}
+        cache[domain] = _no_feed_entry(cache.get(domain))
 
     return feed_url
 
 
-def parse_feed(feed_url: str, cutoff_date: Optional[datetime] = None) -> list[dict]:
-    """Parse an RSS feed and return items published on or after cutoff_date."""
-    try:
-        # Use requests with timeout so a single slow feed cannot hang manual sync.
-        headers = {"User-Agent": config.USER_AGENT}
-        response = requests.get(feed_url, headers=headers, timeout=config.REQUEST_TIMEOUT)
-        response.raise_for_status()
-        feed = feedparser.parse(response.content)
+def discover_feeds(domains: list[str], cache: dict, workers: int = 0) -> dict[str, str]:
+    """
+    Run feed discovery for several domains in parallel (DISCOVERY_WORKERS).
+    Updates the cache in place and returns {domain: feed_url} for hits.
+    """
+    workers = workers or config.DISCOVERY_WORKERS
+    found = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(discover_rss_feed, domain, cache): domain for domain in domains}
+        for future in as_completed(futures):
+            feed_url = future.result()
+            if feed_url:
+                found[futures[future]] = feed_url
+
+    return found
+
+
+def _conditional_headers(feed_url: str, cache_entry: Optional[dict]) -> dict:
+    """Build If-None-Match/If-Modified-Since headers from cached validators."""
+    headers = {}
+    if not cache_entry or cache_entry.get("feed_url") != feed_url:
+        return headers
+    if cache_entry.get("etag"):
+        headers["If-None-Match"] = cache_entry["etag"]
+    if cache_entry.get("last_modified"):
+        headers["If-Modified-Since"] = cache_entry["last_modified"]
+    return headers
+
+
+def _store_validators(headers: Mapping[str, str], cache_entry: Optional[dict]) -> None:
+    """Remember a response's ETag/Last-Modified validators in the cache entry."""
+    if cache_entry is None:
+        return
+    for header, key in (("ETag", "etag"), ("Last-Modified", "last_modified")):
+        value = headers.get(header)
+        if value:
+            cache_entry[key] = value
+        else:
+            cache_entry.pop(key, None)
 
-        if feed.bozo and not feed.entries:
-            return []
 
+def parse_feed(feed_url: str, cutoff_date: Optional[datetime] = None,
+               cache_entry: Optional[dict] = None, raise_errors: bool = False) -> list[dict]:
+    """
+    Fetch and parse an RSS feed in the calling thread, returning items
+    published on or after cutoff_date.
+
+    With FEED_STREAM_PARSE, the body is parsed incrementally as it downloads
+    and reading stops once a reverse-chronological feed reaches entries older
+    than the cutoff (see feed_stream); feeds it can't handle fall back to
+    feedparser on the full body.
+
+    If cache_entry (the feed's feeds-cache entry) is given, the request is made
+    conditional on its stored ETag/Last-Modified validators; a 304 response
+    returns no items without parsing, and fresh validators are written back,
+    along with the feed's observed publishing cadence (see feed_scheduler).
+    Errors are logged and yield no items unless raise_errors is set.
+    """
+    try:
         if cutoff_date is None:
             cutoff_date = datetime.now() - timedelta(days=config.DAYS_LOOKBACK)
 
-        items = []
-
-        for entry in feed.entries[:config.MAX_FEED_ITEMS]:
-            # Parse publication date
-            pub_date = None
-            for date_field in ["published_parsed", "updated_parsed", "created_parsed"]:
-                if hasattr(entry, date_field) and getattr(entry, date_field):
-                    try:
-                        pub_date = datetime(*getattr(entry, date_field)[:6])
-                        break
-                    except Exception:
-                        continue
-
-            # Skip old items (include items with no date to avoid missing content)
-            if pub_date is not None and pub_date < cutoff_date:
-                continue
-
-            # Extract summary/description
-            summary = ""
-            if hasattr(entry, "summary"):
-                summary = entry.summary
-            elif hasattr(entry, "description"):
-                summary = entry.description
-            elif hasattr(entry, "content") and entry.content:
-                summary = entry.content[0].get("value", "")
-
-            # Clean HTML from summary
-            if summary:
-                soup = BeautifulSoup(summary, "html.parser")
-                summary = soup.get_text(separator=" ", strip=True)[:500]
-
-            items.append({
-                "title": getattr(entry, "title", "Untitled"),
-                "url": getattr(entry, "link", ""),
-                "summary": summary,
-                "published": pub_date.isoformat() if pub_date else None,
-                "source": urlparse(feed_url).netloc,
-            })
-
+        # Shared client applies a timeout so a single slow feed cannot hang manual sync.
+        headers = _conditional_headers(feed_url, cache_entry)
+        with http_client.get(feed_url, headers=headers, stream=config.FEED_STREAM_PARSE) as response:
+            if response.status_code == 304:
+                return []
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=config.FEED_STREAM_CHUNK_BYTES)
+            entries = feed_parser.stream_entries(chunks, cutoff_date)
+
+        items, published = feed_parser.entries_to_items(entries, feed_url, cutoff_date)
+        # Only once the items are built: a saved validator turns the next poll into a 304
+        _store_validators(response.headers, cache_entry)
+        if cache_entry is not None:
+            feed_scheduler.observe_items(cache_entry, published)
         return items
     except Exception as e:
         print(f"  Error parsing feed {feed_url}: {e}")
+        if raise_errors:
+            raise
         return []
 
 
-def run_sync(cron_mode: bool = False, skip_discovery: bool = False,
-             limit_domains: int = 0, verbose: bool = True) -> int:
+def _fetch_feed_body(feed_url: str, cache_entry: Optional[dict],
+                     cutoff_date: datetime) -> Optional[tuple[bytes, dict]]:
     """
-    Run the RSS sync: load feeds, parse, store in DB.
-    Returns the number of articles stored.
+    Fetch stage: download a feed body for the parse stage.
+    With FEED_STREAM_PARSE, the download stops once a reverse-chronological
+    feed reaches entries older than the cutoff (see feed_stream.read_to_cutoff),
+    so only the part the parser would read is transferred.
+    Returns (body, validator headers), or None if the feed is unchanged (304).
     """
-    week = db.get_current_week()
+    try:
+        headers = _conditional_headers(feed_url, cache_entry)
+        with http_client.get(feed_url, headers=headers, stream=config.FEED_STREAM_PARSE) as response:
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            validators = {
+                header: response.headers[header]
+                for header in ("ETag", "Last-Modified") if header in response.headers
+            }
+            if not config.FEED_STREAM_PARSE:
+                return response.content, validators
+            body = feed_stream.read_to_cutoff(
+                response.iter_content(chunk_size=config.FEED_STREAM_CHUNK_BYTES),
+                cutoff_date, config.MAX_FEED_ITEMS,
+                stop_after_old=config.FEED_STREAM_STOP_AFTER_OLD,
+            )
+            return body, validators
+    except Exception as e:
+        print(f"  Error fetching feed {feed_url}: {e}")
+        raise
 
-    # Determine cutoff date
-    if cron_mode:
-        last_run = db.get_last_cron_run()
-        if last_run:
-            cutoff_date = last_run
-            if verbose:
-                print(f"Fetching articles since last run: {last_run.isoformat()}")
-        else:
-            # First run: use last N days
-            cutoff_date = datetime.now() - timedelta(days=config.CRON_FIRST_RUN_DAYS)
-            if verbose:
-                print(f"First run: fetching articles from last {config.CRON_FIRST_RUN_DAYS} day(s)")
-    else:
-        cutoff_date = datetime.now() - timedelta(days=config.DAYS_LOOKBACK)
-        if verbose:
-            print(f"Full sync: fetching articles from last {config.DAYS_LOOKBACK} days")
 
-    if verbose:
-        print("=" * 60)
-        print("RSS Feed Sync - AI Newsletter")
-        print(f"Week: {week} | Cutoff: {cutoff_date.date()}")
-        print("=" * 60)
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_host_semaphores_lock = threading.Lock()
+
+
+def _host_semaphore(url: str) -> threading.BoundedSemaphore:
+    """Get the semaphore that caps concurrent requests to the URL's host."""
+    host = urlparse(url).netloc.lower()
+    with _host_semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(max(1, config.FETCH_PER_HOST_LIMIT))
+            _host_semaphores[host] = semaphore
+        return semaphore
+
+
+_parse_executor: Optional[ProcessPoolExecutor] = None
+_parse_executor_workers = 0
+_parse_executor_lock = threading.Lock()
+
 
+def _parse_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for the parse stage, started on first use and kept for the
+    life of the process so repeated syncs (job worker, curator API) don't pay
+    for new worker processes each time. It is replaced if the worker count
+    changes or a worker died. Workers come from a forkserver (spawn where that
+    is unavailable) rather than being forked from this process: syncs also run
+    inside the multithreaded curator API, and a forked child could inherit a
+    lock held by another thread and deadlock.
+    """
+    global _parse_executor, _parse_executor_workers
+    with _parse_executor_lock:
+        pool = _parse_executor
+        if pool is not None and (_parse_executor_workers != workers or pool._broken):
+            pool.shutdown(wait=False, cancel_futures=True)
+            pool = None
+        if pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            _parse_executor, _parse_executor_workers = pool, workers
+        return pool
+
+
+def fetch_feeds(feed_urls: dict[str, str], cutoff_date: Optional[datetime] = None,
+                workers: int = 0, cache: Optional[dict] = None,
+                cutoffs: Optional[dict[str, datetime]] = None,
+                parse_workers: Optional[int] = None) -> Iterator[tuple[str, list[dict], bool]]:
+    """
+    Fetch and parse feeds concurrently, yielding (domain, items, ok) as each
+    feed completes; ok is False when the fetch or parse failed.
+    Downloads are bounded by `workers` (default FETCH_WORKERS) overall and by
+    FETCH_PER_HOST_LIMIT per host, so wall-clock time tracks the slowest feed
+    rather than the sum of all feed latencies. Parsing runs in a pool of
+    `parse_workers` processes (default PARSE_WORKERS) fed with the raw bodies
+    (read only as far as the cutoff), so it uses every core instead of contending for the GIL with the
+    downloads; with 0, each fetch thread stream-parses its own feed instead.
+    When the feeds cache is passed, requests are conditional on each feed's
+    stored validators. `cutoffs` overrides cutoff_date per domain.
+    """
+    workers = workers or config.FETCH_WORKERS
+    parse_workers = config.PARSE_WORKERS if parse_workers is None else parse_workers
+    cache = cache if cache is not None else {}
+    cutoffs = cutoffs or {}
+    if cutoff_date is None:
+        cutoff_date = datetime.now() - timedelta(days=config.DAYS_LOOKBACK)
+
+    if parse_workers <= 0:
+        def _fetch(domain: str, feed_url: str) -> list[dict]:
+            with _host_semaphore(feed_url):
+                return parse_feed(feed_url, cutoff_date=cutoffs.get(domain, cutoff_date),
+                                  cache_entry=cache.get(domain), raise_errors=True)
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {
+                executor.submit(_fetch, domain, feed_url): domain
+                for domain, feed_url in feed_urls.items()
+            }
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), True
+                except Exception:
+                    yield futures[future], [], False
+        return
+
+    def _download(domain: str, feed_url: str) -> Optional[tuple[bytes, dict]]:
+        with _host_semaphore(feed_url):
+            return _fetch_feed_body(feed_url, cache.get(domain), cutoffs.get(domain, cutoff_date))
+
+    parse_pool = _parse_pool(parse_workers)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as fetch_pool:
+        fetching = {
+            fetch_pool.submit(_download, domain, feed_url): domain
+            for domain, feed_url in feed_urls.items()
+        }
+        parsing = {}
+        pending = set(fetching)
+
+        # Hand each body to the parse pool as soon as it arrives
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in fetching:
+                    domain = fetching[future]
+                    try:
+                        fetched = future.result()
+                    except Exception:
+                        yield domain, [], False
+                        continue
+                    if fetched is None:
+                        yield domain, [], True
+                        continue
+                    body, validators = fetched
+                    parse_future = parse_pool.submit(
+                        feed_parser.parse_body, body, feed_urls[domain],
+                        cutoffs.get(domain, cutoff_date),
+                    )
+                    parsing[parse_future] = (domain, validators)
+                    pending.add(parse_future)
+                    continue
+
+                domain, validators = parsing.pop(future)
+                try:
+                    items, published = future.result()
+                except Exception as e:
+                    print(f"  Error parsing feed {feed_urls[domain]}: {e}")
+                    yield domain, [], False
+                    continue
+                cache_entry = cache.get(domain)
+                _store_validators(validators, cache_entry)
+                if cache_entry is not None:
+                    feed_scheduler.observe_items(cache_entry, published)
+                yield domain, items, True
+
+
+def _emit_progress(progress: Optional[Callable[[dict], None]], **event) -> None:
+    """Send a structured progress event to the optional progress callback."""
+    if progress is not None:
+        progress(event)
+
+
+def _collect_domains(limit_domains: int, verbose: bool,
+                     progress: Optional[Callable[[dict], None]], stages: int = 4) -> set[str]:
+    """Sync stages 1-2: load crawl results and extract the candidate blog domains."""
     # Load crawl results
     if verbose:
-        print("\n[1/4] Loading crawl results...")
+        print(f"\n[1/{stages}] Loading crawl results...")
+    _emit_progress(progress, stage=1, stages=stages, label="Loading crawl results")
     crawl_data = load_crawl_results()
     if verbose:
         print(f"  Loaded {len(crawl_data.get('posts', []))} posts")
 
     # Extract domains
     if verbose:
-        print("\n[2/4] Extracting domains...")
+        print(f"\n[2/{stages}] Extracting domains...")
+    _emit_progress(progress, stage=2, stages=stages, label="Extracting domains")
     domains = extract_domains_from_crawl(crawl_data)
 
     # Filter out common non-blog domains and excluded news sources
@@ -282,69 +537,221 @@ def run_sync(cron_mode: bool = False, skip_discovery: bool = False,
         if verbose:
             print(f"  Limited to {len(domains)} domains")
 
-    # Load/update feeds cache
+    return domains
+
+
+def _resolve_feeds(domains: set[str], skip_discovery: bool, rediscover_stale: bool, verbose: bool,
+                   progress: Optional[Callable[[dict], None]], stages: int = 4) -> tuple[dict, dict]:
+    """
+    Sync stage 3: look up each domain's feed, discovering unknown domains and
+    expired no_feed entries as allowed. Returns (feeds cache, {domain: feed_url}).
+    """
     if verbose:
-        print("\n[3/4] Discovering RSS feeds...")
+        print(f"\n[3/{stages}] Discovering RSS feeds...")
+    _emit_progress(progress, stage=3, stages=stages, label="Discovering RSS feeds", domains=len(domains))
     cache = load_feeds_cache()
     feed_urls = {}
+    to_discover = []
 
     for domain in sorted(domains):
-        if skip_discovery and domain not in cache:
-            continue
+        entry = cache.get(domain) or {}
+        if entry.get("feed_url"):
+            feed_urls[domain] = entry["feed_url"]
+        elif entry.get("no_feed"):
+            # Negative entries are revisited only once their backoff expires
+            if not skip_discovery and is_negative_cache_expired(entry):
+                to_discover.append(domain)
+        elif not (skip_discovery or rediscover_stale):
+            to_discover.append(domain)
+
+    if to_discover and verbose:
+        print(f"  Discovering {len(to_discover)} domains...")
+    feed_urls.update(discover_feeds(to_discover, cache))
+    save_feeds_cache(cache, to_discover)
 
-        feed_url = discover_rss_feed(domain, cache)
-        if feed_url:
-            feed_urls[domain] = feed_url
-            if verbose:
-                print(f"  + {domain}: {feed_url}")
+    if verbose:
+        for domain in sorted(feed_urls):
+            print(f"  + {domain}: {feed_urls[domain]}")
 
-    save_feeds_cache(cache)
     if verbose:
         print(f"  Found {len(feed_urls)} feeds")
+    _emit_progress(progress, stage=3, stages=stages, label="Discovering RSS feeds",
+                   domains_discovered=len(to_discover), feeds=len(feed_urls))
+
+    return cache, feed_urls
+
+
+def run_discovery(limit_domains: int = 0, verbose: bool = True, rediscover_stale: bool = False,
+                  progress: Optional[Callable[[dict], None]] = None) -> int:
+    """
+    Run feed discovery only (sync stages 1-3, no fetching).
+    Returns the number of domains with a known feed afterwards.
+    """
+    domains = _collect_domains(limit_domains, verbose, progress, stages=3)
+    _, feed_urls = _resolve_feeds(domains, False, rediscover_stale, verbose, progress, stages=3)
+    return len(feed_urls)
+
+
+def _process_stored_articles(verbose: bool, progress: Optional[Callable[[dict], None]],
+                             score: Optional[bool]) -> None:
+    """
+    Post-store sync stages over everything in the database, not just this
+    run's articles: topics, embeddings, LLM scores and the preference model,
+    each if enabled (see run_sync).
+    """
+    if config.TOPIC_CLASSIFY_ENABLED:
+        _emit_progress(progress, stage=4, stages=4, label="Classifying topics")
+        topic_classifier.classify_untagged(verbose=verbose)
+
+    if config.EMBEDDINGS_ENABLED:
+        _emit_progress(progress, stage=4, stages=4, label="Embedding articles")
+        embeddings.embed_missing(verbose=verbose)
+
+    if config.LLM_SCORING_ENABLED if score is None else score:
+        _emit_progress(progress, stage=4, stages=4, label="Scoring articles")
+        try:
+            scoring.score_articles(
+                verbose=verbose,
+                progress=lambda event: _emit_progress(progress, stage=4, stages=4, **event),
+            )
+        except llm.LLMError as e:
+            # Scores are optional; the stored articles are what matters
+            print(f"  Skipping LLM scoring: {e}")
+
+    if config.PREFERENCE_ENABLED:
+        preference.refresh(verbose=verbose)
+
+
+def run_sync(cron_mode: bool = False, skip_discovery: bool = False,
+             limit_domains: int = 0, verbose: bool = True, workers: int = 0,
+             rediscover_stale: bool = False, due_only: bool = False,
+             progress: Optional[Callable[[dict], None]] = None,
+             parse_workers: Optional[int] = None, score: Optional[bool] = None) -> int:
+    """
+    Run the RSS sync: load feeds, parse, store in DB.
+    With rediscover_stale, discovery only revisits expired no_feed entries
+    (new domains are skipped, as with skip_discovery).
+    With due_only, only feeds whose adaptive polling schedule says they are
+    due are fetched, each from shortly before its own last fetch.
+    With score (default LLM_SCORING_ENABLED), pending articles without an
+    up-to-date LLM relevance score are scored after storing (see scoring.py).
+    With TOPIC_CLASSIFY_ENABLED, articles without a topic (new ones, and on
+    the first run all existing ones) get one (see topic_classifier.py).
+    With EMBEDDINGS_ENABLED, new articles are embedded for related-article
+    search (see embeddings.py).
+    With PREFERENCE_ENABLED, the local preference model is updated and new
+    pending articles are scored with it (see preference.py).
+    These post-store stages run even when no new articles were fetched.
+    If given, `progress` is called with a dict for each pipeline event
+    (stage changes, discovery/fetch counters, dedup and store results).
+    Returns the number of articles stored.
+    """
+    week = db.get_current_week()
+
+    # Determine cutoff date
+    if cron_mode:
+        last_run = db.get_last_cron_run()
+        if last_run:
+            cutoff_date = last_run
+            if verbose:
+                print(f"Fetching articles since last run: {last_run.isoformat()}")
+        else:
+            # First run: use last N days
+            cutoff_date = datetime.now() - timedelta(days=config.CRON_FIRST_RUN_DAYS)
+            if verbose:
+                print(f"First run: fetching articles from last {config.CRON_FIRST_RUN_DAYS} day(s)")
+    else:
+        cutoff_date = datetime.now() - timedelta(days=config.DAYS_LOOKBACK)
+        if verbose:
+            print(f"Full sync: fetching articles from last {config.DAYS_LOOKBACK} days")
+
+    if verbose:
+        print("=" * 60)
+        print("RSS Feed Sync - AI Newsletter")
+        print(f"Week: {week} | Cutoff: {cutoff_date.date()}")
+        print("=" * 60)
+
+    domains = _collect_domains(limit_domains, verbose, progress)
+    cache, feed_urls = _resolve_feeds(domains, skip_discovery, rediscover_stale, verbose, progress)
+
+    cutoffs = {}
+    if due_only:
+        now = datetime.now()
+        due = {
+            domain: feed_url for domain, feed_url in feed_urls.items()
+            if feed_scheduler.is_due(cache[domain], now)
+        }
+        if verbose:
+            print(f"  {len(due)} feeds due ({len(feed_urls) - len(due)} not yet due)")
+        feed_urls = due
+        cutoffs = {
+            domain: feed_scheduler.feed_cutoff(cache[domain], cutoff_date, now)
+            for domain in feed_urls
+        }
 
     if not feed_urls:
         if verbose:
-            print("\nNo RSS feeds found. Exiting.")
+            print("\nNo RSS feeds to fetch.")
+        _process_stored_articles(verbose, progress, score)
         return 0
 
-    # Parse feeds and collect items
+    # Fetch feeds concurrently; dedup by canonical URL as results stream in
+    # (same article may appear in multiple feeds, with tracking params etc.)
     if verbose:
         print("\n[4/4] Parsing feeds...")
-    all_items = []
+    _emit_progress(progress, stage=4, stages=4, label="Fetching feeds", feeds=len(feed_urls))
+    seen_urls = set()
+    unique_items = []
+    fetched = ok_count = failed_count = items_seen = 0
 
-    for domain, feed_url in feed_urls.items():
-        items = parse_feed(feed_url, cutoff_date=cutoff_date)
+    for domain, items, ok in fetch_feeds(feed_urls, cutoff_date=cutoff_date,
+                                         workers=workers, cache=cache, cutoffs=cutoffs,
+                                         parse_workers=parse_workers):
         if verbose:
             print(f"  {domain}: {len(items)} items")
-        all_items.extend(items)
-
-    # Deduplicate by URL (same article may appear in multiple feeds)
-    seen_urls = set()
-    unique_items = []
-    for item in all_items:
-        url = item.get("url", "")
-        if url and url not in seen_urls:
-            seen_urls.add(url)
-            unique_items.append(item)
+        feed_scheduler.record_fetch(cache[domain], ok)
+        fetched += 1
+        ok_count += ok
+        failed_count += not ok
+        items_seen += len(items)
+        for item in items:
+            url = db.canonicalize_url(item.get("url", ""))
+            if url and url not in seen_urls:
+                seen_urls.add(url)
+                unique_items.append(item)
+        _emit_progress(progress, stage=4, stages=4, label="Fetching feeds", feeds=len(feed_urls),
+                       feeds_fetched=fetched, feeds_ok=ok_count, feeds_failed=failed_count,
+                       items_seen=items_seen, items_unique=len(unique_items))
 
     if verbose:
         print(f"\n  Total items to store: {len(unique_items)} (after dedup)")
 
-    if not unique_items:
+    # Store in database, then persist the new HTTP validators and schedule so
+    # a failed store never leaves feeds marked as unchanged
+    count = 0
+    if unique_items:
+        _emit_progress(progress, stage=4, stages=4, label="Storing articles", items_unique=len(unique_items))
+        result = db.upsert_articles_bulk(unique_items, week)
+        count = result["inserted"] + result["updated"]
+        _emit_progress(progress, stage=4, stages=4, label="Stored articles",
+                       stored=count, inserted=result["inserted"], updated=result["updated"],
+                       clustered=result["clustered"])
         if verbose:
-            print("  No new articles to store.")
-        if cron_mode:
-            db.set_last_cron_run()
-        return 0
-
-    # Store in database
-    count = db.upsert_articles(unique_items, week)
+            print(f"\n  Stored {count} articles in database "
+                  f"({result['inserted']} new, {result['updated']} updated, "
+                  f"{result['clustered']} clustered as near-duplicates)")
+    elif verbose:
+        print("  No new articles to store.")
+    db.update_feed_fetch_state({domain: cache[domain] for domain in feed_urls})
 
     if cron_mode:
         db.set_last_cron_run()
 
+    # Runs even when nothing new was stored: backfills (topics, embeddings,
+    # scores) and curation changes since the last sync still need processing
+    _process_stored_articles(verbose, progress, score)
+
     if verbose:
-        print(f"\n  Stored {count} articles in database")
         stats = db.get_current_stats()
         print(f"\nDone! Current dashboard: {stats['total']} articles, "
               f"{stats['pending']} pending curation")
@@ -368,12 +775,40 @@ def main():
         action="store_true",
         help="Skip feed discovery, use only cached feeds",
     )
+    parser.add_argument(
+        "--rediscover-stale",
+        action="store_true",
+        help="Only re-run discovery for no-feed domains whose retry backoff expired",
+    )
+    parser.add_argument(
+        "--due-only",
+        action="store_true",
+        help="Only fetch feeds that are due under their adaptive polling schedule",
+    )
     parser.add_argument(
         "--limit",
         type=int,
         default=0,
         help="Limit number of domains to process (0 = no limit)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help=f"Number of feeds to fetch in parallel (default: {config.FETCH_WORKERS})",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help=f"Processes parsing feeds; 0 parses in the fetch threads (default: {config.PARSE_WORKERS})",
+    )
+    parser.add_argument(
+        "--score",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Score pending articles with the LLM after storing (default: LLM_SCORING_ENABLED)",
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -387,6 +822,11 @@ def main():
         skip_discovery=args.skip_discovery,
         limit_domains=args.limit,
         verbose=verbose,
+        workers=args.workers,
+        rediscover_stale=args.rediscover_stale,
+        due_only=args.due_only,
+        parse_workers=args.parse_workers,
+        score=args.score,
     )
 
 
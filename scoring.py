@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+LLM relevance scoring for pending articles.
+
+Pending articles in the queue are packed LLM_SCORING_BATCH_SIZE to a prompt,
+along with a few recently shortlisted and rejected articles as examples of
+the curator's taste, and sent LLM_SCORING_WORKERS prompts at a time through
+llm.complete (rate limited per provider). Each score is stored in
+article_scores with a hash of the exact article input it was computed from,
+so an article is only sent again if its text or the prompt template changes.
+Prompts also go through the LLM response cache (see llm.complete): a batch
+sent again with the same articles and examples is answered from the cache.
+
+Usage:
+    python scoring.py                  # Score unscored pending articles
+    python scoring.py --limit 100      # At most 100 articles
+    python scoring.py --provider mock  # Offline stand-in (keyword-based scores)
+"""
+import argparse
+import hashlib
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Optional
+
+import config
+import db
+import llm
+
+# Bump when PROMPT_TEMPLATE or the article fields sent change: stored scores
+# from older prompts no longer match and are recomputed.
+PROMPT_VERSION = 1
+
+PROMPT_TEMPLATE = """You help curate a weekly AI newsletter. Its topics are: {topics}.
+
+Rate how relevant each candidate article is for the newsletter on a scale from
+0 (off-topic or low value) to 10 (must include), judging from its title,
+summary and source. Prefer substantive news, launches, research and practical
+applications of AI over generic news, listicles and promotional posts.
+
+Recently shortlisted by the curator:
+{shortlisted}
+
+Recently rejected by the curator:
+{rejected}
+
+Candidate articles (JSON):
+{articles}
+
+Reply with JSON only, in the form
+{{"scores": [{{"id": <candidate id>, "score": <0-10>, "reason": "<one short sentence>"}}]}}
+with exactly one entry per candidate."""
+
+# Keywords the mock provider scores on (stands in for the model's judgement)
+_MOCK_KEYWORDS = (
+    "ai", "llm", "model", "models", "agent", "agents", "gpt", "openai", "anthropic",
+    "gemini", "machine", "learning", "neural", "inference", "training", "research",
+)
+_MOCK_TOKEN_RE = re.compile(r"\w+")
+
+
+def _article_input(article: dict) -> dict:
+    """The article fields sent to the model."""
+    return {
+        "title": article.get("title") or "",
+        "summary": (article.get("summary") or "")[:500],
+        "source": article.get("source") or "",
+    }
+
+
+def input_hash(article: dict) -> str:
+    """Hash of everything a score depends on, stored to avoid re-scoring."""
+    payload = json.dumps([PROMPT_VERSION, _article_input(article)], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _format_examples(examples: list[dict]) -> str:
+    if not examples:
+        return "(none yet)"
+    return "\n".join(f"- {example['title']} ({example['source']})" for example in examples)
+
+
+def build_prompt(articles: list[dict], examples: dict) -> str:
+    """Scoring prompt for a batch; candidates are numbered 1..n in batch order."""
+    candidates = [
+        {"id": index, **_article_input(article)}
+        for index, article in enumerate(articles, 1)
+    ]
+    return PROMPT_TEMPLATE.format(
+        topics=", ".join(config.TOPICS),
+        shortlisted=_format_examples(examples.get("shortlisted", [])),
+        rejected=_format_examples(examples.get("rejected", [])),
+        articles=json.dumps(candidates, ensure_ascii=False, indent=1),
+    )
+
+
+def mock_reply(prompt: str) -> str:
+    """
+    Offline stand-in for the model: scores each candidate in the prompt by the
+    share of AI keywords in its title and summary. Deterministic.
+    """
+    candidates = json.loads(prompt.split("Candidate articles (JSON):\n", 1)[1].split("\n\nReply with", 1)[0])
+    scores = []
+    for candidate in candidates:
+        tokens = _MOCK_TOKEN_RE.findall(f"{candidate['title']} {candidate['summary']}".lower())
+        hits = sum(token in _MOCK_KEYWORDS for token in tokens)
+        score = min(10.0, round(40.0 * hits / max(len(tokens), 1), 1))
+        scores.append({"id": candidate["id"], "score": score, "reason": f"{hits} AI keyword(s)"})
+    return json.dumps({"scores": scores})
+
+
+def parse_scores(reply: str, articles: list[dict]) -> list[dict]:
+    """
+    Map a model reply back to the batch's articles. Entries with unknown ids
+    or non-numeric scores are dropped (those articles are retried next run).
+    """
+    data = llm.parse_json(reply)
+    entries = data.get("scores", []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise llm.LLMError("LLM reply has no scores list")
+
+    scored = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("id"))
+            score = float(entry.get("score"))
+        except (TypeError, ValueError):
+            continue
+        if 1 <= index <= len(articles):
+            scored[index] = {
+                "article_id": articles[index - 1]["id"],
+                "score": min(max(score, 0.0), 10.0),
+                "reason": str(entry.get("reason") or "")[:500],
+            }
+    return list(scored.values())
+
+
+def _score_batch(articles: list[dict], examples: dict, provider: str) -> list[dict]:
+    prompt = build_prompt(articles, examples)
+    try:
+        reply = llm.complete(prompt, provider=provider, json_mode=True, mock=mock_reply,
+                             cache=("scoring", PROMPT_VERSION),
+                             validate=lambda text: parse_scores(text, articles))
+    finally:
+        # Runs on a short-lived pool thread; the LLM cache lookup used the database
+        db.release_connection()
+    return parse_scores(reply, articles)
+
+
+def score_articles(limit: int = 0, provider: Optional[str] = None, verbose: bool = True,
+                   progress: Optional[Callable[[dict], None]] = None) -> dict:
+    """
+    Score pending queue articles that have no score for their current input.
+    Returns {"scored": n, "failed": n, "skipped": n}; skipped articles already
+    had an up-to-date score. Raises llm.LLMError if the provider is unusable.
+    """
+    provider = llm.provider_name(provider)
+    if not llm.is_configured(provider):
+        raise llm.LLMError(f"LLM provider {provider!r} is not configured (missing API key or SDK)")
+    model = llm.model_name(provider)
+
+    candidates = db.get_articles_for_scoring()
+    todo = [article for article in candidates if article["score_input_hash"] != input_hash(article)]
+    if limit:
+        todo = todo[:limit]
+    result = {"scored": 0, "failed": 0, "skipped": len(candidates) - len(todo)}
+    if not todo:
+        return result
+
+    examples = db.get_curated_examples(limit_per_status=5)
+    batch_size = max(1, config.LLM_SCORING_BATCH_SIZE)
+    batches = [todo[start:start + batch_size] for start in range(0, len(todo), batch_size)]
+    if verbose:
+        print(f"  Scoring {len(todo)} articles in {len(batches)} batches with {provider} ({model})")
+
+    with ThreadPoolExecutor(max_workers=max(1, config.LLM_SCORING_WORKERS)) as executor:
+        futures = {
+            executor.submit(_score_batch, batch, examples, provider): batch
+            for batch in batches
+        }
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                scores = future.result()
+            except llm.LLMError as e:
+                if verbose:
+                    print(f"  Scoring batch of {len(batch)} failed: {e}")
+                result["failed"] += len(batch)
+                continue
+
+            hashes = {article["id"]: input_hash(article) for article in batch}
+            scored_at = datetime.now().isoformat()
+            for score in scores:
+                score.update(
+                    provider=provider,
+                    model=model,
+                    input_hash=hashes[score["article_id"]],
+                    scored_at=scored_at,
+                )
+            db.save_article_scores(scores)
+            result["scored"] += len(scores)
+            result["failed"] += len(batch) - len(scores)
+            if progress:
+                progress({"label": "Scoring articles", "scored": result["scored"],
+                          "score_failed": result["failed"], "to_score": len(todo)})
+
+    if verbose:
+        print(f"  Scored {result['scored']} articles ({result['failed']} failed, "
+              f"{result['skipped']} already scored)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score pending articles for relevance with the LLM.")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=0,
+        help="Score at most N articles (default: all unscored pending articles)",
+    )
+    parser.add_argument(
+        "--provider",
+        choices=llm.PROVIDERS,
+        default=None,
+        help="LLM provider (default: LLM_PROVIDER in config.py; 'mock' runs offline)",
+    )
+    args = parser.parse_args()
+
+    try:
+        score_articles(limit=args.limit, provider=args.provider)
+    except llm.LLMError as e:
+        print(f"Scoring unavailable: {e}")
+
+
+if __name__ == "__main__":
+    main()
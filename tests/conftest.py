@@ -0,0 +1,42 @@
+"""
+Shared fixtures: every test runs against a fresh database in a temp directory.
+
+db creates its tables on import, so the database path is pointed away from
+newsletter.db before any project module is imported.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+
+config.DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "import.db")
+config.FEEDS_CACHE_FILE = os.path.join(os.path.dirname(config.DATABASE_PATH), "feeds_cache.json")
+
+import db  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DATABASE_PATH", str(tmp_path / "test.db"))
+    monkeypatch.setattr(config, "FEEDS_CACHE_FILE", str(tmp_path / "feeds_cache.json"))
+    monkeypatch.setattr(config, "JOB_EMBEDDED_WORKER", False)
+    db.init_db()
+    yield
+
+
+def make_article(index: int, **fields) -> dict:
+    """A feed item with distinct text per index (never near-duplicates of each other)."""
+    article = {
+        "url": f"https://site{index}.example/post/{index}",
+        "title": f"Article {index} title",
+        "summary": f"Summary {index}",
+        "source": f"site{index}.example",
+        "published": f"2026-01-{1 + index % 28:02d}T{index % 24:02d}:00:00",
+    }
+    article.update(fields)
+    return article
@@ -0,0 +1,103 @@
+import sqlite3
+import threading
+
+import pytest
+
+import config
+import curator_api
+import db
+
+
+@pytest.fixture(autouse=True)
+def idle_pool(monkeypatch):
+    pool = []
+    monkeypatch.setattr(db, "_idle", pool)
+    return pool
+
+
+def _in_thread(work):
+    """Run work() on a new thread and return its result."""
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=work()))
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+def _use_and_release():
+    conn = db.get_connection()._conn
+    conn.execute("SELECT COUNT(*) FROM articles").fetchone()
+    db.release_connection()
+    return conn
+
+
+def test_released_connection_is_reused_by_next_thread(idle_pool):
+    first = _in_thread(_use_and_release)
+    assert [conn for _, conn in idle_pool] == [first]
+    assert _in_thread(_use_and_release) is first
+    assert len(idle_pool) == 1
+
+
+def test_release_rolls_back_open_transaction(idle_pool):
+    def work():
+        conn = db.get_connection()
+        conn.execute("INSERT INTO cron_state (key, value) VALUES ('left', 'open')")
+        db.release_connection()
+
+    _in_thread(work)
+    _, conn = idle_pool[0]
+    assert not conn.in_transaction
+    assert db.get_connection().execute("SELECT COUNT(*) FROM cron_state WHERE key = 'left'").fetchone()[0] == 0
+
+
+def test_nested_call_keeps_callers_transaction():
+    conn = db.get_connection()
+    conn.execute("INSERT INTO cron_state (key, value) VALUES ('outer', 'pending')")
+    # A nested db call takes and closes the same thread connection
+    db.get_job(1)
+    assert conn.in_transaction
+    conn.commit()
+    assert db.get_connection().execute("SELECT value FROM cron_state WHERE key = 'outer'").fetchone()[0] == "pending"
+
+
+def test_idle_pool_is_bounded(monkeypatch, idle_pool):
+    monkeypatch.setattr(config, "DB_POOL_SIZE", 2)
+    barrier = threading.Barrier(4)
+    conns = []
+
+    def work():
+        conn = db.get_connection()._conn
+        barrier.wait()
+        conns.append(conn)
+        barrier.wait()
+        db.release_connection()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(idle_pool) == 2
+    closed = [conn for conn in conns if all(conn is not idle for _, idle in idle_pool)]
+    assert len(closed) == 2
+    for conn in closed:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def test_idle_connection_to_other_database_is_closed(tmp_path, monkeypatch, idle_pool):
+    stale = _in_thread(_use_and_release)
+    monkeypatch.setattr(config, "DATABASE_PATH", str(tmp_path / "other.db"))
+    db.init_db()
+
+    assert _in_thread(_use_and_release) is not stale
+    with pytest.raises(sqlite3.ProgrammingError):
+        stale.execute("SELECT 1")
+
+
+def test_api_request_releases_connection(idle_pool):
+    client = curator_api.app.test_client()
+    assert client.get("/api/articles?limit=5").status_code == 200
+    assert getattr(db._local, "conn", None) is None
+    assert len(idle_pool) == 1
@@ -0,0 +1,34 @@
+import pytest
+
+from conftest import make_article
+
+import config
+import db
+import embeddings
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    monkeypatch.setattr(embeddings, "_index", None)
+    monkeypatch.setattr(config, "EMBEDDING_INDEX_REFRESH_SECONDS", 0)
+
+
+@pytest.mark.parametrize("ann_threshold", [10_000, 20], ids=["exact", "ivf"])
+def test_loaded_index_is_not_modified_by_refresh(monkeypatch, ann_threshold):
+    monkeypatch.setattr(config, "EMBEDDING_ANN_THRESHOLD", ann_threshold)
+    db.upsert_articles_bulk([make_article(index) for index in range(30)])
+    embeddings.embed_missing(verbose=False)
+    before = embeddings.get_index()
+    ids, vectors, lists = list(before.ids), before.vectors, [group.copy() for group in before.lists]
+    query = before.vectors[0]
+    results = before.search(query, 5)
+
+    db.upsert_articles_bulk([make_article(index) for index in range(30, 45)])
+    embeddings.embed_missing(verbose=False)
+    after = embeddings.get_index()
+
+    assert after is not before and len(after) == 45
+    assert before.ids == ids and before.vectors is vectors and len(before.positions) == 30
+    assert all((old == new).all() for old, new in zip(lists, before.lists))
+    assert before.search(query, 5) == results
+    assert after.search(after.vectors[40], 1)[0][0] == after.ids[40]
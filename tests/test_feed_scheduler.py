@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import config
+import feed_scheduler
+import rss_feed_scorer
+
+NOW = datetime(2026, 2, 1, 12, 0)
+HOUR = 3600
+
+
+@pytest.fixture(autouse=True)
+def schedule_config(monkeypatch):
+    monkeypatch.setattr(config, "FEED_POLL_MIN_SECONDS", 15 * 60)
+    monkeypatch.setattr(config, "FEED_POLL_MAX_SECONDS", 24 * HOUR)
+    monkeypatch.setattr(config, "FEED_POLL_DEFAULT_SECONDS", HOUR)
+    monkeypatch.setattr(config, "FEED_POLL_FAILURE_SECONDS", HOUR)
+    monkeypatch.setattr(config, "FEED_POLL_CADENCE_FRACTION", 0.5)
+    monkeypatch.setattr(config, "FEED_CADENCE_SAMPLE_ITEMS", 5)
+    monkeypatch.setattr(config, "FEED_POLL_CUTOFF_OVERLAP_HOURS", 24)
+    monkeypatch.setattr(config, "DAYS_LOOKBACK", 7)
+
+
+def _hours_ago(*hours: float) -> list[datetime]:
+    return [NOW - timedelta(hours=h) for h in hours]
+
+
+def test_observe_items_records_median_gap_and_newest():
+    entry = {}
+    feed_scheduler.observe_items(entry, _hours_ago(2, 8, 12, 30, 32), now=NOW)
+    assert entry["last_new_item_at"] == (NOW - timedelta(hours=2)).isoformat()
+    # Gaps 6h, 4h, 18h, 2h
+    assert entry["cadence_seconds"] == 5 * HOUR
+
+
+def test_observe_items_samples_only_the_newest_items():
+    entry = {}
+    feed_scheduler.observe_items(entry, _hours_ago(1, 2, 3, 4, 5, 100, 200, 300), now=NOW)
+    assert entry["cadence_seconds"] == HOUR
+
+
+def test_observe_items_ignores_future_and_duplicate_dates():
+    entry = {}
+    feed_scheduler.observe_items(entry, _hours_ago(-5, 4, 4, 10), now=NOW)
+    assert entry["last_new_item_at"] == (NOW - timedelta(hours=4)).isoformat()
+    assert entry["cadence_seconds"] == 6 * HOUR
+
+
+def test_observe_items_keeps_state_without_dates():
+    entry = {"cadence_seconds": 123, "last_new_item_at": "2026-01-31T00:00:00"}
+    feed_scheduler.observe_items(entry, [], now=NOW)
+    feed_scheduler.observe_items(entry, _hours_ago(-1), now=NOW)
+    assert entry == {"cadence_seconds": 123, "last_new_item_at": "2026-01-31T00:00:00"}
+
+
+def test_observe_items_never_moves_newest_item_back():
+    entry = {"last_new_item_at": (NOW - timedelta(hours=1)).isoformat()}
+    feed_scheduler.observe_items(entry, _hours_ago(3, 6), now=NOW)
+    assert entry["last_new_item_at"] == (NOW - timedelta(hours=1)).isoformat()
+
+
+def test_poll_interval_defaults_without_cadence():
+    assert feed_scheduler.poll_interval({}, now=NOW) == HOUR
+
+
+def test_poll_interval_follows_cadence():
+    entry = {"cadence_seconds": 6 * HOUR, "last_new_item_at": (NOW - timedelta(hours=1)).isoformat()}
+    assert feed_scheduler.poll_interval(entry, now=NOW) == 3 * HOUR
+
+
+@pytest.mark.parametrize("cadence, expected", [
+    (60, 15 * 60),  # Posts every minute: never below the minimum
+    (30 * 24 * HOUR, 24 * HOUR),  # Monthly: still polled daily
+])
+def test_poll_interval_is_clamped(cadence, expected):
+    entry = {"cadence_seconds": cadence, "last_new_item_at": NOW.isoformat()}
+    assert feed_scheduler.poll_interval(entry, now=NOW) == expected
+
+
+def test_poll_interval_stretches_for_quiet_feeds():
+    entry = {"cadence_seconds": 2 * HOUR, "last_new_item_at": (NOW - timedelta(hours=10)).isoformat()}
+    assert feed_scheduler.poll_interval(entry, now=NOW) == 5 * HOUR
+
+    entry["last_new_item_at"] = (NOW - timedelta(days=10)).isoformat()
+    assert feed_scheduler.poll_interval(entry, now=NOW) == 24 * HOUR
+
+
+def test_record_fetch_schedules_next_poll():
+    entry = {"cadence_seconds": 4 * HOUR, "last_new_item_at": NOW.isoformat()}
+    feed_scheduler.record_fetch(entry, ok=True, now=NOW)
+    assert entry["last_fetched_at"] == NOW.isoformat()
+    assert entry["next_due_at"] == (NOW + timedelta(hours=2)).isoformat()
+
+
+def test_failed_fetch_retries_after_failure_interval(monkeypatch):
+    monkeypatch.setattr(config, "FEED_POLL_FAILURE_SECONDS", 3 * HOUR)
+    fetched_at = (NOW - timedelta(hours=6)).isoformat()
+    entry = {"cadence_seconds": 30 * 60, "last_new_item_at": NOW.isoformat(), "last_fetched_at": fetched_at}
+
+    feed_scheduler.record_fetch(entry, ok=False, now=NOW)
+    # A busy feed that keeps failing is not hammered at its usual interval,
+    # and its cutoff still covers everything since the last successful fetch
+    assert entry["next_due_at"] == (NOW + timedelta(hours=3)).isoformat()
+    assert entry["last_fetched_at"] == fetched_at
+
+
+def test_is_due():
+    assert feed_scheduler.is_due({}, now=NOW)
+    assert feed_scheduler.is_due({"next_due_at": "not a date"}, now=NOW)
+    assert feed_scheduler.is_due({"next_due_at": NOW.isoformat()}, now=NOW)
+    assert not feed_scheduler.is_due({"next_due_at": (NOW + timedelta(seconds=1)).isoformat()}, now=NOW)
+
+
+def test_feed_cutoff():
+    default = NOW - timedelta(days=7)
+    assert feed_scheduler.feed_cutoff({}, default, now=NOW) == default
+
+    entry = {"last_fetched_at": (NOW - timedelta(hours=3)).isoformat()}
+    assert feed_scheduler.feed_cutoff(entry, default, now=NOW) == NOW - timedelta(hours=27)
+
+    entry = {"last_fetched_at": (NOW - timedelta(days=30)).isoformat()}
+    assert feed_scheduler.feed_cutoff(entry, default, now=NOW) == NOW - timedelta(days=7)
+
+
+def test_due_only_sync_fetches_only_due_feeds(monkeypatch):
+    past, future = (datetime.now() - timedelta(minutes=1)).isoformat(), (datetime.now() + timedelta(hours=1)).isoformat()
+    fetched_at = (datetime.now() - timedelta(hours=2)).isoformat()
+    cache = {
+        "due.example": {"feed_url": "https://due.example/feed", "next_due_at": past, "last_fetched_at": fetched_at},
+        "new.example": {"feed_url": "https://new.example/feed"},
+        "later.example": {"feed_url": "https://later.example/feed", "next_due_at": future},
+    }
+    calls = []
+
+    def _fetch_feeds(feed_urls, **kwargs):
+        calls.append((dict(feed_urls), kwargs["cutoffs"]))
+        return iter([(domain, [], domain != "new.example") for domain in feed_urls])
+
+    monkeypatch.setattr(rss_feed_scorer, "_collect_domains", lambda *args, **kwargs: set(cache))
+    monkeypatch.setattr(rss_feed_scorer, "_resolve_feeds", lambda *args, **kwargs: (
+        cache, {domain: entry["feed_url"] for domain, entry in cache.items()}))
+    monkeypatch.setattr(rss_feed_scorer, "fetch_feeds", _fetch_feeds)
+    monkeypatch.setattr(rss_feed_scorer, "_process_stored_articles", lambda *args: None)
+
+    rss_feed_scorer.run_sync(cron_mode=True, due_only=True, verbose=False)
+
+    (feed_urls, cutoffs), = calls
+    assert sorted(feed_urls) == ["due.example", "new.example"]
+    assert cutoffs["due.example"] == datetime.fromisoformat(fetched_at) - timedelta(hours=24)
+    assert cache["later.example"]["next_due_at"] == future
+    # The failed fetch is retried after FEED_POLL_FAILURE_SECONDS, the other per its schedule
+    assert "last_fetched_at" not in cache["new.example"]
+    assert datetime.fromisoformat(cache["new.example"]["next_due_at"]) > datetime.now() + timedelta(minutes=59)
+    assert datetime.fromisoformat(cache["due.example"]["last_fetched_at"]) > datetime.fromisoformat(fetched_at)
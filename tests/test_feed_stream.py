@@ -0,0 +1,206 @@
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+import config
+import feed_parser
+import feed_stream
+import http_client
+import rss_feed_scorer
+
+CUTOFF = datetime(2026, 1, 20)
+FEEDS = Path(__file__).parent / "fixtures" / "feeds"
+
+
+def _rss(days: list[int], padding: int = 0) -> bytes:
+    """An RSS 2.0 feed with one item per day of January 2026, in the given order."""
+    items = "".join(
+        f"<item><title>Post {day}</title><link>https://blog.example/{day}</link>"
+        f"<description>{'x' * padding}</description>"
+        f"<pubDate>{(datetime(2026, 1, 1) + timedelta(days=day - 1)).strftime('%a, %d %b %Y %H:%M:%S')} GMT</pubDate>"
+        f"</item>"
+        for day in days
+    )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Blog</title>'
+        f"<pubDate>Sat, 31 Jan 2026 00:00:00 GMT</pubDate>{items}</channel></rss>"
+    ).encode()
+
+
+def _chunks(body: bytes, size: int = 64):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def _fixture(name: str) -> bytes:
+    return (FEEDS / name).read_bytes()
+
+
+def _stream(body: bytes, cutoff, max_items: int = 100):
+    """parse_entries over small chunks; returns (entries, bytes consumed)."""
+    return feed_stream.parse_entries(_chunks(body, 256), cutoff, max_items, stop_after_old=3)
+
+
+def _items(entries, cutoff):
+    return feed_parser.entries_to_items(entries, "https://blog.example/feed", cutoff)
+
+
+@pytest.mark.parametrize("name", ["descending.rss", "ascending.atom"])
+def test_stream_parse_matches_feedparser(name):
+    body = _fixture(name)
+    entries, consumed = _stream(body, None)
+    assert consumed == body
+    assert _items(entries, datetime.min) == _items(feed_parser.feedparser_entries(body), datetime.min)
+
+
+def test_descending_feed_stops_at_cutoff():
+    body = _fixture("descending.rss")
+    entries, consumed = _stream(body, CUTOFF)
+
+    assert len(consumed) < len(body)
+    # Jan 31 back to Jan 21 (6 entries), then the three older ones that end the read
+    assert [entry["published"].day for entry in entries] == [31, 29, 27, 25, 23, 21, 19, 17, 15]
+    assert _items(entries, CUTOFF)[0] == _items(feed_parser.feedparser_entries(body), CUTOFF)[0]
+
+
+def test_ascending_feed_is_read_to_the_end():
+    body = _fixture("ascending.atom")
+    entries, consumed = _stream(body, CUTOFF)
+
+    assert consumed == body
+    assert len(entries) == 8
+    assert _items(entries, CUTOFF) == _items(feed_parser.feedparser_entries(body), CUTOFF)
+
+
+def test_out_of_order_entry_disables_early_cutoff():
+    body = _fixture("descending.rss")
+    first = body.index(b"<item>")
+    second = body.index(b"<item>", first + 1)
+    # Move the second-newest post to the top: the feed is no longer sorted
+    swapped = body[:first] + body[second:body.index(b"<item>", second + 1)] + body[first:second] \
+        + body[body.index(b"<item>", second + 1):]
+    entries, consumed = _stream(swapped, CUTOFF)
+    assert consumed == swapped
+    assert len(entries) == 12
+
+
+def test_max_items_limits_the_read():
+    body = _fixture("descending.rss")
+    entries, consumed = _stream(body, None, max_items=4)
+    assert len(entries) == 4
+    assert len(consumed) < len(body)
+
+
+def test_undefined_entities_fall_back_to_feedparser(monkeypatch):
+    body = _fixture("entities.rss")
+    entries, consumed = _stream(body, CUTOFF)
+    assert entries is None
+
+    monkeypatch.setattr(config, "FEED_STREAM_CHUNK_BYTES", 256)
+    fallback = feed_parser.stream_entries(_chunks(body, 256), CUTOFF)
+    assert fallback == feed_parser.feedparser_entries(body)
+    assert [entry["title"] for entry in fallback] == [
+        "Caf\u00e9 chains adopt on\u2011device models", "Benchmarks \u2014 a critique", "Older piece",
+    ]
+
+
+def test_non_feed_documents_are_left_to_feedparser():
+    entries, consumed = _stream(b"<html><body><p>Not a feed</p></body></html>", CUTOFF)
+    assert entries is None
+    assert consumed.startswith(b"<html>")
+
+
+def test_read_to_cutoff_stops_after_old_entries():
+    body = _rss(list(range(31, 0, -1)))
+    prefix = feed_stream.read_to_cutoff(_chunks(body), CUTOFF, max_items=100, stop_after_old=3)
+
+    assert len(prefix) < len(body)
+    assert prefix.endswith(b"</item>")
+    assert prefix.count(b"<item>") == 12 + 3  # Jan 31..20, then three older entries
+    items, _ = feed_parser.parse_body(prefix, "https://blog.example/feed", CUTOFF)
+    assert items == feed_parser.parse_body(body, "https://blog.example/feed", CUTOFF)[0]
+
+
+def test_read_to_cutoff_reads_unsorted_feeds_whole():
+    body = _rss([1, 2, 3, 25, 26, 27])
+    assert feed_stream.read_to_cutoff(_chunks(body), CUTOFF, max_items=100) == body
+
+
+def test_read_to_cutoff_stops_at_max_items():
+    body = _rss(list(range(31, 0, -1)))
+    prefix = feed_stream.read_to_cutoff(_chunks(body), None, max_items=5)
+    assert prefix.count(b"<item>") == 5
+
+
+@pytest.fixture
+def feed_server(monkeypatch):
+    """A local server for one large sorted feed; yields (url, bytes sent per request)."""
+    body = _rss(list(range(31, 0, -1)), padding=20000)
+    sent = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", '"v2"')
+            self.end_headers()
+            written = 0
+            try:
+                for chunk in _chunks(body, 16384):
+                    self.wfile.write(chunk)
+                    written += len(chunk)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            sent.append(written)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(http_client, "_session", None)
+    yield f"http://127.0.0.1:{server.server_address[1]}/feed", body
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_stage_downloads_only_up_to_cutoff(feed_server):
+    url, body = feed_server
+    prefix, _ = rss_feed_scorer._fetch_feed_body(url, None, CUTOFF)
+    assert len(prefix) < len(body) // 2
+    assert prefix.count(b"<item>") == 15
+
+
+def test_parse_pool_matches_threaded_parse_and_is_reused(feed_server):
+    url, _ = feed_server
+    feeds = {"blog.example": url}
+
+    threaded = list(rss_feed_scorer.fetch_feeds(feeds, cutoff_date=CUTOFF, parse_workers=0))
+    pooled = list(rss_feed_scorer.fetch_feeds(feeds, cutoff_date=CUTOFF, parse_workers=1))
+    assert pooled == threaded
+    assert len(pooled[0][1]) == 12
+
+    pool = rss_feed_scorer._parse_pool(1)
+    assert rss_feed_scorer._parse_pool(1) is pool
+    assert rss_feed_scorer._parse_pool(2) is not pool
+
+
+
+def test_validators_are_stored_only_after_items_are_built(feed_server, monkeypatch):
+    url, _ = feed_server
+    cache_entry = {"feed_url": url, "etag": '"v1"'}
+
+    def _fail(*args):
+        raise ValueError("bad entry")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(feed_parser, "entries_to_items", _fail)
+        assert rss_feed_scorer.parse_feed(url, CUTOFF, cache_entry=cache_entry) == []
+    assert cache_entry["etag"] == '"v1"'
+
+    assert len(rss_feed_scorer.parse_feed(url, CUTOFF, cache_entry=cache_entry)) == 12
+    assert cache_entry["etag"] == '"v2"'
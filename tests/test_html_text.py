@@ -0,0 +1,27 @@
+"""html_text.html_to_text must match the BeautifulSoup path it replaced."""
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+import html_text
+
+CORPUS = sorted((Path(__file__).parent / "fixtures" / "summaries").iterdir())
+
+
+def _bs4_text(markup: str, limit: int) -> str:
+    return BeautifulSoup(markup, "html.parser").get_text(separator=" ", strip=True)[:limit]
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=[path.name for path in CORPUS])
+@pytest.mark.parametrize("limit", [500, 80])
+def test_matches_beautifulsoup(path, limit):
+    markup = path.read_text(encoding="utf-8")
+    assert html_text.html_to_text(markup, limit) == _bs4_text(markup, limit)
+
+
+def test_stops_at_limit():
+    markup = "<p>" + "word " * 10_000 + "</p><p>never reached</p>"
+    text = html_text.html_to_text(markup, 500)
+    assert len(text) == 500
+    assert text == _bs4_text(markup, 500)
@@ -0,0 +1,44 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import config
+import http_client
+
+
+@pytest.fixture
+def unavailable_server(monkeypatch):
+    """A local server answering every request with 503; yields (url, request counter)."""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(config, "HTTP_RETRY_BACKOFF", 0)
+    monkeypatch.setattr(http_client, "_session", None)
+    monkeypatch.setattr(http_client, "_probe_session", None)
+    yield f"http://127.0.0.1:{server.server_address[1]}/feed", requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_retries_server_errors(unavailable_server):
+    url, requests_seen = unavailable_server
+    assert http_client.get(url).status_code == 503
+    assert len(requests_seen) == 1 + config.HTTP_RETRIES
+
+
+def test_probe_does_not_retry(unavailable_server):
+    url, requests_seen = unavailable_server
+    assert http_client.probe(url).status_code == 503
+    assert len(requests_seen) == 1
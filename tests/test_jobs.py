@@ -0,0 +1,259 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from conftest import make_article
+
+import config
+import curator_api
+import db
+import jobs
+import preference
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    """The job handlers, replaceable per kind for the duration of a test."""
+    table = dict(jobs.JOB_HANDLERS)
+    monkeypatch.setattr(jobs, "JOB_HANDLERS", table)
+    return table
+
+
+def _claim(owner="worker-a", lease=60):
+    return db.claim_job(owner, lease, exclusive_kinds=jobs.EXCLUSIVE_KINDS)
+
+
+def _make_due(job_id):
+    conn = db.get_connection()
+    conn.execute("UPDATE jobs SET run_after = ? WHERE id = ?", (datetime.now().isoformat(), job_id))
+    conn.commit()
+    conn.close()
+
+
+def test_enqueue_dedupes_active_jobs():
+    job, created = jobs.enqueue("sync", {})
+    again, created_again = jobs.enqueue("sync", {"full_sync": True})
+    assert created and not created_again
+    assert again["id"] == job["id"]
+
+    week_a, _ = jobs.enqueue("newsletter", {"week": "2026-W01"})
+    week_b, created_b = jobs.enqueue("newsletter", {"week": "2026-W02"})
+    assert created_b and week_b["id"] != week_a["id"]
+
+
+def test_finished_job_releases_dedupe_key():
+    job, _ = jobs.enqueue("score", {})
+    claimed = _claim()
+    assert db.complete_job(claimed["id"], "worker-a", {"scored": 0})
+    new_job, created = jobs.enqueue("score", {})
+    assert created and new_job["id"] != job["id"]
+
+
+def test_claim_leases_job_to_one_worker():
+    job, _ = jobs.enqueue("score", {})
+    claimed = _claim("worker-a")
+    assert claimed["id"] == job["id"]
+    assert claimed["status"] == "running"
+    assert claimed["attempts"] == 1
+    assert claimed["lease_owner"] == "worker-a"
+    assert _claim("worker-b") is None
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_loses_it():
+    job, _ = jobs.enqueue("score", {})
+    _claim("worker-a", lease=0)
+    time.sleep(0.01)
+
+    reclaimed = _claim("worker-b")
+    assert reclaimed["id"] == job["id"]
+    assert reclaimed["attempts"] == 2
+    assert not db.heartbeat_job(job["id"], "worker-a", 60)
+    assert not db.complete_job(job["id"], "worker-a", {})
+    assert db.complete_job(job["id"], "worker-b", {})
+
+
+def test_expired_lease_out_of_attempts_fails_job():
+    job, _ = db.enqueue_job("score", {}, dedupe_key="score", max_attempts=1)
+    _claim("worker-a", lease=0)
+    time.sleep(0.01)
+    assert _claim("worker-b") is None
+    assert db.get_job(job["id"])["status"] == "failed"
+
+
+def test_failed_run_is_retried_with_backoff(handlers, monkeypatch):
+    monkeypatch.setattr(config, "JOB_RETRY_BACKOFF_SECONDS", 30)
+
+    def _fail(params, progress):
+        raise RuntimeError("boom")
+
+    handlers["score"] = _fail
+    job, _ = jobs.enqueue("score", {})
+
+    jobs.run_job(_claim(), "worker-a")
+    retried = db.get_job(job["id"])
+    assert retried["status"] == "queued"
+    assert retried["error"] == "boom"
+    delay = (datetime.fromisoformat(retried["run_after"]) - datetime.now()).total_seconds()
+    assert 25 < delay <= 30
+    assert _claim() is None  # not due yet
+
+    # Each further attempt backs off twice as long; the last one fails the job
+    for attempt in range(2, config.JOB_MAX_ATTEMPTS + 1):
+        _make_due(job["id"])
+        claimed = _claim()
+        assert claimed["attempts"] == attempt
+        jobs.run_job(claimed, "worker-a")
+        if attempt < config.JOB_MAX_ATTEMPTS:
+            run_after = datetime.fromisoformat(db.get_job(job["id"])["run_after"])
+            delay = (run_after - datetime.now()).total_seconds()
+            assert 30 * 2 ** (attempt - 1) - 5 < delay <= 30 * 2 ** (attempt - 1)
+    assert db.get_job(job["id"])["status"] == "failed"
+
+
+def test_sync_and_discovery_never_run_together():
+    sync, _ = jobs.enqueue("sync", {})
+    discovery, _ = jobs.enqueue("discovery", {})
+    newsletter, _ = jobs.enqueue("newsletter", {"week": "2026-W01"})
+
+    assert _claim("worker-a")["id"] == sync["id"]
+    # Discovery waits for the running sync; unrelated kinds still run
+    assert _claim("worker-b")["id"] == newsletter["id"]
+    assert _claim("worker-c") is None
+
+    db.complete_job(sync["id"], "worker-a", {})
+    assert _claim("worker-c")["id"] == discovery["id"]
+
+
+def test_heartbeat_survives_database_errors(handlers, monkeypatch):
+    monkeypatch.setattr(config, "JOB_LEASE_SECONDS", 0.6)
+    real_heartbeat = db.heartbeat_job
+    calls = []
+
+    def _flaky_heartbeat(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return real_heartbeat(*args, **kwargs)
+
+    monkeypatch.setattr(db, "heartbeat_job", _flaky_heartbeat)
+    handlers["score"] = lambda params, progress: time.sleep(1.0) or {"ok": True}
+    job, _ = jobs.enqueue("score", {})
+
+    jobs.run_job(db.claim_job("worker-a", 0.6), "worker-a")
+    assert len(calls) >= 3
+    finished = db.get_job(job["id"])
+    assert finished["status"] == "succeeded"
+    assert finished["result"] == {"ok": True}
+
+
+def test_lost_lease_stops_the_handler(handlers, monkeypatch):
+    monkeypatch.setattr(config, "JOB_LEASE_SECONDS", 0.3)
+    monkeypatch.setattr(config, "JOB_PROGRESS_INTERVAL_SECONDS", 0)
+    job, _ = jobs.enqueue("score", {})
+    claimed = db.claim_job("worker-a", 0.3)
+    stopped = threading.Event()
+
+    def _long_running(params, progress):
+        # Another worker takes the job over while this run is still going
+        conn = db.get_connection()
+        conn.execute("UPDATE jobs SET lease_owner = 'worker-b' WHERE id = ?", (job["id"],))
+        conn.commit()
+        conn.close()
+        deadline = time.monotonic() + 5
+        try:
+            while time.monotonic() < deadline:
+                progress({"label": "working"})
+                time.sleep(0.05)
+        except jobs.LeaseLost:
+            stopped.set()
+            raise
+        return {"finished": True}
+
+    handlers["score"] = _long_running
+    jobs.run_job(claimed, "worker-a")
+
+    assert stopped.is_set()
+    job = db.get_job(job["id"])
+    assert job["status"] == "running"
+    assert job["lease_owner"] == "worker-b"
+    assert job["result"] is None
+
+
+def test_interactive_lane_runs_newsletter_during_sync(handlers, monkeypatch):
+    monkeypatch.setattr(config, "JOB_POLL_SECONDS", 0.05)
+    sync_started, release_sync = threading.Event(), threading.Event()
+
+    def _blocking_sync(params, progress):
+        sync_started.set()
+        release_sync.wait(10)
+        return {}
+
+    handlers["sync"] = _blocking_sync
+    handlers["newsletter"] = lambda params, progress: {"week": params["week"]}
+    stop = threading.Event()
+    workers = [
+        threading.Thread(target=jobs.run_worker, kwargs={"stop_event": stop}),
+        threading.Thread(target=jobs.run_worker,
+                         kwargs={"kinds": list(jobs.INTERACTIVE_KINDS), "stop_event": stop}),
+    ]
+    sync, _ = jobs.enqueue("sync", {})
+    workers[0].start()
+    try:
+        assert sync_started.wait(10)
+        newsletter, _ = jobs.enqueue("newsletter", {"week": "2026-W01"})
+        workers[1].start()
+        finished = jobs.wait_for_job(newsletter["id"], 10)
+        assert finished["status"] == "succeeded"
+        assert finished["result"] == {"week": "2026-W01"}
+        assert db.get_job(sync["id"])["status"] == "running"
+    finally:
+        release_sync.set()
+        stop.set()
+        for worker in workers:
+            if worker.is_alive():
+                worker.join(10)
+    assert db.get_job(sync["id"])["status"] == "succeeded"
+
+
+def test_curation_queues_preference_refresh_and_listing_does_not_train(monkeypatch):
+    monkeypatch.setattr(preference, "refresh", lambda **kwargs: pytest.fail("GET must not retrain"))
+    db.upsert_articles_bulk([make_article(index) for index in range(3)])
+    article_id = db.get_current_articles()[0]["id"]
+    client = curator_api.app.test_client()
+
+    assert client.get("/api/articles?sort=preference&limit=2").status_code == 200
+    assert db.get_jobs(kind="preference", limit=10) == []
+
+    for status in ("shortlisted", "rejected"):
+        response = client.post(f"/api/articles/{article_id}/curate", json={"status": status})
+        assert response.status_code == 200
+    queued = db.get_jobs(kind="preference", limit=10)
+    assert [job["status"] for job in queued] == ["queued"]
+
+
+def test_preference_job_reruns_when_curation_changes_meanwhile(handlers, monkeypatch):
+    fingerprints = iter(["a", "b", "b"])
+    runs = []
+    monkeypatch.setattr(jobs.preference, "refresh", lambda **kwargs: runs.append(1) or {"trained": True})
+    monkeypatch.setattr(db, "get_curation_fingerprint", lambda: next(fingerprints))
+    stored = iter([{"fingerprint": "0"}, {"fingerprint": "b"}])
+    monkeypatch.setattr(db, "get_preference_model", lambda: next(stored))
+
+    assert jobs.JOB_HANDLERS["preference"]({}, lambda event: None) == {"trained": True}
+    assert len(runs) == 2
+
+
+def test_failed_handler_writes_are_not_committed(handlers):
+    def _half_done(params, progress):
+        db.get_connection().execute("INSERT INTO cron_state (key, value) VALUES ('partial', 'x')")
+        raise RuntimeError("boom")
+
+    handlers["score"] = _half_done
+    job, _ = jobs.enqueue("score", {})
+    jobs.run_job(_claim(), "worker-a")
+
+    assert db.get_job(job["id"])["error"] == "boom"
+    assert db.get_connection().execute("SELECT COUNT(*) FROM cron_state WHERE key = 'partial'").fetchone()[0] == 0
@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import config
+import db
+import llm
+
+
+def _put(key: str, template: str = "summary", max_entries: int = 0, ttl_days: float = 30):
+    db.put_llm_cache(key, template, 1, "mock", "mock", f"reply {key}", ttl_days, max_entries)
+
+
+def _set_times(key: str, days_ago: float, column: str = "created_at"):
+    conn = db.get_connection()
+    conn.execute(f"UPDATE llm_cache SET {column} = ? WHERE cache_key = ?",
+                 ((datetime.now() - timedelta(days=days_ago)).isoformat(), key))
+    conn.commit()
+
+
+def _keys() -> list[str]:
+    rows = db.get_connection().execute("SELECT cache_key FROM llm_cache ORDER BY cache_key").fetchall()
+    return [row[0] for row in rows]
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Mock provider counting calls; complete() is sent through it with caching on."""
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(config, "LLM_CACHE_TTL_DAYS", 30)
+    monkeypatch.setattr(config, "LLM_CACHE_MAX_ENTRIES", 100)
+    calls = []
+
+    def reply(prompt):
+        calls.append(prompt)
+        return f'{{"n": {len(calls)}}}'
+
+    def complete(prompt="Summarize this", **kwargs):
+        kwargs.setdefault("cache", ("summary", 1))
+        return llm.complete(prompt, provider="mock", mock=reply, **kwargs)
+
+    complete.calls = calls
+    return complete
+
+
+def test_hits_and_misses_are_counted_per_template():
+    assert db.get_llm_cache("a", "summary", 30) is None
+    _put("a")
+    assert db.get_llm_cache("a", "summary", 30) == "reply a"
+    assert db.get_llm_cache("a", "summary", 30) == "reply a"
+    assert db.get_llm_cache("b", "topics", 30) is None
+
+    stats = db.get_llm_cache_stats()
+    assert stats["entries"] == 1
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert stats["templates"]["summary"] == {"entries": 1, "hits": 2, "misses": 1}
+    assert stats["templates"]["topics"] == {"entries": 0, "hits": 0, "misses": 1}
+
+
+def test_expired_entries_are_misses_and_removed():
+    _put("old")
+    _set_times("old", 31)
+
+    assert db.get_llm_cache("old", "summary", 0) == "reply old"  # 0 = no expiry
+    assert db.get_llm_cache("old", "summary", 30) is None
+    assert _keys() == []
+    assert db.get_llm_cache_stats()["templates"]["summary"]["misses"] == 1
+
+
+def test_put_purges_expired_entries():
+    _put("old")
+    _put("fresh")
+    _set_times("old", 31)
+    _put("new")
+    assert _keys() == ["fresh", "new"]
+
+
+def test_eviction_keeps_most_recently_used():
+    for index, key in enumerate(["a", "b", "c"]):
+        _put(key)
+        _set_times(key, 3 - index, column="last_used_at")
+    # A hit makes "a" the most recently used
+    assert db.get_llm_cache("a", "summary", 30) == "reply a"
+
+    _put("d", max_entries=3)
+    assert _keys() == ["a", "c", "d"]
+
+    _put("e", max_entries=2)
+    assert _keys() == ["d", "e"]
+
+
+def test_repeated_prompt_is_served_from_cache(provider):
+    assert provider() == provider() == '{"n": 1}'
+    assert len(provider.calls) == 1
+    assert provider("Another article") == '{"n": 2}'
+
+
+def test_template_version_and_name_invalidate(provider):
+    provider()
+    assert provider(cache=("summary", 2)) == '{"n": 2}'
+    assert provider(cache=("headline", 1)) == '{"n": 3}'
+    assert provider(json_mode=True) == '{"n": 4}'
+    assert provider(cache=("summary", 1)) == '{"n": 1}'
+    assert len(provider.calls) == 4
+
+
+def test_cache_key_covers_provider_and_model():
+    base = llm.cache_key("gemini", "model-a", "summary", 1, "prompt")
+    assert base == llm.cache_key("gemini", "model-a", "summary", 1, "prompt")
+    assert base != llm.cache_key("zhipu", "model-a", "summary", 1, "prompt")
+    assert base != llm.cache_key("gemini", "model-b", "summary", 1, "prompt")
+    assert base != llm.cache_key("gemini", "model-a", "summary", 1, "prompt", json_mode=True)
+
+
+def test_invalid_reply_is_not_cached(provider):
+    def reject_first(reply):
+        if reply == '{"n": 1}':
+            raise llm.LLMError("bad reply")
+
+    with pytest.raises(llm.LLMError):
+        provider(validate=reject_first)
+    assert _keys() == []
+
+    assert provider(validate=reject_first) == '{"n": 2}'
+    assert provider(validate=reject_first) == '{"n": 2}'
+    assert len(provider.calls) == 2
+
+
+def test_empty_reply_is_not_cached(monkeypatch):
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    assert llm.complete("prompt", provider="mock", cache=("summary", 1)) == ""
+    assert _keys() == []
+
+
+def test_cache_can_be_disabled(provider, monkeypatch):
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", False)
+    provider()
+    provider()
+    assert len(provider.calls) == 2
+    assert db.get_llm_cache_stats()["entries"] == 0
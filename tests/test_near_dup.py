@@ -0,0 +1,114 @@
+import pytest
+
+from conftest import make_article
+
+import config
+import db
+import near_dup
+
+BASE = ("OpenAI releases GPT-5 with improved reasoning and a longer context window",
+        "The new model scores higher on math benchmarks, supports tool use and costs less per "
+        "token than its predecessor, the company said on Tuesday.")
+# Same story with a few words changed (shingle Jaccard 0.8)
+REWORDED = ("OpenAI releases GPT-5 with improved reasoning and a longer context window for developers",
+            "The new model scores higher on math benchmarks, supports tool use and costs less per "
+            "token than its predecessor, the company announced on Tuesday.")
+# Same news, written independently (shingle Jaccard ~0.19)
+RELATED = ("OpenAI unveils GPT-5 featuring better reasoning and an expanded context window",
+           "OpenAI said the model beats its predecessor on math benchmarks and is cheaper per token.")
+
+
+def _store(index, text, **fields):
+    article = make_article(index, title=text[0], summary=text[1], **fields)
+    db.upsert_articles_bulk([article])
+    return db.generate_article_id(article["url"])
+
+
+def _jaccard(a, b):
+    a, b = near_dup.shingles(*a), near_dup.shingles(*b)
+    return len(a & b) / len(a | b)
+
+
+def test_signature_estimates_jaccard_similarity():
+    signature = near_dup.signature(*BASE)
+    assert near_dup.similarity(signature, near_dup.signature(*BASE)) == 1.0
+    for text in (REWORDED, RELATED):
+        estimate = near_dup.similarity(signature, near_dup.signature(*text))
+        assert abs(estimate - _jaccard(BASE, text)) < 0.15
+
+
+def test_short_texts_have_no_signature():
+    assert near_dup.signature("OpenAI ships GPT-5", "") is None
+    assert len(near_dup.bucket_keys(near_dup.signature(*BASE))) == config.NEAR_DUP_BANDS
+
+
+def test_clusters_only_above_threshold():
+    representative = _store(1, BASE)
+    reworded = _store(2, REWORDED)
+    related = _store(3, RELATED)
+
+    assert db.get_article_by_id(representative)["cluster_id"] is None
+    assert db.get_article_by_id(reworded)["cluster_id"] == representative
+    assert db.get_article_by_id(related)["cluster_id"] is None
+
+
+def test_threshold_is_configurable(monkeypatch):
+    monkeypatch.setattr(config, "NEAR_DUP_THRESHOLD", 0.95)
+    _store(1, BASE)
+    assert db.get_article_by_id(_store(2, REWORDED))["cluster_id"] is None
+
+
+def test_pending_member_is_hidden_from_queue():
+    representative = _store(1, BASE)
+    member = _store(2, REWORDED)
+
+    current = {article["id"]: article for article in db.get_current_articles()}
+    assert member not in current
+    assert current[representative]["cluster_size"] == 1
+    assert [article["id"] for article in db.get_articles_by_status(status="pending")] == [representative]
+    assert db.get_current_stats()["total"] == 1
+    assert [article["id"] for article in db.get_cluster_articles(member)] == [representative, member]
+
+    # Once curated, a member is listed on its own
+    db.set_article_status(member, "shortlisted")
+    assert member in {article["id"] for article in db.get_current_articles()}
+
+
+def test_archived_articles_do_not_absorb_new_ones():
+    representative = _store(1, BASE)
+    db.archive_all_current()
+    assert db.get_article_by_id(_store(2, REWORDED))["cluster_id"] is None
+    assert db.get_article_by_id(representative)["cluster_id"] is None
+
+
+def test_deleting_representative_dissolves_cluster():
+    representative = _store(1, BASE)
+    member = _store(2, REWORDED)
+    conn = db.get_connection()
+    conn.execute("DELETE FROM curation WHERE article_id = ?", (representative,))
+    conn.execute("DELETE FROM articles WHERE id = ?", (representative,))
+    conn.commit()
+    assert db.get_article_by_id(member)["cluster_id"] is None
+
+
+def test_backfill_clusters_existing_articles(monkeypatch):
+    monkeypatch.setattr(config, "NEAR_DUP_ENABLED", False)
+    representative = _store(1, BASE)
+    member = _store(2, REWORDED)
+    related = _store(3, RELATED)
+    monkeypatch.setattr(config, "NEAR_DUP_ENABLED", True)
+
+    # A database from before the near-duplicate index
+    conn = db.get_connection()
+    conn.execute("DROP TRIGGER articles_near_dup_delete")
+    conn.execute("DROP INDEX idx_articles_cluster")
+    conn.execute("DROP TABLE near_dup_buckets")
+    conn.execute("DROP TABLE near_dup_signatures")
+    conn.execute("ALTER TABLE articles DROP COLUMN cluster_id")
+    conn.commit()
+
+    db.init_db()
+
+    assert db.get_article_by_id(member)["cluster_id"] == representative
+    assert {article["id"] for article in db.get_current_articles()} == {representative, related}
+    assert conn.execute("SELECT COUNT(*) FROM near_dup_signatures").fetchone()[0] == 3
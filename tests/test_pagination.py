@@ -0,0 +1,75 @@
+import base64
+import json
+
+import pytest
+
+from conftest import make_article
+
+import curator_api
+import db
+
+
+@pytest.fixture
+def queue():
+    """40 articles with tied dates, top picks, missing and tied scores, mixed statuses."""
+    db.upsert_articles_bulk([
+        make_article(index, published=f"2026-01-0{1 + index % 4}T00:00:00" if index % 5 else None)
+        for index in range(40)
+    ])
+    ids = [article["id"] for article in db.get_current_articles()]
+    for position, article_id in enumerate(ids):
+        if position % 7 == 0:
+            db.set_top_pick(article_id, True)
+        if position % 3 == 0:
+            db.set_article_status(article_id, "shortlisted")
+    db.save_article_scores([
+        {"article_id": article_id, "score": float(position % 4), "reason": "", "provider": "mock",
+         "model": "mock", "input_hash": "", "scored_at": "2026-01-05T00:00:00"}
+        for position, article_id in enumerate(ids) if position % 2
+    ])
+    db.save_article_preferences([
+        {"article_id": article_id, "score": (position % 5) / 5, "model_trained_at": "2026-01-05T00:00:00"}
+        for position, article_id in enumerate(ids) if position % 4
+    ])
+
+
+def _all_pages(status, sort, limit=6):
+    ids, cursor = [], None
+    while True:
+        articles, cursor = db.get_current_articles_page(status=status, limit=limit, cursor=cursor, sort=sort)
+        assert len(articles) <= limit
+        ids += [article["id"] for article in articles]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("sort", list(db.QUEUE_SORTS))
+@pytest.mark.parametrize("status", [None, "pending", "shortlisted"])
+def test_pages_concatenate_to_full_ordering(queue, sort, status):
+    if status is None:
+        expected = db.get_current_articles(sort=sort)
+    else:
+        expected = db.get_articles_by_status(status=status, sort=sort)
+    assert expected
+    assert _all_pages(status, sort) == [article["id"] for article in expected]
+
+
+def _cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    _cursor({"top_pick": 0}),
+    _cursor([0, "2026-01-01"]),
+    _cursor([0, ["2026-01-01"], "abc"]),
+    _cursor([0, {"date": "2026-01-01"}, "abc"]),
+    _cursor([True, "2026-01-01", "abc"]),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        db.get_current_articles_page(limit=5, cursor=cursor)
+
+    response = curator_api.app.test_client().get(f"/api/articles?limit=5&cursor={cursor}")
+    assert response.status_code == 400
+
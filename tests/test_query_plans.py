@@ -0,0 +1,101 @@
+"""
+EXPLAIN QUERY PLAN regression tests for the queue queries the dashboard runs
+on every load: each must be served by a curation index, in index order.
+"""
+import pytest
+
+from conftest import make_article
+
+import db
+
+
+@pytest.fixture
+def queue():
+    db.upsert_articles_bulk([make_article(index) for index in range(60)])
+
+
+def _statements(call) -> list[str]:
+    """The SELECT statements (with bound values inlined) that call() runs."""
+    statements = []
+    db.get_connection().set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        db.get_connection().set_trace_callback(None)
+    return [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+
+
+def _plan(sql: str) -> list[str]:
+    conn = db.get_connection()
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()]
+
+
+def _assert_indexed(call, index: str):
+    statements = _statements(call)
+    assert statements
+    for sql in statements:
+        plan = _plan(sql)
+        detail = "\n".join(plan)
+        assert any(step.startswith("SEARCH c ") and index in step for step in plan), detail
+        assert not any(step.startswith("SCAN") for step in plan), detail
+        assert "USE TEMP B-TREE" not in detail, detail
+
+
+def _second_page(status=None):
+    _, cursor = db.get_current_articles_page(status=status, limit=10)
+    assert cursor
+    db.get_current_articles_page(status=status, limit=10, cursor=cursor)
+
+
+@pytest.mark.parametrize("call, index", [
+    (lambda: db.get_current_articles(), "idx_curation_queue_current"),
+    (lambda: db.get_articles_by_status(status="pending"), "idx_curation_queue_status"),
+    (lambda: db.get_current_articles_page(limit=10), "idx_curation_queue_current"),
+    (lambda: db.get_current_articles_page(status="pending", limit=10), "idx_curation_queue_status"),
+    (lambda: _second_page(), "idx_curation_queue_current"),
+    (lambda: _second_page("pending"), "idx_curation_queue_status"),
+    (db.get_current_stats, "idx_curation_queue_status"),
+], ids=["current", "by_status", "page", "status_page", "next_page", "next_status_page", "stats"])
+def test_hot_queries_use_queue_indexes(queue, call, index):
+    _assert_indexed(call, index)
+
+
+def test_sort_date_follows_article_dates(queue):
+    article = make_article(100, published=None)
+    article_id = db.generate_article_id(db.canonicalize_url(article["url"]))
+    conn = db.get_connection()
+
+    def sort_date():
+        return conn.execute("SELECT sort_date FROM curation WHERE article_id = ?", (article_id,)).fetchone()[0]
+
+    db.upsert_articles_bulk([article])
+    first_fetch = sort_date()
+    assert first_fetch == db.get_article_by_id(article_id)["fetched_at"]
+
+    db.upsert_articles_bulk([article])
+    assert sort_date() == db.get_article_by_id(article_id)["fetched_at"] > first_fetch
+
+    conn.execute("UPDATE articles SET published = '2026-02-01T00:00:00' WHERE id = ?", (article_id,))
+    conn.commit()
+    assert sort_date() == "2026-02-01T00:00:00"
+
+
+def test_migration_backfills_sort_date(queue):
+    conn = db.get_connection()
+    conn.execute("DROP INDEX idx_curation_queue_status")
+    conn.execute("DROP INDEX idx_curation_queue_current")
+    conn.execute("ALTER TABLE curation DROP COLUMN sort_date")
+    conn.commit()
+
+    db.init_db()
+
+    rows = db.get_connection().execute("""
+        SELECT c.sort_date, COALESCE(a.published, a.fetched_at) AS expected
+        FROM curation c JOIN articles a ON a.id = c.article_id
+    """).fetchall()
+    assert len(rows) == 60
+    assert all(row["sort_date"] == row["expected"] for row in rows)
+    assert [a["id"] for a in db.get_current_articles()] == [
+        a["id"] for a in sorted(db.get_current_articles(), key=lambda a: (
+            a["top_pick"], a["published"] or a["fetched_at"], a["id"]), reverse=True)
+    ]
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from conftest import make_article
+
+import config
+import db
+import llm
+import scoring
+
+ARTICLES = [{"id": f"article-{index}"} for index in range(1, 4)]
+
+
+def _stored_scores() -> dict:
+    conn = db.get_connection()
+    rows = conn.execute("SELECT article_id, score, provider, input_hash FROM article_scores").fetchall()
+    return {row["article_id"]: dict(row) for row in rows}
+
+
+def test_parse_scores_maps_ids_to_articles():
+    reply = json.dumps({"scores": [
+        {"id": 2, "score": 7.5, "reason": "Model launch"},
+        {"id": "1", "score": "3", "reason": None},
+    ]})
+    assert sorted(scoring.parse_scores(reply, ARTICLES), key=lambda s: s["article_id"]) == [
+        {"article_id": "article-1", "score": 3.0, "reason": ""},
+        {"article_id": "article-2", "score": 7.5, "reason": "Model launch"},
+    ]
+
+
+def test_parse_scores_accepts_fenced_list():
+    reply = '```json\n[{"id": 3, "score": 12}, {"id": 1, "score": -2}]\n```'
+    scores = {s["article_id"]: s["score"] for s in scoring.parse_scores(reply, ARTICLES)}
+    assert scores == {"article-3": 10.0, "article-1": 0.0}
+
+
+def test_parse_scores_drops_unusable_entries():
+    reply = json.dumps({"scores": [
+        {"id": 0, "score": 5}, {"id": 4, "score": 5}, {"id": "x", "score": 5},
+        {"id": 1, "score": "high"}, {"id": 2}, "3: 9", None,
+        {"id": 3, "score": 6},
+    ]})
+    assert [s["article_id"] for s in scoring.parse_scores(reply, ARTICLES)] == ["article-3"]
+
+
+def test_parse_scores_without_entries():
+    assert scoring.parse_scores('{"result": "ok"}', ARTICLES) == []
+
+
+@pytest.mark.parametrize("reply", [
+    "", "Sure! Here are the scores:", '{"scores": [{"id": 1, "score": 5}', '{"scores": {"1": 5}}',
+])
+def test_parse_scores_rejects_malformed_replies(reply):
+    with pytest.raises(llm.LLMError):
+        scoring.parse_scores(reply, ARTICLES)
+
+
+def test_scores_full_queue_through_mock_provider(monkeypatch):
+    monkeypatch.setattr(config, "LLM_SCORING_BATCH_SIZE", 20)
+    db.upsert_articles_bulk([make_article(index, title=f"New LLM agent {index}") for index in range(45)])
+
+    result = scoring.score_articles(provider="mock", verbose=False)
+
+    assert result == {"scored": 45, "failed": 0, "skipped": 0}
+    stored = _stored_scores()
+    assert len(stored) == 45
+    articles = {article["id"]: article for article in db.get_articles_for_scoring()}
+    for article_id, score in stored.items():
+        assert score["provider"] == "mock" and 0 <= score["score"] <= 10
+        assert score["input_hash"] == scoring.input_hash(articles[article_id])
+
+
+def test_skips_articles_with_unchanged_input():
+    db.upsert_articles_bulk([make_article(index) for index in range(5)])
+    scoring.score_articles(provider="mock", verbose=False)
+
+    assert scoring.score_articles(provider="mock", verbose=False) == {"scored": 0, "failed": 0, "skipped": 5}
+
+    db.upsert_articles_bulk([make_article(2, summary="Rewritten summary about a new model")])
+    assert scoring.score_articles(provider="mock", verbose=False) == {"scored": 1, "failed": 0, "skipped": 4}
+
+
+def test_missing_and_failed_scores_are_retried(monkeypatch):
+    db.upsert_articles_bulk([make_article(index) for index in range(4)])
+    replies = iter([
+        json.dumps({"scores": [{"id": 1, "score": 4}, {"id": 2, "score": 6}]}),
+        "not json",
+    ])
+    monkeypatch.setattr(config, "LLM_SCORING_BATCH_SIZE", 2)
+    monkeypatch.setattr(config, "LLM_SCORING_WORKERS", 1)
+    mock_reply = scoring.mock_reply
+    monkeypatch.setattr(scoring, "mock_reply", lambda prompt: next(replies))
+
+    assert scoring.score_articles(provider="mock", verbose=False) == {"scored": 2, "failed": 2, "skipped": 0}
+
+    monkeypatch.setattr(scoring, "mock_reply", mock_reply)
+    assert scoring.score_articles(provider="mock", verbose=False) == {"scored": 2, "failed": 0, "skipped": 2}
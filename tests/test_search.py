@@ -0,0 +1,126 @@
+import pytest
+
+from conftest import make_article
+
+import curator_api
+import db
+
+
+def _id(article: dict) -> str:
+    return db.generate_article_id(db.canonicalize_url(article["url"]))
+
+
+def _found(query: str) -> list[str]:
+    return [article["id"] for article in db.search_articles(query)]
+
+
+@pytest.fixture
+def articles():
+    items = [
+        make_article(0, title="Sparse attention for long contexts", summary="Kernels and tiling"),
+        make_article(1, title="Quantized inference on phones", summary="Int4 weights"),
+        make_article(2, title="Retrieval pipelines", summary="Chunking documents for search"),
+    ]
+    db.upsert_articles_bulk(items)
+    return items
+
+
+def test_triggers_index_inserts(articles):
+    assert _found("sparse attention") == [_id(articles[0])]
+    assert _found("quantiz") == [_id(articles[1])]  # the last word is a prefix
+    assert _found("chunking documents") == [_id(articles[2])]
+
+
+def test_triggers_follow_title_and_summary_updates(articles):
+    changed = dict(articles[1], title="Speculative decoding", summary="Draft models")
+    db.upsert_articles_bulk([changed])
+
+    assert _found("quantized") == []
+    assert _found("speculative decoding") == [_id(articles[1])]
+    assert _found("draft") == [_id(articles[1])]
+
+
+def test_triggers_follow_curator_notes(articles):
+    assert _found("flashattention") == []
+    db.update_article_notes(_id(articles[0]), "compare with FlashAttention")
+    assert _found("flashattention") == [_id(articles[0])]
+
+    db.update_article_notes(_id(articles[0]), "")
+    assert _found("flashattention") == []
+
+
+def test_triggers_follow_deletes(articles):
+    conn = db.get_connection()
+    conn.execute("DELETE FROM curation WHERE article_id = ?", (_id(articles[2]),))
+    conn.execute("DELETE FROM articles WHERE id = ?", (_id(articles[2]),))
+    conn.commit()
+
+    assert _found("retrieval") == []
+    assert conn.execute("SELECT COUNT(*) FROM articles_fts").fetchone()[0] == 2
+
+
+def test_migration_backfills_index(articles):
+    db.update_article_notes(_id(articles[1]), "worth a mention")
+    conn = db.get_connection()
+    for trigger in ("articles_fts_insert", "articles_fts_update", "articles_fts_delete",
+                    "curation_fts_insert", "curation_fts_update"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    conn.execute("DROP TABLE articles_fts")
+    conn.commit()
+
+    db.init_db()
+
+    assert _found("sparse") == [_id(articles[0])]
+    assert _found("mention") == [_id(articles[1])]
+    db.upsert_articles_bulk([make_article(3, title="Sparse mixtures of experts")])
+    assert len(_found("sparse")) == 2
+
+
+def test_drifted_index_is_rebuilt(articles):
+    conn = db.get_connection()
+    conn.execute("DELETE FROM articles_fts WHERE rowid = (SELECT rowid FROM articles WHERE id = ?)",
+                 (_id(articles[0]),))
+    conn.commit()
+    assert _found("sparse") == []
+
+    db.init_db()
+    assert _found("sparse") == [_id(articles[0])]
+
+
+@pytest.mark.parametrize("query", ['sparse"', '"sparse', "sparse*", "(sparse", "-sparse", "^sparse", "{sparse}"])
+def test_query_syntax_characters_are_inert(articles, query):
+    assert _found(query) == [_id(articles[0])]
+
+
+@pytest.mark.parametrize("query", ["sparse OR quantized", "NOT sparse", "title:sparse", "NEAR(sparse attention)"])
+def test_query_operators_are_plain_words(articles, query):
+    # Every word has to match, operators included, so none of these finds anything
+    assert _found(query) == []
+
+
+def test_operator_words_match_literally(articles):
+    article = make_article(3, title="Near or far: NOT your usual benchmark")
+    db.upsert_articles_bulk([article])
+    assert _found("near OR far not") == [_id(article)]
+
+
+def test_queries_without_words_match_nothing(articles):
+    assert _found('"*()') == []
+    assert _found("") == []
+
+
+def test_search_api_escapes_snippets(articles):
+    db.update_article_notes(_id(articles[0]), "<script>sparse</script>")
+    response = curator_api.app.test_client().get("/api/search?q=script")
+    assert response.status_code == 200
+    snippet = response.get_json()["articles"][0]["snippet"]
+    assert "<script>" not in snippet
+    assert "&lt;<mark>script</mark>&gt;" in snippet
+
+
+def test_search_api_accepts_fts_syntax(articles):
+    client = curator_api.app.test_client()
+    response = client.get('/api/search?q=sparse" OR "quantized')
+    assert response.status_code == 200
+    assert response.get_json()["articles"] == []
+    assert client.get("/api/search?q=").status_code == 400
@@ -0,0 +1,49 @@
+import pytest
+
+from conftest import make_article
+
+import config
+import embeddings
+import preference
+import rss_feed_scorer
+import scoring
+import topic_classifier
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    """Record which post-store stages a sync runs."""
+    ran = []
+    monkeypatch.setattr(topic_classifier, "classify_untagged", lambda **kwargs: ran.append("topics"))
+    monkeypatch.setattr(embeddings, "embed_missing", lambda **kwargs: ran.append("embeddings"))
+    monkeypatch.setattr(scoring, "score_articles", lambda **kwargs: ran.append("scoring"))
+    monkeypatch.setattr(preference, "refresh", lambda **kwargs: ran.append("preference"))
+    for flag in ("TOPIC_CLASSIFY_ENABLED", "EMBEDDINGS_ENABLED", "LLM_SCORING_ENABLED", "PREFERENCE_ENABLED"):
+        monkeypatch.setattr(config, flag, True)
+    return ran
+
+
+def _feeds(monkeypatch, feed_urls: dict, items: list):
+    monkeypatch.setattr(rss_feed_scorer, "_collect_domains", lambda *args, **kwargs: set(feed_urls))
+    monkeypatch.setattr(rss_feed_scorer, "_resolve_feeds", lambda *args, **kwargs: (
+        {domain: {"feed_url": url} for domain, url in feed_urls.items()}, dict(feed_urls)))
+    monkeypatch.setattr(rss_feed_scorer, "fetch_feeds", lambda feed_urls, **kwargs: iter(
+        [(domain, items, True) for domain in feed_urls]))
+
+
+def test_post_store_stages_run_without_new_articles(monkeypatch, stages):
+    _feeds(monkeypatch, {"a.example": "https://a.example/feed"}, [])
+    assert rss_feed_scorer.run_sync(verbose=False) == 0
+    assert stages == ["topics", "embeddings", "scoring", "preference"]
+
+
+def test_post_store_stages_run_without_feeds(monkeypatch, stages):
+    _feeds(monkeypatch, {}, [])
+    assert rss_feed_scorer.run_sync(verbose=False) == 0
+    assert stages == ["topics", "embeddings", "scoring", "preference"]
+
+
+def test_post_store_stages_run_after_storing(monkeypatch, stages):
+    _feeds(monkeypatch, {"a.example": "https://a.example/feed"}, [make_article(1), make_article(2)])
+    assert rss_feed_scorer.run_sync(verbose=False) == 2
+    assert stages == ["topics", "embeddings", "scoring", "preference"]
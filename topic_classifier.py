@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Topic classification: assigns each article one of config.TOPICS.
+
+The default "keywords" classifier counts TOPIC_KEYWORDS matches per topic
+(title matches weighted TOPIC_TITLE_WEIGHT) with one precompiled regex per
+topic, and picks the best-scoring topic, or TOPIC_DEFAULT when no topic
+reaches TOPIC_MIN_SCORE. It is local and classifies thousands of articles a
+second. The "llm" classifier sends TOPIC_LLM_BATCH_SIZE articles per prompt
+to the configured provider through llm.complete (rate limited and cached);
+articles it fails on fall back to keywords.
+
+Sync runs classify_untagged() after storing: only articles without a topic
+are read, TOPIC_BATCH_SIZE at a time, so new rows are tagged on each run and
+an existing database is backfilled on the first. Feed upserts never clear a
+topic once set.
+
+Usage:
+    python topic_classifier.py                   # Tag all untagged articles (TOPIC_CLASSIFIER)
+    python topic_classifier.py --classifier llm  # Use the LLM (LLM_PROVIDER)
+    python topic_classifier.py --limit 500       # At most 500 articles
+"""
+import argparse
+import json
+import re
+from typing import Optional
+
+import config
+import db
+import llm
+
+CLASSIFIERS = ("keywords", "llm")
+
+# Bump when PROMPT_TEMPLATE changes (cached replies are keyed on it)
+PROMPT_VERSION = 1
+
+PROMPT_TEMPLATE = """Assign each article below exactly one topic for an AI newsletter.
+Topics:
+{topics}
+
+Articles (JSON):
+{articles}
+
+Reply with JSON only, in the form
+{{"topics": [{{"id": <article id>, "topic": "<one of the topics, spelled exactly>"}}]}}
+with exactly one entry per article."""
+
+_patterns: Optional[dict] = None
+
+
+def _topic_patterns() -> dict:
+    """One compiled regex per topic matching any of its keywords."""
+    global _patterns
+    if _patterns is None:
+        _patterns = {
+            topic: re.compile(
+                r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords) + r")s?\b"
+            )
+            for topic, keywords in config.TOPIC_KEYWORDS.items()
+            if topic in config.TOPICS and keywords
+        }
+    return _patterns
+
+
+def classify_keywords(article: dict) -> str:
+    """Best-matching topic for an article by keyword counts."""
+    title = (article.get("title") or "").lower()
+    summary = (article.get("summary") or "").lower()
+    best_topic, best_score = config.TOPIC_DEFAULT, 0
+    for topic, pattern in _topic_patterns().items():
+        score = config.TOPIC_TITLE_WEIGHT * len(pattern.findall(title)) + len(pattern.findall(summary))
+        if score > best_score:
+            best_topic, best_score = topic, score
+    return best_topic if best_score >= config.TOPIC_MIN_SCORE else config.TOPIC_DEFAULT
+
+
+def build_prompt(articles: list[dict]) -> str:
+    """Classification prompt for a batch; articles are numbered 1..n in batch order."""
+    entries = [
+        {"id": index, "title": article.get("title") or "", "summary": (article.get("summary") or "")[:300]}
+        for index, article in enumerate(articles, 1)
+    ]
+    return PROMPT_TEMPLATE.format(
+        topics="\n".join(f"- {topic}" for topic in config.TOPICS),
+        articles=json.dumps(entries, ensure_ascii=False, indent=1),
+    )
+
+
+def mock_reply(prompt: str) -> str:
+    """Offline stand-in for the model: answers with the keyword classifier."""
+    entries = json.loads(prompt.split("Articles (JSON):\n", 1)[1].split("\n\nReply with", 1)[0])
+    return json.dumps({"topics": [
+        {"id": entry["id"], "topic": classify_keywords(entry)} for entry in entries
+    ]})
+
+
+def parse_topics(reply: str, count: int) -> dict[int, str]:
+    """Map a model reply to {article number: topic}, dropping unknown topics and ids."""
+    data = llm.parse_json(reply)
+    entries = data.get("topics", []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise llm.LLMError("LLM reply has no topics list")
+
+    known = {topic.lower(): topic for topic in config.TOPICS}
+    topics = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        topic = known.get(str(entry.get("topic") or "").strip().lower())
+        if topic and 1 <= index <= count:
+            topics[index] = topic
+    return topics
+
+
+def classify_llm(articles: list[dict], provider: Optional[str] = None) -> list[str]:
+    """
+    Topics for articles from the LLM, TOPIC_LLM_BATCH_SIZE per prompt.
+    Articles in a failed batch or missing from a reply get the keyword topic.
+    """
+    topics = []
+    batch_size = max(1, config.TOPIC_LLM_BATCH_SIZE)
+    for start in range(0, len(articles), batch_size):
+        batch = articles[start:start + batch_size]
+        try:
+            reply = llm.complete(
+                build_prompt(batch), provider=provider, json_mode=True, mock=mock_reply,
+                cache=("topics", PROMPT_VERSION),
+                validate=lambda text, count=len(batch): parse_topics(text, count),
+            )
+            batch_topics = parse_topics(reply, len(batch))
+        except llm.LLMError as e:
+            print(f"  Topic batch of {len(batch)} failed, using keywords: {e}")
+            batch_topics = {}
+        topics.extend(
+            batch_topics.get(index) or classify_keywords(article)
+            for index, article in enumerate(batch, 1)
+        )
+    return topics
+
+
+def classify(articles: list[dict], classifier: Optional[str] = None,
+             provider: Optional[str] = None) -> list[str]:
+    """Topic for each article, with the given classifier (default TOPIC_CLASSIFIER)."""
+    classifier = classifier or config.TOPIC_CLASSIFIER
+    if classifier not in CLASSIFIERS:
+        raise ValueError(f"Unknown topic classifier: {classifier!r} (expected one of {', '.join(CLASSIFIERS)})")
+    if classifier == "llm":
+        if llm.is_configured(provider):
+            return classify_llm(articles, provider)
+        print("  LLM not configured, classifying topics by keywords")
+    return [classify_keywords(article) for article in articles]
+
+
+def classify_untagged(classifier: Optional[str] = None, provider: Optional[str] = None,
+                      limit: int = 0, verbose: bool = True) -> int:
+    """
+    Assign topics to articles that have none, TOPIC_BATCH_SIZE at a time.
+    Returns the number of articles tagged.
+    """
+    tagged = 0
+    after_rowid = 0
+    chunk_size = max(1, config.TOPIC_BATCH_SIZE)
+    while not limit or tagged < limit:
+        size = min(chunk_size, limit - tagged) if limit else chunk_size
+        articles = db.get_articles_without_topic(after_rowid=after_rowid, limit=size)
+        if not articles:
+            break
+        topics = classify(articles, classifier, provider)
+        db.set_article_topics({article["id"]: topic for article, topic in zip(articles, topics)})
+        tagged += len(articles)
+        after_rowid = articles[-1]["rowid"]
+
+    if verbose and tagged:
+        print(f"  Tagged {tagged} articles with topics")
+    return tagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assign topics to articles that have none.")
+    parser.add_argument(
+        "--classifier",
+        choices=CLASSIFIERS,
+        default=None,
+        help=f"Classifier to use (default: TOPIC_CLASSIFIER = {config.TOPIC_CLASSIFIER!r})",
+    )
+    parser.add_argument(
+        "--provider",
+        choices=llm.PROVIDERS,
+        default=None,
+        help="LLM provider for --classifier llm (default: LLM_PROVIDER; 'mock' runs offline)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=0,
+        help="Tag at most N articles (default: all untagged)",
+    )
+    args = parser.parse_args()
+
+    tagged = classify_untagged(classifier=args.classifier, provider=args.provider, limit=args.limit)
+    if not tagged:
+        print("No untagged articles")
+
+
+if __name__ == "__main__":
+    main()